@@ -5,8 +5,12 @@ const { exec } = require('child_process');
 const path = require('path');
 const util = require('util');
 const http = require('http');
+const crypto = require('crypto');
 
 const app = express();
+
+// Keep-alive pool for calls to the ML model API
+const modelAgent = new http.Agent({ keepAlive: true, maxSockets: 64, maxFreeSockets: 16 });
 const PORT = 3001;
 const execAsync = util.promisify(exec);
 
@@ -123,26 +127,25 @@ app.post('/api/predict', async (req, res) => {
       }
     }
 
-    // 1. Write input data to input.json in the exoplanet directory
-    const inputPath = path.join(__dirname, '..', 'exoplanet', 'input.json');
-    console.log('Writing input to:', inputPath);
-    
-    const bodyString = JSON.stringify(req.body, null, 2);
-    await fs.writeFile(inputPath, bodyString);
-    console.log('✓ Input data written successfully');
+    // Echoed by the model API, so its logs can be matched to ours
+    const requestId = req.get('X-Request-ID') || crypto.randomUUID();
 
-    // 2. Send request to ML model using Node http to avoid shell/curl issues
+    // 1. Send the request straight to the ML model over a pooled keep-alive
+    // connection (no shared files, so concurrent requests cannot mix)
+    const bodyString = JSON.stringify(req.body);
     console.log('Sending request to ML model at http://127.0.0.1:8000/predict');
 
     const requestToModel = () => new Promise((resolve, reject) => {
       const options = {
+        agent: modelAgent,
         hostname: '127.0.0.1',
         port: 8000,
         path: '/predict',
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
-          'Content-Length': Buffer.byteLength(bodyString)
+          'Content-Length': Buffer.byteLength(bodyString),
+          'X-Request-ID': requestId
         },
         timeout: 60000
       };
@@ -184,47 +187,46 @@ app.post('/api/predict', async (req, res) => {
     console.log('Model response preview:', (modelResponse.body || '').substring(0, 500));
 
     if (modelResponse.statusCode !== 200) {
-      // save raw response for debugging
-      const debugPath = path.join(__dirname, 'debug_response.txt');
-      await fs.writeFile(debugPath, modelResponse.body || '');
-      return res.status(502).json({
+      // Pass the model's status through (e.g. 400 for invalid input, 503
+      // when saturated); its body may be JSON, plain text or an HTML page
+      let detail = (modelResponse.body || '').substring(0, 200);
+      try {
+        const parsed = JSON.parse(modelResponse.body);
+        detail = parsed && parsed.detail !== undefined ? parsed.detail : parsed;
+      } catch (parseError) {
+        // keep the raw preview
+      }
+      const status = modelResponse.statusCode >= 400 ? modelResponse.statusCode : 502;
+      return res.status(status).json({
         success: false,
         error: `ML model returned HTTP ${modelResponse.statusCode}`,
+        details: detail,
         raw: (modelResponse.body || '').substring(0, 200),
-        debugPath
+        requestId
       });
     }
 
-    // 3. Parse the model response (must be JSON)
+    // 2. Parse the model response (must be JSON)
     let parsedResult;
     try {
       parsedResult = JSON.parse(modelResponse.body);
     } catch (parseError) {
-      const resultPath = path.join(__dirname, '..', 'exoplanet', 'formatted_result.json');
-      await fs.writeFile(resultPath, modelResponse.body || '');
       console.error('Error parsing model JSON:', parseError);
       return res.status(502).json({
         success: false,
         error: 'ML model returned invalid JSON',
         parseError: parseError.message,
-        resultPreview: (modelResponse.body || '').substring(0, 200),
-        resultPath
+        resultPreview: (modelResponse.body || '').substring(0, 200)
       });
     }
 
-    // 4. Save formatted result
-    const resultPath = path.join(__dirname, '..', 'exoplanet', 'formatted_result.json');
-    await fs.writeFile(resultPath, JSON.stringify(parsedResult, null, 2));
-    console.log('✓ Formatted result saved to:', resultPath);
-
     console.log('=== PREDICTION REQUEST COMPLETE ===');
     return res.json({
       success: true,
       input: req.body,
       result: parsedResult,
       debug: {
-        inputPath,
-        resultPath,
+        requestId,
         responseLength: (modelResponse.body || '').length
       }
     });
@@ -0,0 +1,191 @@
+# backend/app/artifacts.py
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# --- SHARED MODEL ARTIFACT LOADER ---
+# The API, backend/app/model.py and the CLI scripts all load the model
+# through here, so each process unpickles the artifacts at most once.
+# joblib (and through it sklearn) is only imported when the sklearn
+# engine is actually requested; the NumPy engine needs neither.
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '../models'))
+MODEL_PATH = os.path.join(MODEL_DIR, 'exoplanet_model.pkl')
+SCALER_PATH = os.path.join(MODEL_DIR, 'exoplanet_scaler.pkl')
+FEATURES_PATH = os.path.join(MODEL_DIR, 'model_features.pkl')
+WEIGHTS_PATH = os.path.join(MODEL_DIR, 'exoplanet_weights.npz')
+
+# "full" is the model trained by train_model.py; "distilled" is the small
+# student trained on its outputs by distill_model.py (same scaler/features)
+VARIANT_CHOICES = ("full", "distilled")
+STUDENT_MODEL_PATH = os.path.join(MODEL_DIR, 'exoplanet_student.pkl')
+STUDENT_WEIGHTS_PATH = os.path.join(MODEL_DIR, 'exoplanet_student_weights.npz')
+
+def variant_paths(variant: str = "full", model_dir: str = MODEL_DIR) -> Tuple[str, str]:
+    """(pickled model, NumPy weights) paths of a model variant inside a model directory"""
+    if variant == "full":
+        names = (MODEL_PATH, WEIGHTS_PATH)
+    elif variant == "distilled":
+        names = (STUDENT_MODEL_PATH, STUDENT_WEIGHTS_PATH)
+    else:
+        raise ValueError(f"Unknown model variant '{variant}', expected one of {VARIANT_CHOICES}")
+    return tuple(os.path.join(model_dir, os.path.basename(path)) for path in names)
+
+@dataclass
+class ModelArtifacts:
+    engine_name: str
+    engine: Any
+    feature_names: List[str]
+    variant: str = "full"
+    precision: str = "float64"
+    version: Optional[str] = None  # registry version, None for the flat models/ directory
+    manifest: Optional[Dict[str, Any]] = None
+    model: Any = None
+    scaler: Any = None
+    artifact_hash: str = ""
+    load_seconds: float = 0.0
+    loaded_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @property
+    def version_label(self) -> str:
+        """Version reported to clients"""
+        return self.version or f"unversioned-{self.artifact_hash[:8]}"
+
+    def load_info(self) -> Dict[str, Any]:
+        return {
+            "version": self.version_label,
+            "engine": self.engine_name,
+            "variant": self.variant,
+            "precision": self.precision,
+            "artifact_hash": self.artifact_hash,
+            "load_seconds": round(self.load_seconds, 6),
+            "loaded_at": self.loaded_at,
+        }
+
+_cache: Dict[Tuple[str, Optional[str], str, str, str], ModelArtifacts] = {}
+_lock = threading.Lock()
+
+def load_sklearn_artifacts(mmap_mode: Optional[str] = None, variant: str = "full",
+                           model_dir: str = MODEL_DIR) -> Tuple[Any, Any, List[str]]:
+    """
+    Unpickle the model, scaler and feature list (uncached)
+
+    Args:
+        mmap_mode: Passed to joblib.load, e.g. "r" to memory-map the
+            weight arrays so worker processes share the same pages
+        variant: "full" or "distilled"
+        model_dir: Directory holding the artifacts
+
+    Returns:
+        Tuple of (model, scaler, feature_names)
+    """
+    import joblib
+
+    model_path, _ = variant_paths(variant, model_dir)
+    model = joblib.load(model_path, mmap_mode=mmap_mode)
+    scaler = joblib.load(os.path.join(model_dir, os.path.basename(SCALER_PATH)), mmap_mode=mmap_mode)
+    feature_names = joblib.load(os.path.join(model_dir, os.path.basename(FEATURES_PATH)))
+    return model, scaler, feature_names
+
+def hash_files(paths: List[str]) -> str:
+    """Short content hash of the given files, used to tell model versions apart"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+def canonical_files(variant: str = "full", model_dir: str = MODEL_DIR) -> List[str]:
+    """
+    Files that identify a model variant, whichever engine loads it
+
+    The same directory therefore gets the same artifact hash (and
+    "unversioned-<hash>" label, cache keys, catalog index) under the
+    sklearn and numpy engines. Files a deployment does not ship (e.g. the
+    pickles next to numpy-only weights) are skipped.
+    """
+    model_path, weights_path = variant_paths(variant, model_dir)
+    paths = [model_path, weights_path] + [os.path.join(model_dir, os.path.basename(path))
+                                          for path in (SCALER_PATH, FEATURES_PATH)]
+    return [path for path in paths if os.path.exists(path)]
+
+def load_artifacts(engine: str = "sklearn", mmap_mode: Optional[str] = None, reload: bool = False,
+                   variant: str = "full", precision: str = "float64", version: Optional[str] = None) -> ModelArtifacts:
+    """
+    Load the artifacts for an inference engine once per process
+
+    Args:
+        engine: "sklearn" (pickled model and scaler) or "numpy" (raw weights)
+        mmap_mode: joblib memory-map mode for the sklearn artifacts
+        reload: Load from disk even if this process already has the artifacts
+        variant: "full" or "distilled" (the smaller student model)
+        precision: "float64", or "float32"/"int8" for the numpy engine
+        version: Registry version; None follows the active version (or the
+            flat models/ directory when nothing has been published) and
+            registry.FLAT_VERSION always loads the flat directory
+
+    Returns:
+        ModelArtifacts with a ready-to-use inference engine
+
+    Raises:
+        FileNotFoundError: If an artifact file is missing
+        ValueError: If the engine does not support the precision
+    """
+    from .registry import resolve
+
+    model_dir, manifest = resolve(version)
+    key = (engine, mmap_mode, variant, precision, model_dir)
+    artifacts = _cache.get(key)
+    if artifacts is not None and not reload:
+        return artifacts
+
+    with _lock:
+        artifacts = _cache.get(key)
+        if artifacts is None or reload:
+            artifacts = _load(engine, mmap_mode, variant, precision, model_dir, manifest)
+            # Keep one version per configuration; callers still holding an
+            # older ModelArtifacts keep using it until they let go
+            for other in [k for k in _cache if k[:4] == key[:4] and k != key]:
+                del _cache[other]
+            _cache[key] = artifacts
+    return artifacts
+
+def _load(engine: str, mmap_mode: Optional[str], variant: str, precision: str,
+          model_dir: str, manifest: Optional[Dict[str, Any]]) -> ModelArtifacts:
+    from .engine import create_engine
+
+    _, weights_path = variant_paths(variant, model_dir)
+    start = time.perf_counter()
+    if engine == "sklearn":
+        model, scaler, feature_names = load_sklearn_artifacts(mmap_mode, variant, model_dir)
+        inference_engine = create_engine("sklearn", model, scaler, feature_names, precision=precision)
+    else:
+        model, scaler = None, None
+        inference_engine = create_engine(engine, weights_path=weights_path, precision=precision)
+        feature_names = inference_engine.feature_names
+
+    artifacts = ModelArtifacts(
+        engine_name=engine,
+        engine=inference_engine,
+        feature_names=list(feature_names),
+        variant=variant,
+        precision=precision,
+        version=manifest["version"] if manifest else None,
+        manifest=manifest,
+        model=model,
+        scaler=scaler,
+        artifact_hash=hash_files(canonical_files(variant, model_dir)),
+        load_seconds=time.perf_counter() - start,
+    )
+    logger.info("Loaded %s %s model artifacts (%s, version %s) in %.3fs",
+                variant, engine, precision, artifacts.version_label, artifacts.load_seconds)
+    return artifacts
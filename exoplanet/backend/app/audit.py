@@ -0,0 +1,313 @@
+# backend/app/audit.py
+
+import gzip
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from . import config
+from .dataset import DATA_DIR
+
+# --- PREDICTION AUDIT LOG ---
+# Append-only record of every prediction made by the API and the CLI
+# scripts. Callers never format or write anything: record() appends a
+# reference to the feature matrix and probabilities to an in-memory queue
+# and returns. A background writer thread takes everything queued at
+# once, turns it into one JSON line per prediction, and appends the lines
+# to the current segment file as a single write (gzip: one complete gzip
+# member per write, so a segment stays readable with gzip.open or zcat
+# even if the process dies mid-segment). Segments rotate by size and age
+# and are never rewritten.
+#
+# The queue is bounded by rows, not batches. When it is full, the "drop"
+# policy discards the new rows and counts them (always used by the API:
+# record() runs on the event loop, and logging must never hold up a
+# response); "block" makes the caller wait for the writer (the CLI
+# scripts: batch runs lose nothing).
+#
+# One line per prediction:
+#   {"timestamp", "source", "endpoint", "model_version", "index", "id",
+#    "features": {...}, "prediction", "exoplanet_probability", ...extra}
+
+DEFAULT_DIR = os.path.join(DATA_DIR, 'audit')
+POLICIES = ("drop", "block")
+
+class _Batch:
+    """Rows queued by one record() call, formatted later by the writer"""
+    __slots__ = ("timestamp", "endpoint", "model_version", "feature_names", "features",
+                 "probabilities", "ids", "extra", "rows")
+
+    def __init__(self, endpoint, model_version, feature_names, features, probabilities, ids, extra):
+        self.timestamp = time.time()
+        self.endpoint = endpoint
+        self.model_version = model_version
+        self.feature_names = feature_names
+        self.features = features
+        self.probabilities = probabilities
+        self.ids = ids
+        self.extra = extra
+        self.rows = len(features)
+
+class AuditLog:
+    """
+    Buffered, append-only JSONL prediction log with a background writer.
+
+    Args:
+        directory: Where segment files are written (created if missing)
+        source: Written into every line and the segment names ("api", "run_predictions", ...)
+        enabled: When False, record() is a no-op
+        compress: gzip segments (.jsonl.gz) instead of plain .jsonl
+        segment_bytes: Start a new segment once the current one reaches this size
+        segment_seconds: Start a new segment once the current one is this old (0 = never)
+        max_pending_rows: Rows that may wait for the writer before the policy applies
+        policy: "drop" or "block" when the queue is full
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR, source: str = "api", enabled: bool = True,
+                 compress: bool = True, segment_bytes: int = 64 * 1024 * 1024, segment_seconds: float = 3600.0,
+                 max_pending_rows: int = 100000, policy: str = "drop"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown audit log policy: {policy} (expected one of {POLICIES})")
+        self.directory = directory
+        self.source = source
+        self.enabled = enabled
+        self.compress = compress
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.max_pending_rows = max_pending_rows
+        self.policy = policy
+
+        self._queue: deque = deque()
+        self._pending_rows = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+
+        self._file = None
+        self._segment_path: Optional[str] = None
+        self._segment_opened = 0.0
+        self._segment_size = 0
+        self._sequence = 0
+
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self.segments = 0
+        self.bytes_written = 0
+
+    @classmethod
+    def from_config(cls, source: str, **overrides) -> "AuditLog":
+        """AuditLog set up from the EXOPLANET_AUDIT_LOG_* settings, with the "drop" policy unless overridden"""
+        settings = dict(
+            directory=config.AUDIT_LOG_DIR or DEFAULT_DIR,
+            source=source,
+            enabled=config.AUDIT_LOG_ENABLED,
+            compress=config.AUDIT_LOG_COMPRESS,
+            segment_bytes=int(config.AUDIT_LOG_SEGMENT_MB * 1024 * 1024),
+            segment_seconds=config.AUDIT_LOG_SEGMENT_SECONDS,
+            max_pending_rows=config.AUDIT_LOG_MAX_PENDING_ROWS,
+        )
+        settings.update(overrides)
+        return cls(**settings)
+
+    # --- PRODUCER SIDE ---
+
+    def start(self):
+        """Start the writer thread (idempotent; also done by the first record())"""
+        with self._condition:
+            if self._thread is None and self.enabled:
+                self._closing = False
+                self._thread = threading.Thread(target=self._run, name=f"audit-log-{self.source}", daemon=True)
+                self._thread.start()
+
+    def record(self, endpoint: str, model_version: str, feature_names: Sequence[str], features: np.ndarray,
+               probabilities: np.ndarray, ids: Optional[Sequence[Any]] = None,
+               extra: Optional[Sequence[Dict[str, Any]]] = None) -> bool:
+        """
+        Queue predictions for the log without formatting or writing them
+
+        The arrays are kept by reference, so callers must not modify them
+        afterwards.
+
+        Args:
+            endpoint: Where the predictions were made ("/predict", "cli", ...)
+            model_version: Version label of the model that made them
+            feature_names: Column names of `features`
+            features: (n_rows, n_features) inputs
+            probabilities: (n_rows, 2) class probabilities
+            ids: Optional identifier per row (run_id, sample name, kepoi_name)
+            extra: Optional dictionary per row merged into its line
+
+        Returns:
+            False if the rows were dropped because the queue was full
+        """
+        if not self.enabled or len(features) == 0:
+            return True
+        if self._thread is None:
+            self.start()
+        batch = _Batch(endpoint, model_version, feature_names, features, probabilities, ids, extra)
+        with self._condition:
+            def full():
+                # A batch larger than the whole queue is let through when the queue is empty
+                return self._pending_rows and self._pending_rows + batch.rows > self.max_pending_rows
+
+            if self.policy == "block":
+                while full() and not self._closing:
+                    self._condition.wait()
+            if full() or self._closing:
+                self.dropped += batch.rows
+                return False
+            self._queue.append(batch)
+            self._pending_rows += batch.rows
+            self.recorded += batch.rows
+            self._condition.notify_all()
+        return True
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Write everything still queued, close the segment and stop the
+        writer. A later record() starts a new writer and segment.
+        """
+        with self._condition:
+            thread = self._thread
+            self._closing = True
+            self._condition.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        with self._condition:
+            self._thread = None
+
+    def __enter__(self) -> "AuditLog":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- WRITER THREAD ---
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closing:
+                    self._condition.wait()
+                if not self._queue:
+                    break
+                batches = list(self._queue)
+                self._queue.clear()
+            try:
+                self._write(batches)
+            except Exception as e:
+                self.write_errors += 1
+                print(f"Warning: audit log write failed, {sum(b.rows for b in batches)} rows lost: {e}")
+            with self._condition:
+                self._pending_rows -= sum(batch.rows for batch in batches)
+                self._condition.notify_all()
+        self._close_segment()
+
+    def _write(self, batches: List[_Batch]):
+        lines = []
+        for batch in batches:
+            lines.extend(self._format(batch))
+        data = "".join(lines).encode("utf-8")
+        if self.compress:
+            data = gzip.compress(data, compresslevel=6)
+
+        if (self._file is None or self._segment_size >= self.segment_bytes
+                or (self.segment_seconds > 0 and time.time() - self._segment_opened >= self.segment_seconds)):
+            self._open_segment()
+        self._file.write(data)
+        self._file.flush()
+        self._segment_size += len(data)
+        self.bytes_written += len(data)
+        self.written += len(lines)
+
+    def _format(self, batch: _Batch) -> List[str]:
+        """One JSON line per row; runs on the writer thread"""
+        timestamp = datetime.fromtimestamp(batch.timestamp, tz=timezone.utc).isoformat()
+        names = list(batch.feature_names)
+        features = np.asarray(batch.features).tolist()
+        probabilities = np.asarray(batch.probabilities, dtype=np.float64)
+        exoplanet = probabilities[:, 1].tolist()
+        predictions = (probabilities[:, 1] > probabilities[:, 0]).astype(int).tolist()
+        ids = batch.ids.tolist() if isinstance(batch.ids, np.ndarray) else batch.ids
+        ids = ids if ids is not None else [None] * batch.rows
+        extra = batch.extra if batch.extra is not None else [None] * batch.rows
+
+        lines = []
+        for index in range(batch.rows):
+            entry = {
+                "timestamp": timestamp,
+                "source": self.source,
+                "endpoint": batch.endpoint,
+                "model_version": batch.model_version,
+                "index": index,
+                "id": ids[index],
+                "features": dict(zip(names, features[index])),
+                "prediction": predictions[index],
+                "exoplanet_probability": exoplanet[index],
+            }
+            if extra[index]:
+                entry.update(extra[index])
+            lines.append(json.dumps(entry, default=str) + "\n")
+        return lines
+
+    def _open_segment(self):
+        self._close_segment()
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        name = f"predictions-{self.source}-{stamp}-{os.getpid()}-{self._sequence:04d}{suffix}"
+        self._segment_path = os.path.join(self.directory, name)
+        self._file = open(self._segment_path, "ab")
+        self._segment_opened = time.time()
+        self._segment_size = 0
+        self.segments += 1
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "policy": self.policy,
+            "compress": self.compress,
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors,
+            "pending_rows": self._pending_rows,
+            "segments": self.segments,
+            "bytes_written": self.bytes_written,
+            "current_segment": self._segment_path,
+        }
+
+def iter_records(directory: str = DEFAULT_DIR) -> Iterator[Dict[str, Any]]:
+    """Every logged prediction, oldest segment first (plain and gzip segments)"""
+    if not os.path.isdir(directory):
+        return
+    # predictions-<source>-<stamp>-<pid>-<sequence>.jsonl[.gz]: order by stamp, not source
+    names = [name for name in os.listdir(directory) if name.startswith("predictions-")]
+    for name in sorted(names, key=lambda name: name.split(".")[0].rsplit("-", 3)[1:]):
+        path = os.path.join(directory, name)
+        if name.endswith(".jsonl.gz"):
+            opener = gzip.open
+        elif name.endswith(".jsonl"):
+            opener = open
+        else:
+            continue
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
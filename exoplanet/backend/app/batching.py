@@ -0,0 +1,158 @@
+# backend/app/batching.py
+
+import asyncio
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+class MicroBatcher:
+    """
+    Coalesce concurrent prediction calls into vectorized model passes.
+
+    Callers submit feature rows and await a future. A single background
+    task collects queued rows until either max_batch_size rows are waiting
+    or max_wait_ms has passed since the first one arrived, runs one
+    predict_fn(matrix, context) call per distinct context on the stacked
+    matrix in a worker thread, and resolves each caller's future with its
+    own slice of the result. A coroutine predict_fn is awaited instead, for
+    callers that do their own offloading.
+
+    The context is whatever the caller needs scored against (e.g. the
+    model it captured); rows submitted with different context objects are
+    never stacked together, so a model swap between submit and flush does
+    not change which model scores a row.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray, Any], Any],
+                 max_batch_size: int = 64, max_wait_ms: float = 2.0, executor=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.batch_count = 0
+        self.row_count = 0
+        self.batch_sizes: Counter = Counter()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background batching task on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching task and fail anything still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+
+    async def submit(self, features_array: np.ndarray, context: Any = None) -> np.ndarray:
+        """
+        Queue a (n_rows, n_features) matrix and wait for its predictions
+
+        Args:
+            features_array: Rows to score
+            context: Passed to predict_fn; only rows with the same context
+                object (by identity) share a pass
+
+        Returns:
+            The rows of predict_fn's output that belong to this submission
+        """
+        if not self.running:
+            raise RuntimeError("Micro-batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features_array, future, context))
+        return await future
+
+    async def _collect(self) -> List[Tuple[np.ndarray, asyncio.Future, Any]]:
+        """Wait for the first submission, then gather more until full or timed out"""
+        loop = asyncio.get_running_loop()
+        items = [await self._queue.get()]
+        rows = len(items[0][0])
+        deadline = loop.time() + self.max_wait
+
+        while rows < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            items.append(item)
+            rows += len(item[0])
+
+        return items
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            collected = await self._collect()
+            # Callers that gave up (e.g. client disconnect) are skipped
+            groups: Dict[int, List[Tuple[np.ndarray, asyncio.Future, Any]]] = {}
+            for item in collected:
+                if not item[1].done():
+                    groups.setdefault(id(item[2]), []).append(item)
+
+            for items in groups.values():
+                await self._flush(loop, items)
+
+    async def _flush(self, loop, items: List[Tuple[np.ndarray, asyncio.Future, Any]]):
+        """One predict_fn pass over submissions that share a context"""
+        context = items[0][2]
+        batch = np.vstack([rows for rows, _, _ in items])
+        try:
+            if asyncio.iscoroutinefunction(self.predict_fn):
+                output = await self.predict_fn(batch, context)
+            else:
+                output = await loop.run_in_executor(self.executor, self.predict_fn, batch, context)
+        except Exception as e:
+            for _, future, _ in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for rows, future, _ in items:
+            if not future.done():
+                future.set_result(output[offset:offset + len(rows)])
+            offset += len(rows)
+
+        self.batch_count += 1
+        self.row_count += len(batch)
+        self.batch_sizes[len(batch)] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Achieved batch sizes, for tuning max_batch_size / max_wait_ms"""
+        return {
+            "enabled": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches": self.batch_count,
+            "rows": self.row_count,
+            "mean_batch_size": self.row_count / self.batch_count if self.batch_count else 0.0,
+            "max_observed_batch_size": max(self.batch_sizes) if self.batch_sizes else 0,
+            "batch_size_histogram": {str(size): count for size, count in sorted(self.batch_sizes.items())},
+        }
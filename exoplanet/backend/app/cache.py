@@ -0,0 +1,87 @@
+# backend/app/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+class PredictionCache:
+    """
+    Bounded LRU cache of prediction results with optional TTL.
+
+    Keys are the feature vector rounded to `decimals` places plus the
+    model's artifact hash, so repeated requests for the same object skip
+    scaling and the forward pass, and a different model never serves
+    another model's results. A max_size of 0 disables the cache.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: Optional[float] = None, decimals: int = 6):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds or None
+        self.decimals = decimals
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def make_key(self, features: Sequence[float], model_hash: str) -> Tuple:
+        """Canonical cache key for one feature vector under one model"""
+        return tuple(round(float(value), self.decimals) for value in features) + (model_hash,)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, e.g. after the model is reloaded"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
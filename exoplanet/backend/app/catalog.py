@@ -0,0 +1,264 @@
+# backend/app/catalog.py
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .artifacts import ModelArtifacts, hash_files, load_artifacts
+from .dataset import CACHE_DIR, DATA_PATH, DISPOSITION_COLUMN, ID_COLUMN, load_kepler
+
+# --- PRECOMPUTED CATALOG INDEX ---
+# Every KOI in data/kepler.csv is scored once per model version and stored
+# in an SQLite file with the KOI name as primary key and an index on every
+# numeric column, so /predict/koi/{kepoi_name} and range queries such as
+# "exoplanet_probability > 0.9 and koi_prad < 2" are index lookups rather
+# than model passes. Files are named after the model version and written
+# atomically; a model swap simply starts reading a different file. Each
+# index records the hash of the catalog it was built from, and one built
+# from an older data/kepler.csv is treated as missing.
+
+INDEX_DIR = CACHE_DIR
+TABLE = 'predictions'
+OPERATORS = {'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<=', 'eq': '='}
+MAX_QUERY_LIMIT = 10000
+
+def index_path(artifacts: ModelArtifacts, index_dir: str = INDEX_DIR) -> str:
+    # Registry versions carry both variants, so the variant and precision
+    # are part of the name as well
+    return os.path.join(index_dir, f"catalog_{artifacts.version_label}_{artifacts.variant}_{artifacts.precision}.sqlite")
+
+def build_index(artifacts: ModelArtifacts, path: str = DATA_PATH, index_dir: str = INDEX_DIR) -> Dict[str, Any]:
+    """
+    Score the whole catalog with a model and write its index
+
+    Args:
+        artifacts: Model to score with (its version, variant and precision name the file)
+        path: Catalog CSV
+        index_dir: Where to write the index
+
+    Returns:
+        The index metadata (path, rows, timings)
+    """
+    start = time.perf_counter()
+    dataset = load_kepler(path, artifacts.feature_names)
+    probabilities = artifacts.engine.predict_proba(dataset.features)
+    score_seconds = time.perf_counter() - start
+
+    feature_names = artifacts.feature_names
+    columns = [ID_COLUMN, DISPOSITION_COLUMN, 'prediction', 'confidence',
+               'exoplanet_probability', 'not_exoplanet_probability'] + feature_names
+    records = zip(
+        dataset.kepoi_name.tolist(),
+        dataset.disposition.tolist(),
+        probabilities.argmax(axis=1).tolist(),
+        probabilities.max(axis=1).tolist(),
+        probabilities[:, 1].tolist(),
+        probabilities[:, 0].tolist(),
+        *dataset.features.T.tolist(),
+    )
+    meta = {
+        "model_version": artifacts.version_label,
+        "artifact_hash": artifacts.artifact_hash,
+        "engine": artifacts.engine_name,
+        "variant": artifacts.variant,
+        "precision": artifacts.precision,
+        "source_hash": dataset.source_hash,
+        "feature_names": ",".join(feature_names),
+        "rows": str(len(dataset)),
+        "created_at": datetime.now().isoformat(),
+    }
+
+    os.makedirs(index_dir, exist_ok=True)
+    target = index_path(artifacts, index_dir)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        column_defs = [f"{ID_COLUMN} TEXT PRIMARY KEY", f"{DISPOSITION_COLUMN} TEXT", "prediction INTEGER"]
+        column_defs += [f"{name} REAL" for name in columns[3:]]
+        connection.execute(f"CREATE TABLE {TABLE} ({', '.join(column_defs)}) WITHOUT ROWID")
+        # KOI names are unique in the archive; keep the first if a file repeats one
+        connection.executemany(
+            f"INSERT OR IGNORE INTO {TABLE} VALUES ({', '.join('?' * len(columns))})", records
+        )
+        for name in columns[1:]:
+            connection.execute(f"CREATE INDEX idx_{name} ON {TABLE} ({name})")
+        connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        connection.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(tmp_path, target)
+
+    return {**meta, "path": target, "score_seconds": score_seconds,
+            "build_seconds": time.perf_counter() - start}
+
+class CatalogIndex:
+    """
+    Read-only queries against one index file.
+
+    Each thread gets its own SQLite connection, so the index can be
+    queried from the API's worker threads without a lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self.meta = dict(self._connection().execute("SELECT key, value FROM meta").fetchall())
+        self.feature_names = self.meta["feature_names"].split(",")
+        self.columns = [ID_COLUMN, DISPOSITION_COLUMN, 'prediction', 'confidence',
+                        'exoplanet_probability', 'not_exoplanet_probability'] + self.feature_names
+        self._numeric_columns = set(self.columns[2:])
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.connection = connection
+        return connection
+
+    def _to_result(self, row: Tuple) -> Dict[str, Any]:
+        values = dict(zip(self.columns, row))
+        return {
+            ID_COLUMN: values[ID_COLUMN],
+            DISPOSITION_COLUMN: values[DISPOSITION_COLUMN],
+            "prediction": values["prediction"],
+            "prediction_label": "Exoplanet" if values["prediction"] == 1 else "Not Exoplanet",
+            "confidence": values["confidence"],
+            "exoplanet_probability": values["exoplanet_probability"],
+            "not_exoplanet_probability": values["not_exoplanet_probability"],
+            "features": {name: values[name] for name in self.feature_names},
+        }
+
+    def lookup(self, kepoi_name: str) -> Optional[Dict[str, Any]]:
+        """Stored prediction for one KOI, or None if it is not in the catalog"""
+        row = self._connection().execute(
+            f"SELECT * FROM {TABLE} WHERE {ID_COLUMN} = ?", (kepoi_name,)
+        ).fetchone()
+        return self._to_result(row) if row is not None else None
+
+    def parse_filters(self, params: Dict[str, str]) -> List[Tuple[str, str, Any]]:
+        """
+        Turn query parameters like exoplanet_probability_gt=0.9 or
+        koi_disposition=CONFIRMED into (column, operator, value) filters
+
+        Raises:
+            ValueError: For an unknown column or operator, or a non-numeric bound
+        """
+        filters = []
+        for key, value in params.items():
+            if key == DISPOSITION_COLUMN:
+                filters.append((DISPOSITION_COLUMN, '=', value))
+                continue
+            column, _, op = key.rpartition('_')
+            if column not in self._numeric_columns or op not in OPERATORS:
+                raise ValueError(f"Unknown filter '{key}'; use <column>_<{'|'.join(OPERATORS)}> with a column "
+                                 f"from {sorted(self._numeric_columns)}, or {DISPOSITION_COLUMN}=<value>")
+            try:
+                filters.append((column, OPERATORS[op], float(value)))
+            except ValueError:
+                raise ValueError(f"Filter '{key}' needs a number, got '{value}'")
+        return filters
+
+    def query(self, filters: List[Tuple[str, str, Any]], order_by: str = 'exoplanet_probability',
+              descending: bool = True, limit: int = 100, offset: int = 0) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Rows matching every filter
+
+        Returns:
+            Tuple of (total matches, one page of results)
+
+        Raises:
+            ValueError: For an unknown order_by column or a limit outside 1..MAX_QUERY_LIMIT
+        """
+        if order_by not in self.columns:
+            raise ValueError(f"Cannot order by '{order_by}'")
+        if not 1 <= limit <= MAX_QUERY_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_QUERY_LIMIT}")
+
+        # Column names come from the whitelist above; values are bound parameters
+        where = " AND ".join(f"{column} {op} ?" for column, op, _ in filters) or "1"
+        values = [value for _, _, value in filters]
+        connection = self._connection()
+        total = connection.execute(f"SELECT COUNT(*) FROM {TABLE} WHERE {where}", values).fetchone()[0]
+        rows = connection.execute(
+            f"SELECT * FROM {TABLE} WHERE {where} ORDER BY {order_by} {'DESC' if descending else 'ASC'}, "
+            f"{ID_COLUMN} LIMIT ? OFFSET ?",
+            values + [limit, max(offset, 0)],
+        ).fetchall()
+        return total, [self._to_result(row) for row in rows]
+
+_indexes: Dict[str, CatalogIndex] = {}
+_indexes_lock = threading.Lock()
+_source_hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+def source_hash(path: str = DATA_PATH) -> Optional[str]:
+    """
+    Hash of the catalog file, as stored in KeplerDataset.source_hash
+
+    Re-hashed only when the file's size or modification time changes, so
+    checking it on every request costs a stat. None if the file is missing.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _source_hashes.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = _source_hashes[path] = (stamp, hash_files([path]))
+    return cached[1]
+
+def get_index(artifacts: ModelArtifacts, index_dir: str = INDEX_DIR, path: str = DATA_PATH) -> Optional[CatalogIndex]:
+    """
+    Open (once) the index built for a model from the current catalog
+
+    Returns:
+        The index, or None if it has not been built or was built from an
+        older version of the catalog file (without the file, any index
+        is used as is)
+    """
+    target = index_path(artifacts, index_dir)
+    expected = source_hash(path)
+
+    def current(index: Optional[CatalogIndex]) -> bool:
+        return index is not None and expected in (None, index.meta.get("source_hash"))
+
+    index = _indexes.get(target)
+    if current(index):
+        return index
+    if not os.path.exists(target):
+        return None
+    with _indexes_lock:
+        index = _indexes.get(target)
+        if not current(index):
+            # Not opened yet, or opened before the file was rebuilt
+            index = _indexes[target] = CatalogIndex(target)
+    return index if current(index) else None
+
+if __name__ == "__main__":
+    # python -m app.catalog [--version V] [--engine numpy]  (from the backend directory)
+    import argparse
+    from . import config
+    from .artifacts import VARIANT_CHOICES
+    from .engine import ENGINE_CHOICES, PRECISION_CHOICES
+
+    parser = argparse.ArgumentParser(description="Score data/kepler.csv and write the catalog index for a model version")
+    parser.add_argument("--version", help="Registry version (default: the active one)")
+    parser.add_argument("--engine", choices=ENGINE_CHOICES, default=config.INFERENCE_ENGINE,
+                        help="Engine that scores the catalog (default: EXOPLANET_ENGINE); the index "
+                             "name does not depend on it")
+    parser.add_argument("--variant", choices=VARIANT_CHOICES, default=config.MODEL_VARIANT)
+    parser.add_argument("--precision", choices=PRECISION_CHOICES, default=config.INFERENCE_PRECISION)
+    parser.add_argument("--path", default=DATA_PATH)
+    args = parser.parse_args()
+
+    artifacts = load_artifacts(args.engine, variant=args.variant, precision=args.precision, version=args.version)
+    info = build_index(artifacts, args.path)
+    print(f"✅ Indexed {info['rows']} KOIs for model {info['model_version']} in {info['build_seconds']:.2f}s "
+          f"(scoring {info['score_seconds'] * 1000:.0f} ms)")
+    print(f"   {info['path']}")
@@ -0,0 +1,147 @@
+# backend/app/client.py
+
+import random
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from . import wire
+
+# --- REFERENCE CLIENT ---
+# A thread-safe client for the prediction API (see API_CONTRACT.md). One
+# instance keeps a pool of keep-alive connections, so callers pay the TCP
+# handshake once rather than per prediction. Predictions have no side
+# effects, so every call is retried on connection errors, timeouts and
+# 502/503/504, honouring Retry-After. httpx is imported on first use.
+
+RETRY_STATUS_CODES = (502, 503, 504)
+
+class PredictionError(Exception):
+    """The API rejected a request (4xx) or kept failing after all retries"""
+
+    def __init__(self, status_code: Optional[int], detail: Any, request_id: Optional[str] = None):
+        super().__init__(f"HTTP {status_code}: {detail}" if status_code else str(detail))
+        self.status_code = status_code
+        self.detail = detail
+        self.request_id = request_id
+
+class ExoplanetClient:
+    """
+    Pooled, retrying client for /predict and /predict/batch.
+
+    Use it as a context manager, or call close() when done:
+
+        with ExoplanetClient("http://127.0.0.1:8000") as client:
+            result = client.predict({"koi_period": 10.5, ...})
+    """
+
+    def __init__(self, base_url: str = "http://127.0.0.1:8000", timeout: float = 10.0,
+                 max_connections: int = 32, max_keepalive: int = 16, retries: int = 3,
+                 backoff: float = 0.1, max_backoff: float = 5.0, http_client=None):
+        """
+        Args:
+            base_url: Root URL of the prediction API
+            timeout: Seconds per attempt
+            max_connections: Upper bound on open connections
+            max_keepalive: Idle connections kept open for reuse
+            retries: Extra attempts after a transient failure
+            backoff: First retry delay in seconds, doubled per attempt
+            max_backoff: Cap on any single delay (including Retry-After)
+            http_client: Pre-built httpx.Client to use instead (e.g. FastAPI's
+                TestClient for in-process tests); base_url and pool settings are ignored
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("The reference client needs httpx: pip install httpx")
+        self._httpx = httpx
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._client = http_client or httpx.Client(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._client.close()
+
+    def _delay(self, attempt: int, response=None) -> float:
+        """Retry-After if the server sent one, else exponential backoff with jitter"""
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * (2 ** attempt), self.max_backoff) * random.uniform(0.5, 1.0)
+
+    def request(self, method: str, path: str, request_id: Optional[str] = None, **kwargs):
+        """
+        Send a request, retrying transient failures
+
+        Every attempt carries the same X-Request-ID, which the API echoes back.
+
+        Raises:
+            PredictionError: On a 4xx/5xx that is not retried, or when retries run out
+        """
+        request_id = request_id or uuid.uuid4().hex
+        headers = {"X-Request-ID": request_id, **kwargs.pop("headers", {})}
+        transient = (self._httpx.TransportError,)
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = self._client.request(method, path, headers=headers, **kwargs)
+            except transient as e:
+                if attempt == self.retries:
+                    raise PredictionError(None, f"{type(e).__name__}: {e}", request_id)
+                time.sleep(self._delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.retries:
+                time.sleep(self._delay(attempt, response))
+                continue
+            if response.status_code >= 400:
+                try:
+                    detail = response.json().get("detail", response.text)
+                except ValueError:
+                    detail = response.text
+                raise PredictionError(response.status_code, detail, request_id)
+            return response
+
+    def predict(self, features: Dict[str, float], request_id: Optional[str] = None) -> Dict[str, Any]:
+        """Score one object; returns the /predict response document"""
+        return self.request("POST", "/predict", request_id, json=features).json()
+
+    def predict_batch(self, rows: Optional[List[Dict[str, float]]] = None,
+                      columns: Optional[Dict[str, List[float]]] = None,
+                      request_id: Optional[str] = None) -> Dict[str, Any]:
+        """Score many objects (row or columnar form); returns the /predict/batch response document"""
+        body = {"rows": rows} if rows is not None else {"columns": columns}
+        return self.request("POST", "/predict/batch", request_id, json=body).json()
+
+    def predict_matrix(self, matrix: np.ndarray, request_id: Optional[str] = None) -> np.ndarray:
+        """
+        Score a (n_rows, n_features) matrix in model feature order over the binary format
+
+        Returns:
+            (n_rows, 2) class probabilities, NaN in rows the API rejected
+        """
+        media_type = wire.MEDIA_TYPES[wire.MATRIX]
+        response = self.request("POST", "/predict/batch", request_id, content=wire.encode_matrix(matrix),
+                                headers={"Content-Type": media_type, "Accept": media_type})
+        return wire.decode_matrix(response.content)
+
+    def feature_names(self) -> Sequence[str]:
+        """Feature order expected by the matrix format"""
+        return self.request("GET", "/model/info").json()["features"]
+
+    def health(self) -> Dict[str, Any]:
+        return self.request("GET", "/health").json()
@@ -0,0 +1,62 @@
+# backend/app/coalesce.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+import numpy as np
+
+class SingleFlight:
+    """
+    Share one computation between concurrent identical requests.
+
+    The first caller for a key starts the computation as a task; callers
+    that arrive with the same key while it is running await that task
+    instead of starting their own, and every caller gets the same result
+    or exception. Keys are forgotten as soon as the task finishes, so
+    nothing is served after the fact (that is the cache's job). The task
+    is shielded: a caller that disconnects does not cancel it for the
+    others. Runs on the event loop only, so no lock is needed.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(features: np.ndarray, model_hash: str) -> Hashable:
+        """Exact key for one feature row under one model (no rounding, unlike the cache)"""
+        return np.ascontiguousarray(features, dtype=np.float64).tobytes(), model_hash
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Result of compute(), shared with any identical call already in flight"""
+        if not self.enabled:
+            return await compute()
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every caller went away
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.leaders + self.coalesced
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._in_flight),
+            "computations": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / requests if requests else 0.0,
+        }
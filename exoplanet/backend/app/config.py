@@ -0,0 +1,92 @@
+# backend/app/config.py
+
+import os
+
+# --- RUNTIME SETTINGS ---
+# Every setting can be overridden with an environment variable so the
+# same image can be tuned per deployment without code changes.
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+# Inference engine: "sklearn" (pickled model + scaler) or "numpy"
+# (scaler-folded weights exported by train_model.py, no sklearn at serve time)
+INFERENCE_ENGINE = os.environ.get("EXOPLANET_ENGINE", "sklearn")
+
+# Model variant: "full" (train_model.py) or "distilled" (the smaller
+# student written by distill_model.py)
+MODEL_VARIANT = os.environ.get("EXOPLANET_MODEL_VARIANT", "full")
+
+# Registry version to serve (see app/registry.py). Unset follows the
+# active version, and running workers poll for changes every
+# MODEL_WATCH_SECONDS (0 disables polling; /model/reload still works)
+MODEL_VERSION = os.environ.get("EXOPLANET_MODEL_VERSION") or None
+MODEL_WATCH_SECONDS = _env_float("EXOPLANET_MODEL_WATCH_SECONDS", 5.0)
+
+# Arithmetic of the numpy engine: "float64", "float32", or "int8"
+# (quantized weights, float32 compute)
+INFERENCE_PRECISION = os.environ.get("EXOPLANET_PRECISION", "float64")
+
+# joblib mmap_mode for the pickled artifacts ("r" shares weight pages
+# between workers); empty means load into memory
+ARTIFACT_MMAP_MODE = os.environ.get("EXOPLANET_MMAP_MODE") or None
+
+# Micro-batching of concurrent /predict calls (off by default)
+MICRO_BATCHING_ENABLED = _env_bool("EXOPLANET_MICRO_BATCHING", False)
+MICRO_BATCH_MAX_SIZE = _env_int("EXOPLANET_MICRO_BATCH_MAX_SIZE", 64)
+MICRO_BATCH_MAX_WAIT_MS = _env_float("EXOPLANET_MICRO_BATCH_MAX_WAIT_MS", 2.0)
+
+# Executor for inference and model loading: "thread" or "process"
+# (inference in worker processes). At most MAX_PENDING requests wait for
+# inference at once; further ones get 503 with Retry-After
+INFERENCE_EXECUTOR = os.environ.get("EXOPLANET_EXECUTOR", "thread")
+EXECUTOR_WORKERS = _env_int("EXOPLANET_EXECUTOR_WORKERS", min(4, os.cpu_count() or 1))
+MAX_PENDING_REQUESTS = _env_int("EXOPLANET_MAX_PENDING", 64)
+RETRY_AFTER_SECONDS = _env_float("EXOPLANET_RETRY_AFTER_SECONDS", 1.0)
+
+# Precomputed catalog index behind /predict/koi (see app/catalog.py).
+# With autobuild the API scores data/kepler.csv itself the first time a
+# model version is queried; otherwise run python -m app.catalog
+CATALOG_AUTOBUILD = _env_bool("EXOPLANET_CATALOG_AUTOBUILD", True)
+
+# Drift monitor: running statistics of /predict and /predict/batch
+# inputs compared with the training data (see app/drift.py); features
+# report "insufficient_data" until DRIFT_MIN_SAMPLES rows have been seen
+DRIFT_ENABLED = _env_bool("EXOPLANET_DRIFT", True)
+DRIFT_MIN_SAMPLES = _env_int("EXOPLANET_DRIFT_MIN_SAMPLES", 100)
+
+# Prediction audit log: every prediction is appended to JSONL segments
+# by a background writer (see app/audit.py). The directory defaults to
+# data/audit. Once AUDIT_LOG_MAX_PENDING_ROWS are waiting to be written
+# the API drops new rows (record() runs on the event loop and must never
+# wait); the CLI scripts block instead
+AUDIT_LOG_ENABLED = _env_bool("EXOPLANET_AUDIT_LOG", True)
+AUDIT_LOG_DIR = os.environ.get("EXOPLANET_AUDIT_LOG_DIR") or None
+AUDIT_LOG_COMPRESS = _env_bool("EXOPLANET_AUDIT_LOG_COMPRESS", True)
+AUDIT_LOG_SEGMENT_MB = _env_float("EXOPLANET_AUDIT_LOG_SEGMENT_MB", 64.0)
+AUDIT_LOG_SEGMENT_SECONDS = _env_float("EXOPLANET_AUDIT_LOG_SEGMENT_SECONDS", 3600.0)
+AUDIT_LOG_MAX_PENDING_ROWS = _env_int("EXOPLANET_AUDIT_LOG_MAX_PENDING_ROWS", 100000)
+
+# Single-flight coalescing: concurrent /predict calls with the same
+# feature vector and model share one computation
+COALESCE_ENABLED = _env_bool("EXOPLANET_COALESCE", True)
+
+# Result cache in front of /predict (0 disables it)
+CACHE_MAX_SIZE = _env_int("EXOPLANET_CACHE_SIZE", 10000)
+CACHE_TTL_SECONDS = _env_float("EXOPLANET_CACHE_TTL_SECONDS", 0.0)
+CACHE_DECIMALS = _env_int("EXOPLANET_CACHE_DECIMALS", 6)
+
+# Cached /predict/explain results (same key, TTL and rounding as above)
+EXPLAIN_CACHE_SIZE = _env_int("EXOPLANET_EXPLAIN_CACHE_SIZE", 2000)
+
+# Prometheus-style /metrics endpoint and hot-path timers
+METRICS_ENABLED = _env_bool("EXOPLANET_METRICS", True)
@@ -0,0 +1,162 @@
+# backend/app/dataset.py
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from .artifacts import hash_files
+from .validation import REQUIRED_FEATURES
+
+# --- CACHED KEPLER DATASET ---
+# train_model.py and test_model.py both need the cleaned feature matrix
+# from the NASA Exoplanet Archive CSV. It is parsed once (only the
+# columns we use, with explicit dtypes) and stored as an uncompressed
+# .npz next to the CSV, keyed by the CSV's content hash, so later runs
+# skip pandas entirely and a new download is picked up automatically.
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '../../data'))
+DATA_PATH = os.path.join(DATA_DIR, 'kepler.csv')
+CACHE_DIR = os.path.join(DATA_DIR, '.cache')
+
+ID_COLUMN = 'kepoi_name'
+DISPOSITION_COLUMN = 'koi_disposition'
+# 'CONFIRMED' and 'CANDIDATE' are positive (1), 'FALSE POSITIVE' is negative (0)
+POSITIVE_DISPOSITIONS = ('CONFIRMED', 'CANDIDATE')
+
+@dataclass
+class KeplerDataset:
+    features: np.ndarray      # (n_rows, n_features) float64, no missing values
+    target: np.ndarray        # (n_rows,) int8, 1 = exoplanet candidate
+    disposition: np.ndarray   # (n_rows,) koi_disposition strings
+    kepoi_name: np.ndarray    # (n_rows,) KOI identifiers
+    feature_names: List[str]
+    source_hash: str
+    from_cache: bool = False
+    load_seconds: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.target)
+
+    def to_frame(self):
+        """pandas DataFrame with the feature columns, is_exoplanet, disposition and name"""
+        import pandas as pd
+
+        df = pd.DataFrame(self.features, columns=self.feature_names)
+        df['is_exoplanet'] = self.target
+        df[DISPOSITION_COLUMN] = self.disposition
+        df[ID_COLUMN] = self.kepoi_name
+        return df
+
+def _cache_path(cache_dir: str, source_hash: str) -> str:
+    return os.path.join(cache_dir, f"kepler_{source_hash}.npz")
+
+def _prune_cache(cache_dir: str, keep: str):
+    """Remove cached copies of older versions of the CSV"""
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith("kepler_") and name.endswith(".npz") and path != keep:
+            os.remove(path)
+
+def _parse_csv(path: str, feature_names: List[str]):
+    """Read and clean the archive CSV (the slow path, run once per source file)"""
+    import pandas as pd
+    from .streaming import count_comment_lines
+
+    dtypes = {name: np.float64 for name in feature_names}
+    dtypes.update({DISPOSITION_COLUMN: str, ID_COLUMN: str})
+    df = pd.read_csv(
+        path,
+        skiprows=count_comment_lines(path),
+        usecols=list(dtypes),
+        dtype=dtypes,
+    )
+
+    # Drop rows with missing values in the selected feature columns
+    df = df.dropna(subset=feature_names)
+
+    features = np.ascontiguousarray(df[feature_names].to_numpy(dtype=np.float64))
+    disposition = df[DISPOSITION_COLUMN].fillna('').to_numpy(dtype=str)
+    target = np.isin(disposition, POSITIVE_DISPOSITIONS).astype(np.int8)
+    kepoi_name = df[ID_COLUMN].fillna('').to_numpy(dtype=str)
+    return features, target, disposition, kepoi_name
+
+def load_kepler(path: str = DATA_PATH, feature_names: Optional[List[str]] = None,
+                cache_dir: Optional[str] = CACHE_DIR, rebuild: bool = False) -> KeplerDataset:
+    """
+    Load the cleaned Kepler KOI dataset, from the binary cache when possible
+
+    Args:
+        path: NASA Exoplanet Archive cumulative KOI table (CSV)
+        feature_names: Feature columns to keep (default: the model features)
+        cache_dir: Where to keep parsed copies; None disables caching
+        rebuild: Re-parse the CSV even if a cached copy exists
+
+    Returns:
+        KeplerDataset with rows that have every feature present
+
+    Raises:
+        FileNotFoundError: If the CSV does not exist
+    """
+    feature_names = list(feature_names or REQUIRED_FEATURES)
+    start = time.perf_counter()
+    source_hash = hash_files([path])
+    cache_path = _cache_path(cache_dir, source_hash) if cache_dir else None
+
+    if cache_path and not rebuild and os.path.exists(cache_path):
+        with np.load(cache_path, allow_pickle=False) as cached:
+            if cached['feature_names'].tolist() == feature_names:
+                return KeplerDataset(
+                    features=cached['features'],
+                    target=cached['target'],
+                    disposition=cached['disposition'],
+                    kepoi_name=cached['kepoi_name'],
+                    feature_names=feature_names,
+                    source_hash=source_hash,
+                    from_cache=True,
+                    load_seconds=time.perf_counter() - start,
+                )
+
+    features, target, disposition, kepoi_name = _parse_csv(path, feature_names)
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so a concurrent reader never
+        # sees a half-written cache
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, features=features, target=target, disposition=disposition,
+                     kepoi_name=kepoi_name, feature_names=np.array(feature_names))
+        os.replace(tmp_path, cache_path)
+        logger.info("Cached %d Kepler rows to %s", len(target), cache_path)
+        _prune_cache(cache_dir, keep=cache_path)
+
+    return KeplerDataset(
+        features=features,
+        target=target,
+        disposition=disposition,
+        kepoi_name=kepoi_name,
+        feature_names=feature_names,
+        source_hash=source_hash,
+        load_seconds=time.perf_counter() - start,
+    )
+
+if __name__ == "__main__":
+    # python -m app.dataset [--rebuild]  (from the backend directory)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or inspect the cached Kepler dataset")
+    parser.add_argument("--path", default=DATA_PATH, help="Archive CSV (default: data/kepler.csv)")
+    parser.add_argument("--rebuild", action="store_true", help="Re-parse the CSV even if cached")
+    args = parser.parse_args()
+
+    dataset = load_kepler(args.path, rebuild=args.rebuild)
+    source = "cache" if dataset.from_cache else "CSV"
+    print(f"Loaded {len(dataset)} rows from {source} in {dataset.load_seconds * 1000:.1f} ms")
+    print(f"Exoplanet candidates: {int(dataset.target.sum())}, false positives: {int((dataset.target == 0).sum())}")
+    print(f"Source hash: {dataset.source_hash}")
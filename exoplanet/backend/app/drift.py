@@ -0,0 +1,218 @@
+# backend/app/drift.py
+
+import json
+import math
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .artifacts import MODEL_DIR, ModelArtifacts
+
+# --- INPUT DRIFT MONITOR ---
+# train_model.py saves reference statistics of the training split next to
+# the model: per-feature mean and standard deviation, and decile edges
+# with the share of training rows in each bin. The API feeds every valid
+# /predict and /predict/batch row into a DriftMonitor, which keeps running
+# statistics in fixed-size arrays (a merged Welford mean/variance and a
+# histogram over the reference bins, plus one bin below the training
+# minimum and one above the maximum). Memory does not grow with traffic,
+# and an update is a handful of vectorized operations under a lock.
+#
+# Drift scores per feature:
+#   psi             population stability index of the live histogram
+#                   against the reference (< 0.1 stable, > 0.25 drifted)
+#   mean_shift      live mean - reference mean, in reference std units
+#   std_ratio       live std / reference std
+#   out_of_range    share of live values outside the training min/max
+
+REFERENCE_NAME = 'drift_reference.json'
+REFERENCE_BINS = 10
+PSI_MODERATE = 0.1
+PSI_DRIFT = 0.25
+_PSI_FLOOR = 1e-4
+
+def bin_indices(matrix: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Histogram slot of every value: 0 below edges[:, 0], 1..bins inside,
+    bins + 1 above edges[:, -1]
+
+    Args:
+        matrix: (n_rows, n_features) values
+        edges: (n_features, bins + 1) bin edges per feature
+    """
+    inside = (matrix[:, :, None] >= edges[None, :, :-1]).sum(axis=2)
+    return inside + (matrix > edges[:, -1])
+
+def _histogram(matrix: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """(n_features, bins + 2) counts of the slots from bin_indices"""
+    n_features, n_slots = edges.shape[0], edges.shape[1] + 1
+    slots = bin_indices(matrix, edges) + np.arange(n_features) * n_slots
+    return np.bincount(slots.ravel(), minlength=n_features * n_slots).reshape(n_features, n_slots)
+
+def reference_statistics(X: np.ndarray, feature_names: List[str], bins: int = REFERENCE_BINS,
+                         source: str = "training") -> Dict[str, Any]:
+    """Mean, std and quantile histogram of each feature in a reference set"""
+    X = np.asarray(X, dtype=np.float64)
+    edges = np.quantile(X, np.linspace(0.0, 1.0, bins + 1), axis=0).T
+    counts = _histogram(X, edges)
+    return {
+        "feature_names": list(feature_names),
+        "rows": int(len(X)),
+        "source": source,
+        "mean": X.mean(axis=0).tolist(),
+        "std": X.std(axis=0).tolist(),
+        "edges": edges.tolist(),
+        "proportions": (counts / len(X)).tolist(),
+    }
+
+def save_reference(path: str, X: np.ndarray, feature_names: List[str]) -> str:
+    with open(path, 'w') as f:
+        json.dump(reference_statistics(X, feature_names), f)
+    return path
+
+_references: Dict[str, Dict[str, Any]] = {}
+_references_lock = threading.Lock()
+
+def load_reference(artifacts: ModelArtifacts) -> Dict[str, Any]:
+    """
+    Reference statistics saved with a model version (loaded once per artifact hash)
+
+    Models trained before the statistics were saved fall back to
+    statistics of data/kepler.csv.
+
+    Raises:
+        FileNotFoundError: If there are neither saved statistics nor the catalog
+    """
+    reference = _references.get(artifacts.artifact_hash)
+    if reference is not None:
+        return reference
+
+    with _references_lock:
+        if artifacts.artifact_hash not in _references:
+            from . import registry
+
+            model_dir = registry.version_dir(artifacts.version) if artifacts.version else MODEL_DIR
+            path = os.path.join(model_dir, REFERENCE_NAME)
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    reference = json.load(f)
+            else:
+                from .dataset import load_kepler
+
+                dataset = load_kepler(feature_names=artifacts.feature_names)
+                reference = reference_statistics(dataset.features, artifacts.feature_names, source="catalog")
+            if reference["feature_names"] != list(artifacts.feature_names):
+                raise ValueError(f"Drift reference features {reference['feature_names']} do not match "
+                                 f"the model's {artifacts.feature_names}")
+            _references[artifacts.artifact_hash] = reference
+        return _references[artifacts.artifact_hash]
+
+def cached_reference(artifacts: ModelArtifacts) -> Optional[Dict[str, Any]]:
+    """Reference already loaded by load_reference, without touching the disk"""
+    return _references.get(artifacts.artifact_hash)
+
+class DriftMonitor:
+    """
+    Streaming per-feature statistics of live inputs, compared with a reference.
+
+    Fixed memory: a count, mean and M2 per feature, and one histogram row
+    per feature. Batches are merged with Chan's parallel update, so one
+    50,000-row batch costs the same handful of array operations as one row.
+    """
+
+    def __init__(self, enabled: bool = True, min_samples: int = 100):
+        self.enabled = enabled
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self.reference: Optional[Dict[str, Any]] = None
+        self.reset()
+
+    def use_reference(self, reference: Optional[Dict[str, Any]]):
+        """Compare against a new reference (None stops monitoring) and start over"""
+        with self._lock:
+            self.reference = reference
+        self.reset()
+
+    def reset(self):
+        """Forget the live statistics"""
+        with self._lock:
+            reference = self.reference
+            n_features = len(reference["feature_names"]) if reference else 0
+            n_slots = len(reference["edges"][0]) + 1 if reference else 0
+            self._edges = np.asarray(reference["edges"]) if reference else None
+            self.count = 0
+            self.mean = np.zeros(n_features)
+            self.m2 = np.zeros(n_features)
+            self.histogram = np.zeros((n_features, n_slots), dtype=np.int64)
+
+    def update(self, matrix: np.ndarray):
+        """Add valid (n_rows, n_features) rows in model feature order"""
+        if not self.enabled or len(matrix) == 0:
+            return
+        edges = self._edges
+        if edges is None or matrix.shape[1] != edges.shape[0]:
+            return
+        n = len(matrix)
+        batch_mean = matrix.mean(axis=0)
+        batch_m2 = ((matrix - batch_mean) ** 2).sum(axis=0) if n > 1 else 0.0
+        histogram = _histogram(matrix, edges)
+        with self._lock:
+            if self._edges is not edges:
+                return  # the reference changed meanwhile
+            total = self.count + n
+            delta = batch_mean - self.mean
+            self.mean += delta * (n / total)
+            self.m2 += batch_m2 + delta ** 2 * (self.count * n / total)
+            self.count = total
+            self.histogram += histogram
+
+    def report(self) -> Dict[str, Any]:
+        """Per-feature drift scores and an overall status"""
+        if self.reference is None:
+            return {"enabled": self.enabled, "status": "no_reference", "samples": 0, "features": {}}
+
+        with self._lock:
+            count, mean, m2, histogram = self.count, self.mean.copy(), self.m2.copy(), self.histogram.copy()
+
+        reference = self.reference
+        ref_mean, ref_std = np.asarray(reference["mean"]), np.asarray(reference["std"])
+        ref_proportions = np.asarray(reference["proportions"])
+
+        features = {}
+        statuses = []
+        for j, name in enumerate(reference["feature_names"]):
+            entry = {"reference_mean": float(ref_mean[j]), "reference_std": float(ref_std[j])}
+            if count:
+                std = math.sqrt(m2[j] / count)
+                live = np.clip(histogram[j] / count, _PSI_FLOOR, None)
+                expected = np.clip(ref_proportions[j], _PSI_FLOOR, None)
+                psi = float(np.sum((live - expected) * np.log(live / expected)))
+                scale = ref_std[j] if ref_std[j] > 0 else 1.0
+                entry.update({
+                    "mean": float(mean[j]),
+                    "std": std,
+                    "mean_shift": float((mean[j] - ref_mean[j]) / scale),
+                    "std_ratio": std / scale,
+                    "psi": psi,
+                    "out_of_range": float((histogram[j, 0] + histogram[j, -1]) / count),
+                })
+            if count == 0 or count < self.min_samples:
+                entry["status"] = "insufficient_data"
+            else:
+                entry["status"] = "drift" if entry["psi"] > PSI_DRIFT else (
+                    "moderate" if entry["psi"] > PSI_MODERATE else "stable")
+            statuses.append(entry["status"])
+            features[name] = entry
+
+        # The worst feature decides the overall status
+        status = next((s for s in ("drift", "moderate", "insufficient_data") if s in statuses), "stable")
+        return {
+            "enabled": self.enabled,
+            "status": status,
+            "samples": count,
+            "min_samples": self.min_samples,
+            "reference": {"rows": reference["rows"], "source": reference["source"]},
+            "features": features,
+        }
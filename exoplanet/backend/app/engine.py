@@ -0,0 +1,361 @@
+# backend/app/engine.py
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .artifacts import WEIGHTS_PATH
+from .utils import predict_probabilities
+
+ENGINE_CHOICES = ("sklearn", "numpy")
+# Arithmetic of the NumPy engine. "int8" keeps post-training quantized
+# weights (one scale per row of the first layer, per column elsewhere) as
+# int8 codes and dequantizes one layer at a time into a float32 scratch
+# buffer during the forward pass.
+PRECISION_CHOICES = ("float64", "float32", "int8")
+
+class SklearnEngine:
+    """Inference through the pickled scikit-learn scaler and model"""
+
+    name = "sklearn"
+
+    def __init__(self, model, scaler, feature_names: List[str]):
+        self.model = model
+        self.scaler = scaler
+        self.feature_names = list(feature_names)
+
+    def predict_proba(self, features_array: np.ndarray) -> np.ndarray:
+        return predict_probabilities(self.model, self.scaler, features_array)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "engine": self.name,
+            "model_type": type(self.model).__name__,
+            "precision": "float64",
+        }
+
+class NumpyMLPEngine:
+    """
+    Pure-NumPy forward pass for an exported MLPClassifier.
+
+    The scaler is folded into the first layer at export time, so raw
+    (unscaled) features go straight into the network. Layer outputs are
+    written into per-thread buffers that are allocated once and reused,
+    and inputs larger than block_rows are processed block by block.
+    With precision="float32" or "int8" the buffers and inputs are
+    float32, halving the memory traffic of every layer; the returned
+    probabilities are always float64. int8 weights stay int8 codes plus
+    float32 scales (a quarter of the float32 size); pass scales to build
+    an engine from codes that are already quantized.
+    """
+
+    name = "numpy"
+
+    def __init__(self, coefs: List[np.ndarray], intercepts: List[np.ndarray], feature_names: List[str],
+                 hidden_activation: str = "relu", out_activation: str = "logistic",
+                 block_rows: int = 512, precision: str = "float64",
+                 scales: Optional[List[np.ndarray]] = None):
+        if hidden_activation not in _HIDDEN_ACTIVATIONS:
+            raise ValueError(f"Unsupported hidden activation: {hidden_activation}")
+        if out_activation not in ("logistic", "softmax"):
+            raise ValueError(f"Unsupported output activation: {out_activation}")
+        if precision not in PRECISION_CHOICES:
+            raise ValueError(f"Unknown precision '{precision}', expected one of {PRECISION_CHOICES}")
+
+        self.precision = precision
+        self.dtype = np.float64 if precision == "float64" else np.float32
+        self.scales = None
+        if precision == "int8":
+            if scales is None:
+                # The folded first layer mixes features on very different
+                # scales, so it gets one scale per input row
+                quantized = [quantize_int8(w, axis=1 if i == 0 else 0) for i, w in enumerate(coefs)]
+                coefs, scales = [q for q, _ in quantized], [scale for _, scale in quantized]
+            # Memory-mapped codes and scales are used as they are, not copied
+            self.coefs = [np.ascontiguousarray(q, dtype=np.int8) for q in coefs]
+            self.scales = [np.ascontiguousarray(scale, dtype=np.float32) for scale in scales]
+        else:
+            self.coefs = [np.ascontiguousarray(w, dtype=self.dtype) for w in coefs]
+        self.intercepts = [np.ascontiguousarray(b, dtype=self.dtype) for b in intercepts]
+        self.feature_names = list(feature_names)
+        self.hidden_activation = hidden_activation
+        self.out_activation = out_activation
+        self.block_rows = block_rows
+        self.n_classes = 2 if out_activation == "logistic" else self.coefs[-1].shape[1]
+        self._local = threading.local()
+
+    @classmethod
+    def load(cls, path: str = WEIGHTS_PATH, **kwargs) -> "NumpyMLPEngine":
+        """Load an engine from a weights file written by export_numpy_weights"""
+        with np.load(path, allow_pickle=False) as data:
+            n_layers = int(data["n_layers"])
+            return cls(
+                coefs=[data[f"coef_{i}"] for i in range(n_layers)],
+                intercepts=[data[f"intercept_{i}"] for i in range(n_layers)],
+                feature_names=data["feature_names"].tolist(),
+                hidden_activation=str(data["hidden_activation"]),
+                out_activation=str(data["out_activation"]),
+                **kwargs
+            )
+
+    def save_arrays(self, directory: str) -> str:
+        """
+        Write the weights as individual .npy files plus a small JSON header
+
+        Unlike .npz, .npy files can be memory-mapped, so worker processes
+        that load them with load_arrays share one copy of the weights.
+        The arrays are written as the engine uses them (int8 codes and
+        their scales when quantized), so loading them converts nothing.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for i, (weights, bias) in enumerate(zip(self.coefs, self.intercepts)):
+            np.save(os.path.join(directory, f"coef_{i}.npy"), weights)
+            np.save(os.path.join(directory, f"intercept_{i}.npy"), bias)
+            if self.scales is not None:
+                np.save(os.path.join(directory, f"scale_{i}.npy"), self.scales[i])
+        with open(os.path.join(directory, "engine.json"), 'w') as f:
+            json.dump({
+                "n_layers": len(self.coefs),
+                "feature_names": self.feature_names,
+                "hidden_activation": self.hidden_activation,
+                "out_activation": self.out_activation,
+                "precision": self.precision,
+            }, f)
+        return directory
+
+    @classmethod
+    def load_arrays(cls, directory: str, mmap_mode: Optional[str] = "r", **kwargs) -> "NumpyMLPEngine":
+        """Load weights written by save_arrays, memory-mapped by default"""
+        with open(os.path.join(directory, "engine.json"), 'r') as f:
+            header = json.load(f)
+        n_layers = header["n_layers"]
+        precision = header.get("precision", "float64")
+        scales = None
+        if precision == "int8" and os.path.exists(os.path.join(directory, "scale_0.npy")):
+            scales = [np.load(os.path.join(directory, f"scale_{i}.npy"), mmap_mode=mmap_mode) for i in range(n_layers)]
+        return cls(
+            coefs=[np.load(os.path.join(directory, f"coef_{i}.npy"), mmap_mode=mmap_mode) for i in range(n_layers)],
+            intercepts=[np.load(os.path.join(directory, f"intercept_{i}.npy"), mmap_mode=mmap_mode) for i in range(n_layers)],
+            feature_names=header["feature_names"],
+            hidden_activation=header["hidden_activation"],
+            out_activation=header["out_activation"],
+            precision=precision,
+            scales=scales,
+            **kwargs
+        )
+
+    def with_precision(self, precision: str) -> "NumpyMLPEngine":
+        """Copy of this engine running at another precision (convert from float64 for best results)"""
+        return NumpyMLPEngine(self.float_coefs(), self.intercepts, self.feature_names,
+                              self.hidden_activation, self.out_activation, self.block_rows, precision)
+
+    def float_coefs(self) -> List[np.ndarray]:
+        """The weights as floats (codes times scales when quantized)"""
+        if self.scales is None:
+            return list(self.coefs)
+        return [q * scale for q, scale in zip(self.coefs, self.scales)]
+
+    def weight_bytes(self) -> int:
+        """Resident size of the weights (int8 codes plus scales when quantized)"""
+        coef_bytes = sum(w.nbytes for w in self.coefs)
+        if self.scales is not None:
+            coef_bytes += sum(scale.nbytes for scale in self.scales)
+        return coef_bytes + sum(b.nbytes for b in self.intercepts)
+
+    def _buffers(self) -> List[np.ndarray]:
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = [np.empty((self.block_rows, w.shape[1]), dtype=self.dtype) for w in self.coefs]
+            if self.scales is not None:
+                # One layer's dequantized weights at a time
+                buffers.append(np.empty(max(w.size for w in self.coefs), dtype=np.float32))
+            self._local.buffers = buffers
+        return buffers
+
+    def predict_proba(self, features_array: np.ndarray) -> np.ndarray:
+        features_array = np.asarray(features_array, dtype=self.dtype)
+        if features_array.ndim == 1:
+            features_array = features_array.reshape(1, -1)
+
+        n_rows = len(features_array)
+        output = np.empty((n_rows, self.n_classes))
+        buffers = self._buffers()
+        for start in range(0, n_rows, self.block_rows):
+            stop = min(start + self.block_rows, n_rows)
+            self._forward(features_array[start:stop], buffers, output[start:stop])
+        return output
+
+    def _forward(self, block: np.ndarray, buffers: List[np.ndarray], output: np.ndarray):
+        n_rows = len(block)
+        activation = block
+        last = len(self.coefs) - 1
+
+        for i, (weights, bias) in enumerate(zip(self.coefs, self.intercepts)):
+            if self.scales is not None:
+                codes, weights = weights, buffers[-1][:weights.size].reshape(weights.shape)
+                np.multiply(codes, self.scales[i], out=weights)
+            layer = buffers[i][:n_rows]
+            np.matmul(activation, weights, out=layer)
+            layer += bias
+            if i < last:
+                _HIDDEN_ACTIVATIONS[self.hidden_activation](layer)
+            activation = layer
+
+        if self.out_activation == "logistic":
+            positive = activation[:, 0]
+            _logistic(positive)
+            output[:, 1] = positive
+            np.subtract(1.0, positive, out=output[:, 0])
+        else:
+            np.subtract(activation, activation.max(axis=1, keepdims=True), out=output)
+            np.exp(output, out=output)
+            output /= output.sum(axis=1, keepdims=True)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "engine": self.name,
+            "model_type": "MLPClassifier",
+            "hidden_layer_sizes": [w.shape[1] for w in self.coefs[:-1]],
+            "precision": self.precision,
+            "weight_bytes": self.weight_bytes(),
+        }
+
+def _relu(x: np.ndarray):
+    np.maximum(x, 0.0, out=x)
+
+def _tanh(x: np.ndarray):
+    np.tanh(x, out=x)
+
+def _logistic(x: np.ndarray):
+    with np.errstate(over="ignore"):
+        np.negative(x, out=x)
+        np.exp(x, out=x)
+        x += 1.0
+        np.reciprocal(x, out=x)
+
+def _identity(x: np.ndarray):
+    pass
+
+_HIDDEN_ACTIVATIONS = {
+    "relu": _relu,
+    "tanh": _tanh,
+    "logistic": _logistic,
+    "identity": _identity,
+}
+
+def quantize_int8(weights: np.ndarray, axis: int = 0):
+    """
+    Symmetric int8 quantization with one scale per slice along axis
+
+    Args:
+        weights: Float weight matrix
+        axis: Axis the max is taken over (0 = one scale per column,
+            1 = one scale per row)
+
+    Returns:
+        Tuple of (int8 codes, float32 scales broadcastable to weights)
+    """
+    max_abs = np.max(np.abs(weights), axis=axis, keepdims=True)
+    # Slices too small for a float32 scale (e.g. dead units) quantize to zero
+    usable = max_abs > np.finfo(np.float32).tiny * 127.0
+    scales = np.where(usable, max_abs / 127.0, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(weights / scales), -127, 127).astype(np.int8)
+    return codes, scales
+
+def export_numpy_weights(model, scaler, feature_names: List[str], path: str = WEIGHTS_PATH) -> str:
+    """
+    Fold a StandardScaler into an MLPClassifier and save the weights as .npz
+
+    (x - mean) / scale @ W + b  ==  x @ (W / scale[:, None]) + (b - (mean / scale) @ W)
+
+    Args:
+        model: Trained MLPClassifier
+        scaler: Fitted StandardScaler used during training
+        feature_names: List of feature names in correct order
+        path: Output .npz file
+
+    Returns:
+        The path that was written
+    """
+    mean = np.zeros(len(feature_names)) if scaler.mean_ is None else scaler.mean_
+    scale = np.ones(len(feature_names)) if scaler.scale_ is None else scaler.scale_
+
+    coefs = [np.asarray(w, dtype=np.float64) for w in model.coefs_]
+    intercepts = [np.asarray(b, dtype=np.float64) for b in model.intercepts_]
+    first_layer = coefs[0]
+    intercepts[0] = intercepts[0] - (mean / scale) @ first_layer
+    coefs[0] = first_layer / scale[:, None]
+
+    arrays = {
+        "n_layers": np.array(len(coefs)),
+        "feature_names": np.array(feature_names),
+        "hidden_activation": np.array(model.activation),
+        "out_activation": np.array(model.out_activation_),
+        "classes": np.asarray(model.classes_),
+    }
+    for i, (weights, bias) in enumerate(zip(coefs, intercepts)):
+        arrays[f"coef_{i}"] = weights
+        arrays[f"intercept_{i}"] = bias
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    np.savez(path, **arrays)
+    return path
+
+class ParityError(Exception):
+    """The NumPy engine's probabilities differ from sklearn's beyond the tolerance"""
+
+def check_parity(engine: NumpyMLPEngine, model, scaler, features_array: np.ndarray, atol: float = 1e-9) -> float:
+    """
+    Compare the engine against sklearn's predict_proba on the same rows
+
+    Returns:
+        The largest absolute probability difference
+
+    Raises:
+        ParityError: If the difference exceeds atol
+    """
+    expected = predict_probabilities(model, scaler, features_array)
+    actual = engine.predict_proba(features_array)
+    max_diff = float(np.max(np.abs(expected - actual))) if len(features_array) else 0.0
+    if not max_diff <= atol:  # also fails on NaN
+        raise ParityError(f"NumPy engine ({engine.precision}) differs from sklearn by {max_diff:.3g} "
+                          f"(tolerance {atol:.3g})")
+    return max_diff
+
+def create_engine(kind: str, model=None, scaler=None, feature_names: Optional[List[str]] = None,
+                  weights_path: str = WEIGHTS_PATH, precision: str = "float64"):
+    """
+    Build the inference engine selected by name
+
+    Args:
+        kind: "sklearn" (needs model, scaler and feature_names) or "numpy"
+        weights_path: Weights file used by the numpy engine
+        precision: "float64", "float32" or "int8" (numpy engine only)
+    """
+    if kind == "sklearn":
+        if model is None or scaler is None or feature_names is None:
+            raise ValueError("The sklearn engine needs the model, scaler and feature names")
+        if precision != "float64":
+            raise ValueError(f"Precision '{precision}' requires the numpy engine")
+        return SklearnEngine(model, scaler, feature_names)
+    if kind == "numpy":
+        return NumpyMLPEngine.load(weights_path, precision=precision)
+    raise ValueError(f"Unknown engine '{kind}', expected one of {ENGINE_CHOICES}")
+
+if __name__ == "__main__":
+    # Re-export the weights from the current pickled artifacts:
+    #   cd backend && python -m app.engine
+    from .utils import load_model_artifacts
+
+    model, scaler, feature_names = load_model_artifacts()
+    path = export_numpy_weights(model, scaler, feature_names)
+    print(f"✅ Exported folded weights to {path}")
+
+    # Parity check on rows drawn around the training distribution
+    rng = np.random.default_rng(42)
+    sample = scaler.mean_ + scaler.scale_ * rng.standard_normal((5000, len(feature_names)))
+    max_diff = check_parity(NumpyMLPEngine.load(path), model, scaler, sample)
+    print(f"✅ Parity with sklearn predict_proba: max abs diff {max_diff:.2e}")
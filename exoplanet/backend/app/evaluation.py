@@ -0,0 +1,170 @@
+# backend/app/evaluation.py
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .dataset import DISPOSITION_COLUMN, POSITIVE_DISPOSITIONS, load_kepler
+from .validation import get_validator
+
+# --- VECTORIZED MODEL EVALUATION ---
+# Used by `run_predictions.py --evaluate`. A labeled set is validated and
+# scored in a single forward pass, and every metric is computed with
+# array operations over the whole set rather than per sample. Inputs can
+# be any of the shapes the prediction scripts read:
+#   {"test_samples": [{"name", "features": {...}, "expected_prediction"}]}
+#   {"predictions": [{"run_id", "koi_period": ..., ...}]}
+#   a single flat {"koi_period": ..., ...} object
+#   a catalog CSV with koi_disposition (e.g. data/kepler.csv)
+# Rows without a label are scored but left out of the metrics.
+
+CALIBRATION_BINS = 10
+UNLABELED = -1
+
+@dataclass
+class EvaluationSet:
+    ids: List[str]
+    features: np.ndarray  # (n_rows, n_features), NaN rows are invalid
+    valid: np.ndarray     # (n_rows,) bool
+    labels: np.ndarray    # (n_rows,) int8, 1/0, or UNLABELED
+    row_errors: Dict[int, List[str]]
+    input_shape: str
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+def _label(row: Dict[str, Any]) -> int:
+    if row.get('expected_prediction') is not None:
+        return int(row['expected_prediction'])
+    if row.get(DISPOSITION_COLUMN):
+        return int(row[DISPOSITION_COLUMN] in POSITIVE_DISPOSITIONS)
+    return UNLABELED
+
+def from_document(document: Any, feature_names: List[str]) -> EvaluationSet:
+    """
+    Normalise any of the JSON input shapes into one validated matrix
+
+    Raises:
+        ValueError: If the document is none of the known shapes
+    """
+    if isinstance(document, dict) and 'test_samples' in document:
+        samples = document['test_samples']
+        ids = [str(sample.get('name', i)) for i, sample in enumerate(samples, 1)]
+        rows = [sample.get('features', {}) for sample in samples]
+        labels = [_label(sample) for sample in samples]
+        shape = 'test_samples'
+    elif isinstance(document, (dict, list)):
+        if isinstance(document, list):
+            samples, shape = document, 'rows'
+        elif 'predictions' in document:
+            samples, shape = document['predictions'], 'predictions'
+        elif any(name in document for name in feature_names):
+            samples, shape = [document], 'single'
+        else:
+            raise ValueError("Expected 'test_samples', 'predictions', a list of rows or a single feature object")
+        ids = [str(sample.get('run_id', f"sample_{i}")) for i, sample in enumerate(samples, 1)]
+        rows = samples
+        labels = [_label(sample) for sample in samples]
+    else:
+        raise ValueError("Expected a JSON object or list")
+
+    matrix, valid, row_errors = get_validator(feature_names).from_dicts(rows)
+    return EvaluationSet(ids=ids, features=matrix, valid=valid, labels=np.asarray(labels, dtype=np.int8),
+                         row_errors=row_errors, input_shape=shape)
+
+def from_catalog(path: str, feature_names: List[str]) -> EvaluationSet:
+    """Every KOI in an archive CSV, labeled by its disposition"""
+    dataset = load_kepler(path, feature_names)
+    return EvaluationSet(ids=dataset.kepoi_name.tolist(), features=dataset.features,
+                         valid=np.ones(len(dataset), dtype=bool), labels=dataset.target,
+                         row_errors={}, input_shape='catalog')
+
+# --- METRICS ---
+
+def confusion_matrix(labels: np.ndarray, predictions: np.ndarray) -> List[List[int]]:
+    """[[true negatives, false positives], [false negatives, true positives]]"""
+    counts = np.bincount(labels.astype(np.int64) * 2 + predictions, minlength=4)
+    return counts.reshape(2, 2).tolist()
+
+def roc_auc(scores: np.ndarray, labels: np.ndarray) -> Optional[float]:
+    """Area under the ROC curve from average ranks (Mann-Whitney U); None with only one class"""
+    positives = int(labels.sum())
+    negatives = len(labels) - positives
+    if positives == 0 or negatives == 0:
+        return None
+    _, inverse, counts = np.unique(scores, return_inverse=True, return_counts=True)
+    average_rank = np.cumsum(counts) - (counts - 1) / 2.0
+    ranks = average_rank[inverse]
+    return float((ranks[labels == 1].sum() - positives * (positives + 1) / 2.0) / (positives * negatives))
+
+def calibration_bins(probabilities: np.ndarray, labels: np.ndarray, bins: int = CALIBRATION_BINS) -> List[Dict[str, Any]]:
+    """Mean predicted probability against the observed positive rate, per probability bin"""
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    bin_index = np.clip(np.digitize(probabilities, edges[1:-1]), 0, bins - 1)
+    counts = np.bincount(bin_index, minlength=bins)
+    predicted = np.bincount(bin_index, weights=probabilities, minlength=bins)
+    observed = np.bincount(bin_index, weights=labels, minlength=bins)
+    return [{
+        "lower": float(edges[i]),
+        "upper": float(edges[i + 1]),
+        "count": int(counts[i]),
+        "mean_predicted": float(predicted[i] / counts[i]) if counts[i] else None,
+        "observed_rate": float(observed[i] / counts[i]) if counts[i] else None,
+    } for i in range(bins)]
+
+def expected_calibration_error(probabilities: np.ndarray, labels: np.ndarray, bins: int = CALIBRATION_BINS) -> float:
+    """Weighted gap between mean predicted probability and observed rate per bin"""
+    table = [b for b in calibration_bins(probabilities, labels, bins) if b["count"]]
+    total = sum(b["count"] for b in table)
+    return float(sum(abs(b["mean_predicted"] - b["observed_rate"]) * b["count"] for b in table) / total)
+
+def classification_metrics(probabilities: np.ndarray, labels: np.ndarray, bins: int = CALIBRATION_BINS) -> Dict[str, Any]:
+    """
+    Accuracy, confusion matrix, precision/recall/F1, ROC-AUC, Brier score and calibration
+
+    Args:
+        probabilities: (n_rows, 2) class probabilities
+        labels: (n_rows,) 0/1 labels
+        bins: Number of equal-width calibration bins
+    """
+    predictions = probabilities.argmax(axis=1)
+    scores = probabilities[:, 1]
+    (tn, fp), (fn, tp) = confusion_matrix(labels, predictions)
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        "rows": int(len(labels)),
+        "accuracy": float(np.mean(predictions == labels)),
+        "confusion_matrix": [[tn, fp], [fn, tp]],
+        "precision": float(precision),
+        "recall": float(recall),
+        "f1": float(2 * precision * recall / (precision + recall)) if precision + recall else 0.0,
+        "roc_auc": roc_auc(scores, labels),
+        "brier_score": float(np.mean((scores - labels) ** 2)),
+        "expected_calibration_error": expected_calibration_error(scores, labels, bins),
+        "calibration": calibration_bins(scores, labels, bins),
+    }
+
+def latency_by_class(engine, features: np.ndarray, groups: np.ndarray, repeats: int = 3) -> Dict[str, Any]:
+    """
+    Forward-pass time for all rows and for each class's rows as one batch
+
+    Each timing is the best of `repeats` passes, reported in total
+    milliseconds and microseconds per row.
+    """
+    def timed(rows):
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            engine.predict_proba(rows)
+            best = min(best, time.perf_counter() - start)
+        return {"rows": int(len(rows)), "ms": best * 1000, "us_per_row": best * 1e6 / max(len(rows), 1)}
+
+    latency = {"all": timed(features)}
+    for value, name in ((1, "exoplanet"), (0, "not_exoplanet")):
+        rows = features[groups == value]
+        if len(rows):
+            latency[name] = timed(rows)
+    return latency
@@ -0,0 +1,158 @@
+# backend/app/incremental.py
+
+import copy
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .dataset import KeplerDataset
+
+# --- INCREMENTAL TRAINING ---
+# train_model.py saves a snapshot of the rows it trained on: each KOI's
+# name, a hash of its feature values and label, and whether it was in the
+# held-out split. `train_model.py --incremental` diffs the current catalog
+# against the snapshot of the served version, then continues training
+# that version's model on the new and changed rows (plus a replay sample
+# of old ones) instead of starting over. Held-out rows stay held out
+# across updates, so the old and updated models are compared on the same
+# rows before anything is promoted.
+
+SNAPSHOT_NAME = 'training_snapshot.npz'
+TEST_FRACTION = 0.25
+
+def row_hashes(dataset: KeplerDataset) -> np.ndarray:
+    """uint64 hash of each row's feature values and label"""
+    import pandas as pd
+
+    frame = pd.DataFrame(dataset.features, columns=dataset.feature_names)
+    frame['is_exoplanet'] = dataset.target
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+def holdout_mask(kepoi_name: np.ndarray, test_fraction: float = TEST_FRACTION) -> np.ndarray:
+    """Deterministic held-out assignment for rows the snapshot has never seen"""
+    import pandas as pd
+
+    buckets = pd.util.hash_pandas_object(pd.Series(kepoi_name), index=False).to_numpy() % 10000
+    return buckets < int(test_fraction * 10000)
+
+def save_snapshot(path: str, dataset: KeplerDataset, is_test: np.ndarray):
+    """Record which rows (and which values) a model was trained and evaluated on"""
+    np.savez(path, kepoi_name=dataset.kepoi_name, row_hash=row_hashes(dataset),
+             is_test=np.asarray(is_test, dtype=bool), source_hash=dataset.source_hash)
+
+@dataclass
+class CatalogDiff:
+    is_test: np.ndarray   # (n_rows,) held-out split for every current row
+    is_new: np.ndarray    # (n_rows,) name not in the snapshot
+    is_changed: np.ndarray  # (n_rows,) name in the snapshot with different values
+    removed: int = 0      # snapshot rows no longer in the catalog
+
+    @property
+    def updated(self) -> np.ndarray:
+        return self.is_new | self.is_changed
+
+    def summary(self) -> Dict[str, int]:
+        return {"new_rows": int(self.is_new.sum()), "changed_rows": int(self.is_changed.sum()),
+                "removed_rows": self.removed}
+
+def diff_snapshot(snapshot_path: str, dataset: KeplerDataset) -> CatalogDiff:
+    """
+    Compare the current catalog with a training snapshot
+
+    Rows keep the split they had in the snapshot; new rows are assigned
+    by a hash of their name so reruns agree.
+
+    Raises:
+        FileNotFoundError: If the snapshot does not exist
+    """
+    with np.load(snapshot_path) as snapshot:
+        known = dict(zip(snapshot['kepoi_name'].tolist(), zip(snapshot['row_hash'].tolist(),
+                                                                snapshot['is_test'].tolist())))
+
+    hashes = row_hashes(dataset).tolist()
+    names = dataset.kepoi_name.tolist()
+    is_new = np.array([name not in known for name in names], dtype=bool)
+    is_changed = np.array([name in known and known[name][0] != row_hash
+                           for name, row_hash in zip(names, hashes)], dtype=bool)
+    is_test = holdout_mask(dataset.kepoi_name)
+    is_test[~is_new] = [known[name][1] for name in np.asarray(names, dtype=object)[~is_new]]
+    removed = len(set(known) - set(names))
+    return CatalogDiff(is_test=is_test, is_new=is_new, is_changed=is_changed, removed=removed)
+
+@dataclass
+class UpdateResult:
+    model: Any
+    scaler: Any
+    accuracy: float
+    baseline_accuracy: float
+    log_loss: float
+    baseline_log_loss: float
+    train_rows: int
+    fit_rows: int
+
+    def regressions(self, tolerance: float = 0.0, log_loss_tolerance: float = 0.0) -> List[str]:
+        """Held-out metrics that got worse than allowed (empty if the update may be promoted)"""
+        problems = []
+        if self.accuracy < self.baseline_accuracy - tolerance:
+            problems.append(f"accuracy dropped by more than {tolerance}")
+        if self.log_loss > self.baseline_log_loss + log_loss_tolerance:
+            problems.append(f"log loss rose by more than {log_loss_tolerance}")
+        return problems
+
+    def regressed(self, tolerance: float = 0.0, log_loss_tolerance: float = 0.0) -> bool:
+        return bool(self.regressions(tolerance, log_loss_tolerance))
+
+def continue_training(model, scaler, dataset: KeplerDataset, diff: CatalogDiff, epochs: int = 20,
+                      replay_ratio: float = 4.0, random_state: Optional[int] = 42) -> UpdateResult:
+    """
+    Update a trained scaler and MLP with the new and changed training rows
+
+    The scaler is refitted on the current training rows, i.e. the snapshot
+    minus removed rows, with changed rows at their new values (running
+    partial_fit would count changed rows twice and keep removed ones).
+    That is one cheap pass over the features. The MLP continues from its
+    current weights with one partial_fit pass per epoch. Each epoch mixes the updated rows with a replay sample of
+    unchanged training rows (replay_ratio per updated row), so the model
+    does not forget the rest of the catalog. The originals are not modified.
+
+    Returns:
+        UpdateResult with the updated model and scaler, and held-out metrics
+        for both the updated and the original model
+    """
+    import pandas as pd
+    from sklearn.metrics import accuracy_score, log_loss
+
+    rng = np.random.default_rng(random_state)
+    # The scaler was fitted on a DataFrame; keep the column names
+    X = pd.DataFrame(dataset.features, columns=dataset.feature_names)
+    y = dataset.target
+    train = np.flatnonzero(~diff.is_test)
+    train_updated = np.flatnonzero(diff.updated & ~diff.is_test)
+    train_unchanged = np.flatnonzero(~diff.updated & ~diff.is_test)
+    test = np.flatnonzero(diff.is_test)
+
+    new_scaler = copy.deepcopy(scaler)
+    new_model = copy.deepcopy(model)
+    new_scaler.fit(X.iloc[train])
+    replay_size = 0
+    if len(train_updated):
+        replay_size = min(len(train_unchanged), int(round(replay_ratio * len(train_updated))))
+        for _ in range(epochs):
+            replay = rng.choice(train_unchanged, size=replay_size, replace=False)
+            rows = rng.permutation(np.concatenate([train_updated, replay]))
+            new_model.partial_fit(new_scaler.transform(X.iloc[rows]), y[rows])
+
+    def evaluate(candidate, candidate_scaler):
+        probabilities = candidate.predict_proba(candidate_scaler.transform(X.iloc[test]))
+        return (accuracy_score(y[test], probabilities.argmax(axis=1)),
+                log_loss(y[test], probabilities, labels=[0, 1]))
+
+    accuracy, loss = evaluate(new_model, new_scaler)
+    baseline_accuracy, baseline_loss = evaluate(model, scaler)
+    return UpdateResult(
+        model=new_model, scaler=new_scaler,
+        accuracy=accuracy, baseline_accuracy=baseline_accuracy,
+        log_loss=loss, baseline_log_loss=baseline_loss,
+        train_rows=len(train), fit_rows=len(train_updated) + replay_size,
+    )
@@ -1,6 +1,10 @@
 # Main FastAPI application entry point
-from fastapi import FastAPI
+import uuid
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from . import metrics
+from . import predict
 from .predict import router as predict_router
 
 app = FastAPI(title="Exoplanet Detection API", version="1.0.0")
@@ -14,6 +18,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request counters, latency histograms and in-flight gauge for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
+class RequestIdMiddleware:
+    """Echo the caller's X-Request-ID (or a new one) so gateways can match responses to requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value[:128]
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex.encode()
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id)]
+            await send(message)
+
+        await self.app(scope, receive, send_with_id)
+
+app.add_middleware(RequestIdMiddleware)
+
 # Include prediction routes
 app.include_router(predict_router, prefix="", tags=["predictions"])
 
@@ -23,4 +58,17 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    current = predict.artifacts
+    return {
+        "status": "healthy",
+        "model_loaded": current is not None,
+        "model_version": current.version_label if current is not None else None,
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Metrics in the Prometheus text exposition format"""
+    body = metrics.render_latest()
+    if body is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
\ No newline at end of file
@@ -0,0 +1,224 @@
+# backend/app/metrics.py
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import config
+
+# --- PROMETHEUS-STYLE METRICS ---
+# A small dependency-free registry rendered in the text exposition
+# format at /metrics. With EXOPLANET_METRICS=0 every timer and counter
+# call returns immediately, so the hot path pays (almost) nothing.
+
+ENABLED = config.METRICS_ENABLED
+
+STAGE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001,
+                 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+REQUEST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        if not ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str):
+        if not ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets: Sequence[float] = REQUEST_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        if not ENABLED:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, float]]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], List[Tuple[str, str, str, float]]]):
+        """Add a callback returning (name, kind, help, value) samples computed at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            described = set()
+            for name, kind, help_text, value in collector():
+                # A name may carry labels (name{label="value"}); describe each family once
+                family = name.split("{", 1)[0]
+                if family not in described:
+                    lines.extend([f"# HELP {family} {help_text}", f"# TYPE {family} {kind}"])
+                    described.add(family)
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "exoplanet_stage_seconds", "Time spent in each stage of the prediction pipeline",
+    ("stage",), buckets=STAGE_BUCKETS))
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "exoplanet_http_requests_total", "HTTP requests by route and status code",
+    ("method", "path", "status")))
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "exoplanet_http_request_seconds", "HTTP request latency by route", ("path",)))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    "exoplanet_http_requests_in_flight", "HTTP requests currently being served"))
+MODEL_LOAD_SECONDS = REGISTRY.register(Gauge(
+    "exoplanet_model_load_seconds", "Duration of the last model artifact load", ("engine",)))
+
+class _StageTimer:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        STAGE_SECONDS.observe(time.perf_counter() - self.start, self.stage)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def stage(name: str):
+    """Context manager timing one pipeline stage into exoplanet_stage_seconds"""
+    return _StageTimer(name) if ENABLED else _NULL_TIMER
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware counting requests by outcome and timing them.
+
+    Requests are labelled with the matched route template (e.g.
+    /predict/batch) rather than the raw URL to keep label cardinality low.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not ENABLED or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", "<unmatched>")
+            HTTP_REQUESTS.inc(scope["method"], path, str(status["code"]))
+            HTTP_REQUEST_SECONDS.observe(elapsed, path)
+
+def render_latest() -> Optional[str]:
+    """Text exposition of every metric, or None when metrics are disabled"""
+    if not ENABLED:
+        return None
+    return REGISTRY.render()
@@ -1,25 +1,31 @@
 # backend/app/model.py
 
-import joblib
 from pathlib import Path
 
-# --- LOAD THE MODEL AND SCALER ---
+from .artifacts import load_artifacts
+
+# --- ACCESS THE MODEL AND SCALER ---
 
 # Build the path to the models directory
 # This makes the path independent of where you run the script from
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 MODEL_DIR = BASE_DIR / "models"
 
-try:
-    # Load the trained model, scaler, and feature list
-    model = joblib.load(MODEL_DIR / "exoplanet_model.pkl")
-    scaler = joblib.load(MODEL_DIR / "exoplanet_scaler.pkl")
-    model_features = joblib.load(MODEL_DIR / "model_features.pkl")
-    print("✅ Model, scaler, and feature list loaded successfully!")
+_ATTRIBUTES = {
+    "model": "model",
+    "scaler": "scaler",
+    "model_features": "feature_names",
+}
 
-except FileNotFoundError as e:
-    print(f"❌ Error loading model files: {e}")
-    print(f"Ensure model files exist in the '{MODEL_DIR}' directory.")
-    model = None
-    scaler = None
-    model_features = None
\ No newline at end of file
+def __getattr__(name):
+    # model, scaler and model_features are loaded on first access through
+    # the shared loader instead of being unpickled at import time
+    if name not in _ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        artifacts = load_artifacts("sklearn")
+    except FileNotFoundError as e:
+        print(f"❌ Error loading model files: {e}")
+        print(f"Ensure model files exist in the '{MODEL_DIR}' directory.")
+        return None
+    return getattr(artifacts, _ATTRIBUTES[name])
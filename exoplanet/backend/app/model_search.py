@@ -0,0 +1,204 @@
+# backend/app/model_search.py
+
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# --- HYPERPARAMETER SEARCH ---
+# Used by `train_model.py --search`. Each candidate is cross-validated
+# with stratified k-fold in its own joblib worker (all cores by default).
+# Every estimator uses early stopping, and candidates that have not
+# started when the time budget runs out are skipped. Inference latency
+# is measured afterwards in the parent, one candidate at a time, so
+# concurrent fits do not distort it.
+
+SEARCH_SPACE = {
+    "mlp": {
+        "hidden_layer_sizes": [(32,), (64, 32), (100, 50), (128, 64, 32)],
+        "alpha": [1e-4, 1e-3, 1e-2],
+        "learning_rate_init": [1e-3, 3e-3],
+    },
+    "hgb": {
+        "learning_rate": [0.05, 0.1, 0.2],
+        "max_leaf_nodes": [15, 31, 63],
+        "max_iter": [200, 500],
+        "l2_regularization": [0.0, 1.0],
+    },
+}
+
+LATENCY_ROWS = 1000
+
+def make_estimator(family: str, params: Dict[str, Any], random_state: int = 42):
+    """Build an unfitted estimator for one candidate"""
+    if family == "mlp":
+        from sklearn.neural_network import MLPClassifier
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+
+        # Scaling is critical for MLP models, so it is fitted per fold
+        return make_pipeline(StandardScaler(), MLPClassifier(
+            max_iter=500,
+            activation='relu',
+            solver='adam',
+            early_stopping=True,
+            validation_fraction=0.1,
+            n_iter_no_change=10,
+            random_state=random_state,
+            **params,
+        ))
+    if family == "hgb":
+        from sklearn.ensemble import HistGradientBoostingClassifier
+
+        return HistGradientBoostingClassifier(
+            early_stopping=True,
+            validation_fraction=0.1,
+            n_iter_no_change=10,
+            random_state=random_state,
+            **params,
+        )
+    raise ValueError(f"Unknown model family: {family}")
+
+def generate_candidates(mode: str = "random", n_iter: int = 20, families: Optional[List[str]] = None,
+                        random_state: int = 42) -> List[Dict[str, Any]]:
+    """
+    List the (family, params) candidates to evaluate
+
+    Args:
+        mode: "grid" for every combination, "random" for n_iter samples per family
+        n_iter: Samples per family in random mode
+        families: Subset of SEARCH_SPACE keys (default: all)
+        random_state: Seed for random sampling
+
+    Returns:
+        List of {"family": ..., "params": {...}} dictionaries
+    """
+    from sklearn.model_selection import ParameterGrid, ParameterSampler
+
+    candidates = []
+    for family in families or list(SEARCH_SPACE):
+        space = SEARCH_SPACE[family]
+        if mode == "grid":
+            params_list = list(ParameterGrid(space))
+        elif mode == "random":
+            n_total = len(ParameterGrid(space))
+            params_list = list(ParameterSampler(space, n_iter=min(n_iter, n_total), random_state=random_state))
+        else:
+            raise ValueError(f"Unknown search mode: {mode}")
+        candidates.extend({"family": family, "params": params} for params in params_list)
+    return candidates
+
+def _evaluate(candidate: Dict[str, Any], X: np.ndarray, y: np.ndarray, folds: int,
+              random_state: int, deadline: float) -> Optional[Dict[str, Any]]:
+    """Cross-validate one candidate (runs in a joblib worker)"""
+    if time.time() > deadline:
+        return None
+
+    from sklearn.model_selection import StratifiedKFold, cross_validate
+    from threadpoolctl import threadpool_limits
+
+    # One core per candidate; the parallelism comes from running candidates side by side
+    with threadpool_limits(limits=1):
+        estimator = make_estimator(candidate["family"], candidate["params"], random_state)
+        cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=random_state)
+        scores = cross_validate(estimator, X, y, cv=cv, scoring="accuracy", return_estimator=True, n_jobs=1)
+
+    return {
+        **candidate,
+        "accuracy_mean": float(np.mean(scores["test_score"])),
+        "accuracy_std": float(np.std(scores["test_score"])),
+        "fit_seconds": float(np.mean(scores["fit_time"])),
+        "estimator": scores["estimator"][0],
+    }
+
+def measure_latency(estimator, X: np.ndarray, repeats: int = 20) -> float:
+    """Median predict_proba time in milliseconds per LATENCY_ROWS rows"""
+    from threadpoolctl import threadpool_limits
+
+    rows = X[:LATENCY_ROWS]
+    if len(rows) < LATENCY_ROWS:
+        rows = np.resize(rows, (LATENCY_ROWS, X.shape[1]))
+    with threadpool_limits(limits=1):
+        estimator.predict_proba(rows)  # warm-up
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            estimator.predict_proba(rows)
+            timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+def pareto_front(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Candidates no other candidate beats on both accuracy and latency"""
+    front = []
+    for result in results:
+        dominated = any(
+            other["accuracy_mean"] >= result["accuracy_mean"]
+            and other["latency_ms_per_1k"] <= result["latency_ms_per_1k"]
+            and (other["accuracy_mean"] > result["accuracy_mean"]
+                 or other["latency_ms_per_1k"] < result["latency_ms_per_1k"])
+            for other in results
+        )
+        if not dominated:
+            front.append(result)
+    return sorted(front, key=lambda r: r["latency_ms_per_1k"])
+
+def run_search(X: np.ndarray, y: np.ndarray, mode: str = "random", n_iter: int = 20, folds: int = 5,
+               time_budget: float = 600.0, n_jobs: int = -1, families: Optional[List[str]] = None,
+               random_state: int = 42, verbose: int = 0) -> Dict[str, Any]:
+    """
+    Evaluate the search space and report accuracy, fit time and latency per candidate
+
+    Args:
+        X: Feature matrix (unscaled)
+        y: Binary target
+        mode: "grid" or "random"
+        n_iter: Samples per family in random mode
+        folds: Stratified k-fold splits
+        time_budget: Seconds after which no new candidate is started
+        n_jobs: joblib workers (-1 = all cores)
+        families: Model families to include (default: all)
+        random_state: Seed for sampling, folds and the estimators
+        verbose: joblib verbosity
+
+    Returns:
+        Dictionary with "results" (sorted by accuracy), "pareto_front",
+        "skipped" and the search settings
+    """
+    from joblib import Parallel, delayed
+
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    candidates = generate_candidates(mode, n_iter, families, random_state)
+    start = time.time()
+    deadline = start + time_budget
+
+    evaluated = Parallel(n_jobs=n_jobs, verbose=verbose)(
+        delayed(_evaluate)(candidate, X, y, folds, random_state, deadline)
+        for candidate in candidates
+    )
+
+    results = []
+    for result in evaluated:
+        if result is None:
+            continue
+        result["latency_ms_per_1k"] = measure_latency(result.pop("estimator"), X)
+        result["params"] = {key: list(value) if isinstance(value, tuple) else value
+                            for key, value in result["params"].items()}
+        results.append(result)
+    results.sort(key=lambda r: r["accuracy_mean"], reverse=True)
+
+    front = pareto_front(results)
+    for result in results:
+        result["pareto"] = result in front
+
+    return {
+        "mode": mode,
+        "folds": folds,
+        "time_budget_seconds": time_budget,
+        "elapsed_seconds": round(time.time() - start, 3),
+        "candidates": len(candidates),
+        "evaluated": len(results),
+        "skipped": len(candidates) - len(results),
+        "results": results,
+        "pareto_front": front,
+    }
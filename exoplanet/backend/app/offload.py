@@ -0,0 +1,160 @@
+# backend/app/offload.py
+
+import asyncio
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from .artifacts import ModelArtifacts, load_artifacts
+from .parallel import limit_blas_threads
+from .registry import FLAT_VERSION
+
+# --- INFERENCE OFFLOADING ---
+# Handlers are async, so anything CPU-bound run directly on the event loop
+# (a forward pass, unpickling a model) stalls every other connection,
+# /health included. Inference runs in a thread pool (sklearn and NumPy
+# release the GIL inside BLAS) or, optionally, a process pool; model
+# loading always runs in threads because the loaded model is needed in
+# this process. Admission is bounded: once max_pending requests are
+# waiting for inference, new ones are refused instead of queueing
+# without limit, and the API answers 503 with Retry-After.
+
+EXECUTOR_CHOICES = ("thread", "process")
+
+class ExecutorSaturated(Exception):
+    """Raised when max_pending requests are already waiting for inference"""
+
+    def __init__(self, pending: int, retry_after: float):
+        super().__init__(f"{pending} requests already waiting for inference")
+        self.pending = pending
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        # Retry-After takes whole seconds
+        return str(max(1, math.ceil(self.retry_after)))
+
+def _init_process_worker():
+    limit_blas_threads()
+
+def _predict_in_worker(features: np.ndarray, engine_name: str, mmap_mode: Optional[str], variant: str,
+                       precision: str, version: Optional[str], artifact_hash: str) -> np.ndarray:
+    """
+    Score rows with the worker's own copy of the model the parent is serving
+
+    version is the parent's registry version, or FLAT_VERSION when it serves
+    the flat models/ directory (None would follow ACTIVE instead, which can
+    name a different model than the parent loaded).
+    """
+    current = load_artifacts(engine_name, mmap_mode=mmap_mode, variant=variant,
+                             precision=precision, version=version)
+    if current.artifact_hash != artifact_hash:
+        # The flat models/ directory changed in place since this worker loaded it
+        current = load_artifacts(engine_name, mmap_mode=mmap_mode, variant=variant,
+                                 precision=precision, version=version, reload=True)
+    return current.engine.predict_proba(features)
+
+class InferenceExecutor:
+    """
+    Run inference and model loading off the event loop, with admission control.
+
+    In "thread" mode a single thread pool runs both. In "process" mode
+    inference goes to worker processes, which load (and on a version
+    change reload) the served model through the per-process artifact
+    cache, while model loading stays in a small thread pool.
+    """
+
+    def __init__(self, mode: str = "thread", workers: int = 4, max_pending: int = 64,
+                 retry_after: float = 1.0, mmap_mode: Optional[str] = None):
+        if mode not in EXECUTOR_CHOICES:
+            raise ValueError(f"Unknown executor '{mode}', expected one of {EXECUTOR_CHOICES}")
+        if workers < 1 or max_pending < 1:
+            raise ValueError("workers and max_pending must be at least 1")
+        self.mode = mode
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.mmap_mode = mmap_mode
+
+        self._inference: Optional[Executor] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+
+        self.pending = 0
+        self.admitted_count = 0
+        self.rejected_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self._threads is not None
+
+    def start(self):
+        """Create the pools (idempotent)"""
+        if self.running:
+            return
+        self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="exoplanet-offload")
+        if self.mode == "process":
+            self._inference = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_process_worker)
+        else:
+            self._inference = self._threads
+
+    def shutdown(self):
+        """Stop the pools, dropping work that has not started"""
+        if self._inference is not None and self._inference is not self._threads:
+            self._inference.shutdown(wait=False, cancel_futures=True)
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+        self._inference = self._threads = None
+
+    @contextmanager
+    def admit(self):
+        """
+        Hold one of max_pending inference slots for the duration of the block
+
+        Raises:
+            ExecutorSaturated: If every slot is taken
+        """
+        if self.pending >= self.max_pending:
+            self.rejected_count += 1
+            raise ExecutorSaturated(self.pending, self.retry_after)
+        self.pending += 1
+        self.admitted_count += 1
+        try:
+            yield
+        finally:
+            self.pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run a blocking call (e.g. model loading) in the thread pool"""
+        executor = self._threads if self.running else None
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    async def predict(self, artifacts: ModelArtifacts, features: np.ndarray) -> np.ndarray:
+        """predict_proba of the given model, off the event loop"""
+        loop = asyncio.get_running_loop()
+        if self.mode == "process" and self.running:
+            return await loop.run_in_executor(
+                self._inference, _predict_in_worker, features, artifacts.engine_name, self.mmap_mode,
+                artifacts.variant, artifacts.precision, artifacts.version or FLAT_VERSION,
+                artifacts.artifact_hash,
+            )
+        return await loop.run_in_executor(self._inference, artifacts.engine.predict_proba, features)
+
+    async def warm(self, artifacts: ModelArtifacts):
+        """Have every worker process load the model before it takes traffic"""
+        if self.mode != "process" or not self.running:
+            return
+        row = np.ones((1, len(artifacts.feature_names)))
+        await asyncio.gather(*(self.predict(artifacts, row) for _ in range(self.workers * 2)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "admitted": self.admitted_count,
+            "rejected": self.rejected_count,
+        }
@@ -0,0 +1,96 @@
+# backend/app/parallel.py
+
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .artifacts import load_artifacts
+from .engine import NumpyMLPEngine
+from .streaming import FeatureChunk, chunk_results, score_chunk
+
+# --- MULTI-CORE OFFLINE SCORING ---
+# Chunks are scored across a process pool. Every worker loads the model
+# once in its initializer: the NumPy engine from .npy files that all
+# workers memory-map (one shared copy of the weights), the sklearn engine
+# through joblib with mmap_mode="r". Only the feature rows and the
+# resulting probabilities travel between processes, and results are
+# yielded back in input order.
+
+_worker_engine = None
+
+def limit_blas_threads():
+    """One BLAS thread per process; the pool provides the parallelism"""
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+def _init_worker(engine_name: str, shared_weights_dir: Optional[str], variant: str = "full",
+                 precision: str = "float64", version: Optional[str] = None):
+    global _worker_engine
+
+    limit_blas_threads()
+
+    if shared_weights_dir is not None:
+        _worker_engine = NumpyMLPEngine.load_arrays(shared_weights_dir, mmap_mode="r")
+    else:
+        _worker_engine = load_artifacts(engine_name, mmap_mode="r", variant=variant, precision=precision,
+                                        version=version).engine
+
+def _score_rows(features: np.ndarray) -> np.ndarray:
+    if not len(features):
+        return np.empty((0, 2))
+    return _worker_engine.predict_proba(features)
+
+def iter_scored_chunks(chunks: Iterable[FeatureChunk], engine_name: str = "sklearn",
+                       workers: int = 1, max_pending: Optional[int] = None, variant: str = "full",
+                       precision: str = "float64", version: Optional[str] = None
+                       ) -> Iterator[Tuple[FeatureChunk, List[Dict[str, Any]]]]:
+    """
+    Score chunks in input order, optionally across a process pool
+
+    Args:
+        chunks: FeatureChunk iterator, e.g. from streaming.iter_feature_chunks
+        engine_name: "sklearn" or "numpy"
+        workers: Number of worker processes (1 scores in this process)
+        max_pending: Chunks in flight at once (default 2 per worker), which
+            bounds memory while keeping every worker busy
+        variant: "full" or "distilled"
+        precision: "float64", or "float32"/"int8" for the numpy engine
+        version: Registry version; pass the one already loaded so that
+            activating another version mid-run cannot mix models
+
+    Yields:
+        Tuples of (chunk, per-row results) in the order the chunks were read
+    """
+    if workers <= 1:
+        engine = load_artifacts(engine_name, variant=variant, precision=precision, version=version).engine
+        for chunk in chunks:
+            yield chunk, score_chunk(engine, chunk)
+        return
+
+    max_pending = max_pending or workers * 2
+    with tempfile.TemporaryDirectory(prefix="exoplanet-weights-") as shared_dir:
+        if engine_name == "numpy":
+            # Workers map the engine's arrays as they are (float32 weights, or
+            # int8 codes and scales), so no worker converts or copies them
+            load_artifacts("numpy", variant=variant, precision=precision,
+                           version=version).engine.save_arrays(shared_dir)
+            initargs = (engine_name, shared_dir, variant, precision, version)
+        else:
+            initargs = (engine_name, None, variant, precision, version)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk, pool.submit(_score_rows, chunk.features[chunk.valid])))
+                if len(pending) >= max_pending:
+                    done_chunk, future = pending.popleft()
+                    yield done_chunk, chunk_results(done_chunk, future.result())
+            while pending:
+                done_chunk, future = pending.popleft()
+                yield done_chunk, chunk_results(done_chunk, future.result())
@@ -1,19 +1,91 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any
+import asyncio
+from contextlib import contextmanager
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ConfigDict, ValidationError
+from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
 from datetime import datetime
 
-from .utils import load_model_artifacts, validate_features, prepare_features_for_prediction
+from .utils import build_prediction_results
+from .validation import FeatureValidator, get_validator
+from .artifacts import ModelArtifacts, load_artifacts
+from . import registry
+from . import catalog
+from . import explain
+from . import drift
+from .audit import AuditLog
+from . import wire
+from .batching import MicroBatcher
+from .offload import ExecutorSaturated, InferenceExecutor
+from .cache import PredictionCache
+from .coalesce import SingleFlight
+from . import metrics
+from . import config
 
 router = APIRouter()
 
-# Global variables to store loaded model artifacts
+# Global variables to store loaded model artifacts. `artifacts` is the
+# unit that gets swapped on reload: handlers take one reference to it per
+# request, so a request never mixes two model versions.
 model = None
 scaler = None
 feature_names = None
+engine = None
+artifacts = None
+validator = None
+
+# Inference and model loading run here, never on the event loop
+offloader = InferenceExecutor(
+    config.INFERENCE_EXECUTOR,
+    workers=config.EXECUTOR_WORKERS,
+    max_pending=config.MAX_PENDING_REQUESTS,
+    retry_after=config.RETRY_AFTER_SECONDS,
+    mmap_mode=config.ARTIFACT_MMAP_MODE,
+)
+
+async def _predict_with_model(features_array: np.ndarray, current: ModelArtifacts) -> np.ndarray:
+    return await offloader.predict(current, features_array)
+
+# Optional dynamic batching of concurrent /predict calls. Each request
+# submits the model it captured, so a swap between submit and flush
+# cannot score it with (or cache it under) a different model
+batcher = MicroBatcher(
+    _predict_with_model,
+    max_batch_size=config.MICRO_BATCH_MAX_SIZE,
+    max_wait_ms=config.MICRO_BATCH_MAX_WAIT_MS,
+)
+
+# Results keyed by rounded features + artifact hash
+cache = PredictionCache(
+    max_size=config.CACHE_MAX_SIZE,
+    ttl_seconds=config.CACHE_TTL_SECONDS,
+    decimals=config.CACHE_DECIMALS,
+)
+
+# Explanations keyed like the prediction cache
+explain_cache = PredictionCache(
+    max_size=config.EXPLAIN_CACHE_SIZE,
+    ttl_seconds=config.CACHE_TTL_SECONDS,
+    decimals=config.CACHE_DECIMALS,
+)
+
+# Running statistics of live inputs against the training distribution
+drift_monitor = drift.DriftMonitor(enabled=config.DRIFT_ENABLED, min_samples=config.DRIFT_MIN_SAMPLES)
+
+# Concurrent identical /predict calls share one computation
+single_flight = SingleFlight(enabled=config.COALESCE_ENABLED)
+
+# Every /predict and /predict/batch prediction is queued for the audit
+# log; formatting and disk writes happen on its own thread. record() is
+# called on the event loop, so a full queue drops rows rather than block
+audit_log = AuditLog.from_config(source="api", policy="drop")
 
 class PredictionRequest(BaseModel):
+    # Strict, like FeatureValidator on /predict/batch rows: numbers only,
+    # no true -> 1.0 or "5" -> 5.0 coercion
+    model_config = ConfigDict(strict=True)
+
     koi_period: float
     koi_duration: float
     koi_depth: float
@@ -28,86 +100,636 @@ class PredictionResponse(BaseModel):
     confidence: float
     exoplanet_probability: float
     not_exoplanet_probability: float
+    warnings: List[str] = []
+    model_version: str
+    timestamp: str
+
+class BatchPredictionRequest(BaseModel):
+    # Exactly one of the two forms must be given:
+    #   rows:    [{"koi_period": ..., ...}, ...]
+    #   columns: {"koi_period": [...], "koi_duration": [...], ...}
+    rows: Optional[List[Any]] = None
+    columns: Optional[Dict[str, List[Any]]] = None
+
+class BatchPredictionItem(BaseModel):
+    index: int
+    prediction: Optional[int] = None
+    prediction_label: Optional[str] = None
+    confidence: Optional[float] = None
+    exoplanet_probability: Optional[float] = None
+    not_exoplanet_probability: Optional[float] = None
+    errors: List[str] = []
+    warnings: List[str] = []
+
+class BatchPredictionResponse(BaseModel):
+    results: List[BatchPredictionItem]
+    total: int
+    succeeded: int
+    failed: int
+    model_version: str
     timestamp: str
 
-def load_model():
+class ReloadRequest(BaseModel):
+    # Registry version to switch to; omitted = the active (or pinned) version
+    version: Optional[str] = None
+
+MAX_BATCH_ROWS = 50000
+
+def _prepare_model(version: Optional[str] = None, reload: bool = False) -> ModelArtifacts:
+    """Load a model version and pre-warm it, without serving it yet"""
+    # Shared per-process loader; the NumPy engine carries its own
+    # (scaler-folded) weights and leaves model/scaler unset
+    candidate = load_artifacts(config.INFERENCE_ENGINE, mmap_mode=config.ARTIFACT_MMAP_MODE,
+                               variant=config.MODEL_VARIANT, precision=config.INFERENCE_PRECISION,
+                               version=version or config.MODEL_VERSION, reload=reload)
+
+    # First calls allocate engine buffers and touch every weight page;
+    # do that before the model takes traffic
+    means = (candidate.manifest or {}).get("feature_means")
+    row = np.asarray(means, dtype=np.float64) if means else np.ones(len(candidate.feature_names))
+    candidate.engine.predict_proba(np.tile(row, (config.MICRO_BATCH_MAX_SIZE, 1)))
+    candidate.engine.predict_proba(row.reshape(1, -1))
+    get_validator(candidate.feature_names)
+    if drift_monitor.enabled:
+        try:
+            drift.load_reference(candidate)
+        except Exception as e:
+            print(f"Warning: no drift reference for this model: {e}")
+    return candidate
+
+def _serve(candidate: ModelArtifacts):
+    """Make a prepared model the one new requests use"""
+    global model, scaler, feature_names, engine, artifacts, validator
+    previous = artifacts
+    model, scaler = candidate.model, candidate.scaler
+    feature_names, engine = candidate.feature_names, candidate.engine
+    validator = get_validator(feature_names)
+    artifacts = candidate
+    metrics.MODEL_LOAD_SECONDS.set(candidate.load_seconds, candidate.engine_name)
+    if previous is not None and previous.artifact_hash != candidate.artifact_hash:
+        # Cached results belong to the previous model
+        cache.clear()
+        explain_cache.clear()
+    if previous is None or previous.artifact_hash != candidate.artifact_hash:
+        # Live statistics are compared with the new model's training data
+        drift_monitor.use_reference(drift.cached_reference(candidate))
+
+def load_model(version: Optional[str] = None):
     """Load model artifacts on startup"""
-    global model, scaler, feature_names
     try:
-        model, scaler, feature_names = load_model_artifacts()
+        _serve(_prepare_model(version))
         return True
     except Exception as e:
         print(f"Failed to load model: {e}")
         return False
 
+# Serializes model loads: on-demand, /model/reload and the registry watcher
+_reload_lock = asyncio.Lock()
+_watch_task: Optional[asyncio.Task] = None
+
+async def ensure_model_loaded() -> ModelArtifacts:
+    """Return the served model, loading it on demand if startup loading did not succeed"""
+    current = artifacts
+    if current is None:
+        async with _reload_lock:
+            if artifacts is None and not await offloader.run(load_model):
+                raise HTTPException(status_code=500, detail="Model not loaded")
+        current = artifacts
+    return current
+
+@contextmanager
+def _inference_slot():
+    """Admission control for inference; 503 + Retry-After when saturated"""
+    try:
+        with offloader.admit():
+            yield
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {e}",
+                            headers={"Retry-After": e.retry_after_header})
+
+async def _swap_to(version: Optional[str], reload: bool = False) -> ModelArtifacts:
+    """Load off the event loop, then swap; requests keep being served meanwhile"""
+    async with _reload_lock:
+        candidate = await offloader.run(_prepare_model, version, reload)
+        await offloader.warm(candidate)
+        _serve(candidate)
+        return candidate
+
+async def _watch_registry():
+    """Follow the registry's ACTIVE version (set by train_model.py or app.registry)"""
+    failed_version = None
+    while True:
+        await asyncio.sleep(config.MODEL_WATCH_SECONDS)
+        target = registry.active_version()
+        current = artifacts
+        if target is None or target == failed_version or (current is not None and current.version == target):
+            continue
+        try:
+            await _swap_to(target)
+            print(f"Switched to model version {target}")
+        except Exception as e:
+            failed_version = target
+            print(f"Failed to load model version {target}: {e}")
+
+def _collect_runtime_metrics():
+    """Cache, drift, coalescing, audit log and micro-batching counters, read at scrape time"""
+    cache_stats = cache.stats()
+    samples = [
+        ("exoplanet_cache_hits_total", "counter", "Prediction cache hits", cache_stats["hits"]),
+        ("exoplanet_cache_misses_total", "counter", "Prediction cache misses", cache_stats["misses"]),
+        ("exoplanet_cache_evictions_total", "counter", "Prediction cache LRU evictions", cache_stats["evictions"]),
+        ("exoplanet_cache_entries", "gauge", "Prediction cache entries", cache_stats["size"]),
+        ("exoplanet_model_loaded", "gauge", "Whether a model is loaded", 1 if engine is not None else 0),
+        ("exoplanet_inference_pending", "gauge", "Requests holding an inference slot", offloader.pending),
+        ("exoplanet_inference_rejected_total", "counter", "Requests refused with 503 (executor saturated)",
+         offloader.rejected_count),
+    ]
+    drift_report = drift_monitor.report() if drift_monitor.enabled else {"samples": 0, "features": {}}
+    samples.append(("exoplanet_drift_samples", "gauge", "Input rows observed by the drift monitor",
+                    drift_report["samples"]))
+    for name, scores in drift_report["features"].items():
+        if "psi" in scores:
+            samples.append((f'exoplanet_drift_psi{{feature="{name}"}}', "gauge",
+                            "Population stability index of live inputs against the training data", scores["psi"]))
+    flight_stats = single_flight.stats()
+    samples += [
+        ("exoplanet_coalesced_requests_total", "counter",
+         "Requests answered by an identical in-flight computation", flight_stats["coalesced"]),
+        ("exoplanet_coalesce_computations_total", "counter",
+         "Computations started by single-flight /predict requests", flight_stats["computations"]),
+    ]
+    audit_stats = audit_log.stats()
+    samples += [
+        ("exoplanet_audit_records_total", "counter", "Predictions queued for the audit log", audit_stats["recorded"]),
+        ("exoplanet_audit_written_total", "counter", "Predictions written to audit log segments",
+         audit_stats["written"]),
+        ("exoplanet_audit_dropped_total", "counter", "Predictions dropped because the audit queue was full",
+         audit_stats["dropped"]),
+        ("exoplanet_audit_pending_rows", "gauge", "Predictions waiting for the audit log writer",
+         audit_stats["pending_rows"]),
+    ]
+    if batcher.batch_count:
+        samples += [
+            ("exoplanet_micro_batches_total", "counter", "Micro-batches executed", batcher.batch_count),
+            ("exoplanet_micro_batch_rows_total", "counter", "Rows scored through micro-batches", batcher.row_count),
+        ]
+    return samples
+
+metrics.REGISTRY.register_collector(_collect_runtime_metrics)
+
 @router.on_event("startup")
 async def startup_event():
     """Load model when the API starts"""
-    success = load_model()
-    if not success:
+    offloader.start()
+    async with _reload_lock:
+        success = artifacts is not None or await offloader.run(load_model)
+    if success:
+        await offloader.warm(artifacts)
+    else:
         print("Warning: Model failed to load on startup")
+    if config.MICRO_BATCHING_ENABLED:
+        batcher.start()
+    audit_log.start()
+    global _watch_task
+    if config.MODEL_WATCH_SECONDS > 0 and config.MODEL_VERSION is None and _watch_task is None:
+        _watch_task = asyncio.get_running_loop().create_task(_watch_registry())
+
+@router.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers"""
+    global _watch_task
+    await batcher.stop()
+    offloader.shutdown()
+    audit_log.close()
+    if _watch_task is not None:
+        _watch_task.cancel()
+        try:
+            await _watch_task
+        except asyncio.CancelledError:
+            pass
+        _watch_task = None
+
+def _negotiate(http_request: Request) -> Tuple[str, str]:
+    """(request format, response format) from Content-Type and Accept"""
+    try:
+        request_format = wire.request_format(http_request.headers.get("content-type"))
+        return request_format, wire.response_format(http_request.headers.get("accept"), request_format)
+    except wire.UnsupportedFormat as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+def _parse_model(model_class, document: Any, as_json: bool = False):
+    """Validate a request document like FastAPI does for JSON bodies (422 on failure)"""
+    try:
+        if as_json:
+            return model_class.model_validate_json(document)
+        return model_class.model_validate(document)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+def _decode_single(request_format: str, body: bytes, checker: FeatureValidator) -> np.ndarray:
+    """(1, n_features) matrix from a /predict body in any supported format"""
+    if request_format == wire.JSON:
+        return checker.from_object(_parse_model(PredictionRequest, body, as_json=True))
+    if request_format == wire.MSGPACK:
+        return checker.from_object(_parse_model(PredictionRequest, wire.decode_msgpack(body)))
+    if request_format == wire.MATRIX:
+        matrix = wire.decode_matrix(body)
+    else:
+        matrix = wire.decode_arrow(body, checker.feature_names)
+    if matrix.shape != (1, len(checker.feature_names)):
+        raise wire.WireFormatError(f"Expected one row of {len(checker.feature_names)} features, "
+                                   f"got shape {matrix.shape}; use /predict/batch for several rows")
+    return matrix
+
+def _binary_response(content: bytes, response_format: str, model_version: str,
+                     failed_rows: Optional[int] = None) -> Response:
+    headers = {"X-Model-Version": model_version}
+    if failed_rows is not None:
+        headers["X-Failed-Rows"] = str(failed_rows)
+    return Response(content=content, media_type=wire.MEDIA_TYPES[response_format], headers=headers)
 
-@router.post("/predict", response_model=PredictionResponse)
-async def predict_exoplanet(request: PredictionRequest):
+def _body_schema(*models) -> Dict[str, Any]:
+    """OpenAPI request body for handlers that read the raw request"""
+    content = {wire.MEDIA_TYPES[wire.JSON]: {"schema": {"anyOf": [m.model_json_schema() for m in models]}}}
+    for fmt in (wire.MATRIX, wire.ARROW, wire.MSGPACK):
+        content[wire.MEDIA_TYPES[fmt]] = {"schema": {"type": "string", "format": "binary"}}
+    return {"requestBody": {"required": True, "content": content}}
+
+@router.post("/predict", response_model=PredictionResponse, openapi_extra=_body_schema(PredictionRequest))
+async def predict_exoplanet(http_request: Request):
     """
     Predict whether the given parameters indicate an exoplanet
     """
-    global model, scaler, feature_names
+    current = await ensure_model_loaded()
+    checker = get_validator(current.feature_names)
+    request_format, response_format = _negotiate(http_request)
+    body = await http_request.body()
+    
+    with metrics.stage("validate"):
+        # Read the fields straight into a (1, n_features) array in model
+        # order and range-check it with the precompiled validator
+        try:
+            features_array = _decode_single(request_format, body, checker)
+        except wire.WireFormatError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+        except wire.UnsupportedFormat as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        errors, warnings = checker.check(features_array)
+        if errors:
+            raise HTTPException(status_code=400, detail=f"Invalid input: {errors}")
     
-    # Ensure model is loaded
-    if model is None or scaler is None or feature_names is None:
-        success = load_model()
-        if not success:
-            raise HTTPException(status_code=500, detail="Model not loaded")
+    with metrics.stage("drift"):
+        drift_monitor.update(features_array)
     
     try:
-        # Convert request to dictionary
-        features = request.dict()
+        with metrics.stage("cache_lookup"):
+            cache_key = cache.make_key(features_array[0], current.artifact_hash) if cache.enabled else None
+            result = cache.get(cache_key) if cache_key is not None else None
+        
+        if result is None:
+            async def compute():
+                # Scale features and make prediction (the label is derived from
+                # the probabilities, so the model runs a single forward pass)
+                with metrics.stage("inference"), _inference_slot():
+                    if batcher.running:
+                        probabilities = await batcher.submit(features_array, current)
+                    else:
+                        probabilities = await offloader.predict(current, features_array)
+                computed = build_prediction_results(probabilities)[0]
+                if cache_key is not None:
+                    cache.put(cache_key, computed)
+                return computed
+
+            # Requests for the same features and model that arrive while this
+            # one is being scored wait for its result instead of taking a slot
+            result = await single_flight.run(
+                single_flight.make_key(features_array, current.artifact_hash), compute)
+        
+        with metrics.stage("audit"):
+            probabilities = np.array([[result["not_exoplanet_probability"], result["exoplanet_probability"]]])
+            audit_log.record("/predict", current.version_label, current.feature_names, features_array, probabilities)
         
-        # Validate features
-        validation = validate_features(features)
-        if not validation["is_valid"]:
-            raise HTTPException(status_code=400, detail=f"Invalid input: {validation['errors']}")
+        with metrics.stage("response"):
+            # Prepare response
+            response = PredictionResponse(
+                **result,
+                warnings=warnings,
+                model_version=current.version_label,
+                timestamp=datetime.now().isoformat()
+            )
+            if response_format == wire.MSGPACK:
+                return _binary_response(wire.encode_msgpack(response.model_dump()), response_format,
+                                        current.version_label)
+            if response_format != wire.JSON:
+                if response_format == wire.MATRIX:
+                    content = wire.encode_matrix(probabilities)
+                else:
+                    content = wire.encode_arrow(1, np.array([0]), probabilities, {}, {0: warnings},
+                                                current.version_label)
+                return _binary_response(content, response_format, current.version_label)
+        
+        return response
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+@router.post("/predict/batch", response_model=BatchPredictionResponse,
+             openapi_extra=_body_schema(BatchPredictionRequest))
+async def predict_exoplanet_batch(http_request: Request):
+    """
+    Predict many samples at once with a single scaler and model pass.
+    Invalid rows are reported individually and do not fail the batch.
+    """
+    current = await ensure_model_loaded()
+    checker = get_validator(current.feature_names)
+    request_format, response_format = _negotiate(http_request)
+    body = await http_request.body()
+    
+    rows, columns, matrix = None, None, None
+    try:
+        if request_format == wire.JSON:
+            request = _parse_model(BatchPredictionRequest, body, as_json=True)
+            rows, columns = request.rows, request.columns
+        elif request_format == wire.MSGPACK:
+            document = wire.decode_msgpack(body)
+            if not isinstance(document, dict):
+                raise wire.WireFormatError("Body must be a map with 'rows' or 'columns'")
+            rows, columns = document.get("rows"), document.get("columns")
+            if not isinstance(rows, (list, type(None))) or not isinstance(columns, (dict, type(None))):
+                raise wire.WireFormatError("'rows' must be an array and 'columns' a map of arrays")
+        elif request_format == wire.MATRIX:
+            matrix = wire.decode_matrix(body)
+        else:
+            matrix = wire.decode_arrow(body, checker.feature_names)
+    except wire.WireFormatError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+    except wire.UnsupportedFormat as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    if matrix is None and (rows is None) == (columns is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of 'rows' or 'columns'")
+    
+    if matrix is not None:
+        total = len(matrix)
+    elif rows is not None:
+        total = len(rows)
+    else:
+        total = max((len(values) for values in columns.values()), default=0)
+    if total > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {total} rows (max {MAX_BATCH_ROWS})")
+    
+    try:
+        with metrics.stage("batch_prepare"):
+            # Every format goes through the same validator
+            if matrix is not None:
+                features_matrix, valid, row_errors = checker.from_matrix(matrix)
+            elif rows is not None:
+                features_matrix, valid, row_errors = checker.from_dicts(rows)
+            else:
+                features_matrix, valid, row_errors = checker.from_columns(columns)
+            row_warnings = checker.warnings(features_matrix)
+            valid_indices = np.flatnonzero(valid)
+            valid_matrix = features_matrix[valid]
+        with metrics.stage("drift"):
+            drift_monitor.update(valid_matrix)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+    
+    total = len(valid)
+    
+    try:
+        probabilities = np.empty((0, 2))
+        if len(valid_indices):
+            with metrics.stage("batch_inference"), _inference_slot():
+                probabilities = await offloader.predict(current, valid_matrix)
+            with metrics.stage("audit"):
+                # ids are the rows' positions in the request
+                audit_log.record("/predict/batch", current.version_label, current.feature_names,
+                                 valid_matrix, probabilities, ids=valid_indices)
         
-        # Prepare features for prediction
-        features_array = prepare_features_for_prediction(features, feature_names)
+        if response_format == wire.MATRIX:
+            content = wire.encode_matrix(wire.probability_matrix(total, valid_indices, probabilities))
+            return _binary_response(content, response_format, current.version_label, len(row_errors))
+        if response_format == wire.ARROW:
+            content = wire.encode_arrow(total, valid_indices, probabilities, row_errors, row_warnings,
+                                        current.version_label)
+            return _binary_response(content, response_format, current.version_label, len(row_errors))
         
-        # Scale features
-        features_scaled = scaler.transform(features_array)
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        for index, result in zip(valid_indices.tolist(), build_prediction_results(probabilities)):
+            results[index] = {"index": index, **result, "warnings": row_warnings.get(index, [])}
         
-        # Make prediction
-        prediction = model.predict(features_scaled)[0]
-        probabilities = model.predict_proba(features_scaled)[0]
+        for index, errors in row_errors.items():
+            results[index] = {"index": index, "errors": errors}
         
-        # Prepare response
-        response = PredictionResponse(
-            prediction=int(prediction),
-            prediction_label="Exoplanet" if prediction == 1 else "Not Exoplanet",
-            confidence=float(max(probabilities)),
-            exoplanet_probability=float(probabilities[1]),
-            not_exoplanet_probability=float(probabilities[0]),
+        response = BatchPredictionResponse(
+            results=results,
+            total=total,
+            succeeded=len(valid_indices),
+            failed=len(row_errors),
+            model_version=current.version_label,
             timestamp=datetime.now().isoformat()
         )
-        
+        if response_format == wire.MSGPACK:
+            return _binary_response(wire.encode_msgpack(response.model_dump()), response_format,
+                                    current.version_label)
         return response
         
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
+_catalog_lock = asyncio.Lock()
+
+async def _catalog_index(current: ModelArtifacts) -> catalog.CatalogIndex:
+    """The precomputed index for the served model, (re)built on first use if allowed"""
+    index = await offloader.run(catalog.get_index, current)
+    if index is not None:
+        return index
+    if not config.CATALOG_AUTOBUILD:
+        raise HTTPException(status_code=503,
+                            detail=f"No catalog index for model {current.version_label} and the current "
+                                   f"catalog; run python -m app.catalog")
+    async with _catalog_lock:
+        if await offloader.run(catalog.get_index, current) is None:
+            try:
+                await offloader.run(catalog.build_index, current)
+            except FileNotFoundError as e:
+                raise HTTPException(status_code=503, detail=f"Cannot build catalog index: {e}")
+    return await offloader.run(catalog.get_index, current)
+
+async def _explain(current: ModelArtifacts, features_array: np.ndarray) -> Dict[str, Any]:
+    """Cached explanation of one row; every perturbed row is scored in one executor call"""
+    cache_key = explain_cache.make_key(features_array[0], current.artifact_hash) if explain_cache.enabled else None
+    result = explain_cache.get(cache_key) if cache_key is not None else None
+    if result is None:
+        try:
+            # Read from disk (or sampled from the catalog) once per model
+            background = await offloader.run(explain.load_background, current)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=503, detail=f"No background sample for explanations: {e}")
+        matrix = explain.perturbation_matrix(features_array, background)
+        with metrics.stage("inference"), _inference_slot():
+            probabilities = await offloader.predict(current, matrix)
+        result = explain.explain(current.engine, features_array, background, current.feature_names, probabilities)
+        if cache_key is not None:
+            explain_cache.put(cache_key, result)
+    return result
+
+@router.post("/predict/explain", openapi_extra=_body_schema(PredictionRequest))
+async def explain_exoplanet(http_request: Request):
+    """
+    Per-feature attributions for one prediction: how much each feature
+    moved the exoplanet probability compared with typical training rows
+    """
+    current = await ensure_model_loaded()
+    checker = get_validator(current.feature_names)
+    request_format, _ = _negotiate(http_request)
+    try:
+        features_array = _decode_single(request_format, await http_request.body(), checker)
+    except wire.WireFormatError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+    except wire.UnsupportedFormat as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    errors, warnings = checker.check(features_array)
+    if errors:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {errors}")
+
+    result = await _explain(current, features_array)
+    return {**result, "warnings": warnings, "model_version": current.version_label,
+            "timestamp": datetime.now().isoformat()}
+
+@router.get("/predict/koi/{kepoi_name}")
+async def predict_koi(kepoi_name: str):
+    """Stored prediction for a catalog object by KOI name (e.g. K00752.01)"""
+    current = await ensure_model_loaded()
+    index = await _catalog_index(current)
+    result = await offloader.run(index.lookup, kepoi_name)
+    if result is None:
+        raise HTTPException(status_code=404,
+                            detail=f"{kepoi_name} is not in the catalog (or lacks a feature needed to score it)")
+    return {**result, "model_version": current.version_label}
+
+@router.get("/predict/koi/{kepoi_name}/explain")
+async def explain_koi(kepoi_name: str):
+    """Attributions for a catalog object's stored prediction"""
+    current = await ensure_model_loaded()
+    index = await _catalog_index(current)
+    stored = await offloader.run(index.lookup, kepoi_name)
+    if stored is None:
+        raise HTTPException(status_code=404,
+                            detail=f"{kepoi_name} is not in the catalog (or lacks a feature needed to score it)")
+    features_array = np.array([[stored["features"][name] for name in current.feature_names]])
+    result = await _explain(current, features_array)
+    return {**result, "kepoi_name": kepoi_name, "koi_disposition": stored["koi_disposition"],
+            "model_version": current.version_label, "timestamp": datetime.now().isoformat()}
+
+@router.get("/predict/koi")
+async def search_koi(http_request: Request, order_by: str = "exoplanet_probability", descending: bool = True,
+                     limit: int = 100, offset: int = 0):
+    """
+    Catalog objects matching range filters on any stored column, given as
+    <column>_<gt|gte|lt|lte|eq>=value, e.g.
+    /predict/koi?exoplanet_probability_gt=0.9&koi_prad_lt=2
+    """
+    current = await ensure_model_loaded()
+    index = await _catalog_index(current)
+    reserved = {"order_by", "descending", "limit", "offset"}
+    try:
+        filters = index.parse_filters({key: value for key, value in http_request.query_params.items()
+                                       if key not in reserved})
+        total, results = await offloader.run(index.query, filters, order_by, descending, limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "results": results,
+        "total": total,
+        "returned": len(results),
+        "offset": offset,
+        "model_version": current.version_label,
+    }
+
+@router.get("/drift")
+async def get_drift():
+    """
+    How live /predict and /predict/batch inputs compare with the served
+    model's training data, per feature, since the model was loaded or
+    the last reset
+    """
+    current = await ensure_model_loaded()
+    return {**drift_monitor.report(), "model_version": current.version_label}
+
+@router.post("/drift/reset")
+async def reset_drift():
+    """Start a new observation window"""
+    drift_monitor.reset()
+    return {"status": "reset"}
 
 @router.get("/model/info")
 async def get_model_info():
     """Get information about the loaded model"""
-    global model, scaler, feature_names
+    global engine, feature_names
     
-    if model is None:
+    if engine is None:
         raise HTTPException(status_code=500, detail="Model not loaded")
     
     return {
-        "model_type": type(model).__name__,
+        **engine.describe(),
         "features": feature_names,
         "feature_count": len(feature_names),
-        "model_loaded": model is not None,
-        "scaler_loaded": scaler is not None
+        "model_loaded": True,
+        # The NumPy engine has the scaler folded into its first layer
+        "scaler_loaded": scaler is not None or engine.name == "numpy",
+        "artifacts": artifacts.load_info(),
+        "model_version": artifacts.version_label,
+        "manifest": artifacts.manifest,
+        "micro_batching": batcher.stats(),
+        "executor": offloader.stats(),
+        "cache": cache.stats(),
+        "coalescing": single_flight.stats(),
+        "explain_cache": explain_cache.stats(),
+        "audit_log": audit_log.stats(),
+        "drift": {key: value for key, value in drift_monitor.report().items() if key != "features"}
+    }
+
+@router.get("/model/versions")
+async def get_model_versions():
+    """Published registry versions and the one being served"""
+    return {
+        "serving": artifacts.version_label if artifacts is not None else None,
+        "active": registry.active_version(),
+        "pinned": config.MODEL_VERSION,
+        "versions": registry.list_versions(),
+    }
+
+@router.post("/model/reload")
+async def reload_model(request: Optional[ReloadRequest] = None):
+    """
+    Load a model version and swap it in without restarting the worker.
+    The new model is loaded and pre-warmed in a thread while the current
+    one keeps serving; in-flight requests finish on the model they started with.
+    """
+    previous = artifacts
+    version = request.version if request is not None else None
+    # Only names of published versions reach the filesystem (and joblib)
+    if version is not None and not registry.is_published(version):
+        raise HTTPException(status_code=404, detail=f"Model version not found: {version}")
+    try:
+        # reload=True re-reads the flat models/ directory, whose files may
+        # have changed in place; published versions are immutable
+        current = await _swap_to(version, reload=True)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Model version not found: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "previous_version": previous.version_label if previous is not None else None,
+        "version": current.version_label,
+        "artifact_hash": current.artifact_hash,
+        "load_seconds": current.load_seconds,
+        "cache_cleared": previous is not None and previous.artifact_hash != current.artifact_hash,
     }
\ No newline at end of file
@@ -0,0 +1,213 @@
+# backend/app/registry.py
+
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .artifacts import MODEL_DIR, hash_files
+
+# --- VERSIONED MODEL REGISTRY ---
+# Each published model lives in its own directory under models/registry/
+# with a manifest.json (content hash, feature list, training metrics).
+# The ACTIVE file names the version the API and CLI scripts serve by
+# default; it is replaced atomically, and running API workers poll it
+# and hot-swap to the new version without a restart. When no version
+# has been published yet, the flat models/ directory is used as before.
+
+REGISTRY_DIR = os.path.join(MODEL_DIR, 'registry')
+ACTIVE_FILE = os.path.join(REGISTRY_DIR, 'ACTIVE')
+MANIFEST_NAME = 'manifest.json'
+# Names the flat models/ directory explicitly, unlike None (which follows
+# ACTIVE); never a valid version name, so it cannot shadow a published one
+FLAT_VERSION = '@flat'
+
+# Files copied into a version; optional ones (the distilled student, the
+# training snapshot for incremental updates, the explanation background
+# sample, the drift reference statistics) only if present
+REQUIRED_FILES = ['exoplanet_model.pkl', 'exoplanet_scaler.pkl', 'model_features.pkl', 'exoplanet_weights.npz']
+OPTIONAL_FILES = ['exoplanet_student.pkl', 'exoplanet_student_weights.npz', 'distillation_report.json',
+                  'training_snapshot.npz', 'explain_background.npy',
+                  'drift_reference.json']
+# The distilled student is only valid for the teacher it was distilled
+# from; distill_model.py records that teacher's hash in the report
+STUDENT_FILES = ['exoplanet_student.pkl', 'exoplanet_student_weights.npz', 'distillation_report.json']
+TEACHER_FILES = ['exoplanet_model.pkl', 'exoplanet_scaler.pkl', 'model_features.pkl']
+
+def teacher_hash(model_dir: str) -> str:
+    """Hash of the model, scaler and features a student is distilled from"""
+    return hash_files([os.path.join(model_dir, name) for name in TEACHER_FILES])
+
+def student_matches(source_dir: str) -> bool:
+    """Whether the student files in source_dir were distilled from the model next to them"""
+    try:
+        with open(os.path.join(source_dir, 'distillation_report.json'), 'r') as f:
+            recorded = json.load(f).get("teacher_hash")
+    except (FileNotFoundError, ValueError):
+        return False
+    return recorded is not None and recorded == teacher_hash(source_dir)
+
+# Version names are single path components; the leading character rules
+# out ".", ".." and unpublished ".staging-*" directories
+VERSION_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$')
+
+def version_dir(version: str) -> str:
+    """
+    Raises:
+        ValueError: If version is not a valid version name
+    """
+    if not VERSION_PATTERN.match(version):
+        raise ValueError(f"Invalid model version name: {version!r}")
+    return os.path.join(REGISTRY_DIR, version)
+
+def is_published(version: str) -> bool:
+    """Whether version names a published version (checked before touching its files)"""
+    return (bool(VERSION_PATTERN.match(version))
+            and os.path.isfile(os.path.join(REGISTRY_DIR, version, MANIFEST_NAME)))
+
+def read_manifest(version: str) -> Dict[str, Any]:
+    """
+    Manifest of a published version
+
+    Raises:
+        FileNotFoundError: If the version does not exist
+    """
+    with open(os.path.join(version_dir(version), MANIFEST_NAME), 'r') as f:
+        return json.load(f)
+
+def list_versions() -> List[Dict[str, Any]]:
+    """Manifests of every published version, oldest first"""
+    if not os.path.isdir(REGISTRY_DIR):
+        return []
+    manifests = []
+    for name in os.listdir(REGISTRY_DIR):
+        if is_published(name):
+            manifests.append(read_manifest(name))
+    return sorted(manifests, key=lambda m: m["created_at"])
+
+def active_version() -> Optional[str]:
+    """Version named by the ACTIVE file, or None if nothing was published"""
+    try:
+        with open(ACTIVE_FILE, 'r') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def activate(version: str):
+    """
+    Point ACTIVE at a published version (atomic rename)
+
+    Raises:
+        FileNotFoundError: If the version does not exist
+    """
+    if not is_published(version):
+        raise FileNotFoundError(f"No published model version {version!r}")
+    tmp_path = f"{ACTIVE_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(version + "\n")
+    os.replace(tmp_path, ACTIVE_FILE)
+
+def resolve(version: Optional[str] = None) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Directory and manifest to load a model from
+
+    Args:
+        version: Published version, FLAT_VERSION for the flat models/
+            directory, or None for the active one (falling back to the
+            flat directory if nothing is published)
+
+    Returns:
+        Tuple of (model directory, manifest or None)
+
+    Raises:
+        FileNotFoundError: If version is not a published version
+    """
+    version = version or active_version()
+    if version is None or version == FLAT_VERSION:
+        return MODEL_DIR, None
+    if not is_published(version):
+        raise FileNotFoundError(f"No published model version {version!r}")
+    return version_dir(version), read_manifest(version)
+
+def publish(source_dir: str = MODEL_DIR, metrics: Optional[Dict[str, Any]] = None,
+            feature_means: Optional[List[float]] = None, activate_version: bool = True) -> Dict[str, Any]:
+    """
+    Copy the artifacts in source_dir into a new registry version
+
+    Args:
+        source_dir: Directory holding the files written by train_model.py
+        metrics: Training/evaluation metrics stored in the manifest
+        feature_means: Typical feature row, used to pre-warm the model before a swap
+        activate_version: Make the new version the active one
+
+    Returns:
+        The new version's manifest
+    """
+    import joblib
+
+    missing = [name for name in REQUIRED_FILES if not os.path.exists(os.path.join(source_dir, name))]
+    if missing:
+        raise FileNotFoundError(f"Cannot publish, missing artifacts in {source_dir}: {missing}")
+
+    optional = [name for name in OPTIONAL_FILES if os.path.exists(os.path.join(source_dir, name))]
+    if any(name in STUDENT_FILES for name in optional) and not student_matches(source_dir):
+        # Left over from an earlier model; rerun distill_model.py to publish a fresh one
+        print(f"Warning: the distilled student in {source_dir} was not distilled from this model; not published")
+        optional = [name for name in optional if name not in STUDENT_FILES]
+    files = REQUIRED_FILES + optional
+    content_hash = hash_files([os.path.join(source_dir, name) for name in files])
+    created_at = datetime.now()
+    version = f"{created_at:%Y%m%d-%H%M%S}-{content_hash[:8]}"
+
+    manifest = {
+        "version": version,
+        "created_at": created_at.isoformat(),
+        "content_hash": content_hash,
+        "files": {name: hash_files([os.path.join(source_dir, name)]) for name in files},
+        "feature_names": list(joblib.load(os.path.join(source_dir, 'model_features.pkl'))),
+        "feature_means": feature_means,
+        "metrics": metrics or {},
+    }
+
+    # Build the version in a scratch directory and rename it into place,
+    # so a half-copied version is never visible
+    os.makedirs(REGISTRY_DIR, exist_ok=True)
+    staging_dir = os.path.join(REGISTRY_DIR, f".staging-{version}")
+    os.makedirs(staging_dir)
+    for name in files:
+        shutil.copy2(os.path.join(source_dir, name), os.path.join(staging_dir, name))
+    with open(os.path.join(staging_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(staging_dir, version_dir(version))
+
+    if activate_version:
+        activate(version)
+    return manifest
+
+if __name__ == "__main__":
+    # python -m app.registry list | activate <version> | publish  (from the backend directory)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage published model versions")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List published versions")
+    activate_parser = commands.add_parser("activate", help="Serve a published version (running APIs follow)")
+    activate_parser.add_argument("version")
+    commands.add_parser("publish", help="Publish the artifacts in models/ as a new active version")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        current = active_version()
+        for manifest in list_versions():
+            marker = "*" if manifest["version"] == current else " "
+            accuracy = manifest["metrics"].get("accuracy")
+            accuracy_text = f"accuracy {accuracy:.4f}" if accuracy is not None else ""
+            print(f"{marker} {manifest['version']}  {manifest['created_at']}  {accuracy_text}")
+    elif args.command == "activate":
+        activate(args.version)
+        print(f"✅ Active version is now {args.version}")
+    else:
+        manifest = publish()
+        print(f"✅ Published and activated {manifest['version']}")
@@ -0,0 +1,249 @@
+# backend/app/streaming.py
+
+import csv
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .utils import prepare_batch_features, build_prediction_results
+
+# --- CHUNKED READERS AND INCREMENTAL WRITERS FOR OFFLINE SCORING ---
+# Inputs are read chunk_size rows at a time and results are written as
+# soon as a chunk is scored, so memory stays bounded by the chunk size
+# no matter how large the catalog is. pandas (CSV) and pyarrow (Parquet)
+# are imported only when those formats are used.
+
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+
+OUTPUT_FIELDS = [
+    "row", "id", "prediction", "prediction_label", "confidence",
+    "exoplanet_probability", "not_exoplanet_probability", "errors",
+]
+
+class FeatureChunk:
+    """One chunk of input rows as a feature matrix plus per-row errors"""
+
+    def __init__(self, start: int, features: np.ndarray, valid: np.ndarray,
+                 row_errors: Dict[int, List[str]], ids: Optional[List[Any]] = None):
+        self.start = start            # Index of the first row in the whole input
+        self.features = features      # (n_rows, n_features); invalid rows hold NaN
+        self.valid = valid            # Boolean mask of rows that can be scored
+        self.row_errors = row_errors  # Chunk-local row index -> errors
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.features)
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    """Pick the file format from an explicit name or the file extension"""
+    if fmt:
+        return fmt
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot infer format of '{path}', expected one of {sorted(FORMATS)}")
+    return FORMATS[extension]
+
+def count_comment_lines(path: str) -> int:
+    """Count the '#' header lines at the top of a NASA Exoplanet Archive CSV"""
+    with open(path, 'r') as f:
+        first_line = 0
+        for line in f:
+            if not line.startswith('#'):
+                break
+            first_line += 1
+    return first_line
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet support needs pyarrow: pip install pyarrow")
+    return pyarrow
+
+def _columns_to_chunk(start: int, columns: Dict[str, np.ndarray], feature_names: List[str],
+                      ids: Optional[List[Any]]) -> FeatureChunk:
+    features = np.column_stack([columns[name] for name in feature_names]).astype(np.float64, copy=False)
+    finite = np.isfinite(features)
+    valid = finite.all(axis=1)
+    row_errors = {}
+    for i in np.flatnonzero(~valid).tolist():
+        bad = [feature_names[j] for j in np.flatnonzero(~finite[i]).tolist()]
+        row_errors[i] = [f"Missing or non-numeric values: {bad}"]
+    return FeatureChunk(start, features, valid, row_errors, ids)
+
+def _iter_csv(path: str, feature_names: List[str], chunk_size: int, id_column: Optional[str]):
+    import pandas as pd
+
+    usecols = feature_names + ([id_column] if id_column else [])
+    reader = pd.read_csv(path, skiprows=count_comment_lines(path), usecols=usecols, chunksize=chunk_size)
+    start = 0
+    for frame in reader:
+        columns = {name: pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=np.float64)
+                   for name in feature_names}
+        ids = frame[id_column].tolist() if id_column else None
+        yield _columns_to_chunk(start, columns, feature_names, ids)
+        start += len(frame)
+
+def _iter_parquet(path: str, feature_names: List[str], chunk_size: int, id_column: Optional[str]):
+    pa = _require_pyarrow()
+
+    columns_to_read = feature_names + ([id_column] if id_column else [])
+    parquet_file = pa.parquet.ParquetFile(path)
+    missing = [name for name in columns_to_read if name not in parquet_file.schema_arrow.names]
+    if missing:
+        raise ValueError(f"Missing required columns in '{path}': {missing}")
+    start = 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns_to_read):
+        columns = {}
+        for name in feature_names:
+            column = batch.column(batch.schema.get_field_index(name))
+            columns[name] = column.cast(pa.float64()).to_numpy(zero_copy_only=False)
+        ids = batch.column(batch.schema.get_field_index(id_column)).to_pylist() if id_column else None
+        yield _columns_to_chunk(start, columns, feature_names, ids)
+        start += batch.num_rows
+
+def _iter_jsonl(path: str, feature_names: List[str], chunk_size: int, id_column: Optional[str]):
+    def flush(start, rows, json_errors):
+        matrix, valid_indices, row_errors = prepare_batch_features(rows, feature_names)
+        row_errors.update(json_errors)
+        features = np.full((len(rows), len(feature_names)), np.nan)
+        features[valid_indices] = matrix
+        valid = np.zeros(len(rows), dtype=bool)
+        valid[valid_indices] = True
+        ids = [row.get(id_column) if isinstance(row, dict) else None for row in rows] if id_column else None
+        return FeatureChunk(start, features, valid, row_errors, ids)
+
+    start, rows, json_errors = 0, [], {}
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                json_errors[len(rows)] = [f"Invalid JSON: {e}"]
+                rows.append(None)
+            if len(rows) == chunk_size:
+                yield flush(start, rows, json_errors)
+                start, rows, json_errors = start + len(rows), [], {}
+    if rows:
+        yield flush(start, rows, json_errors)
+
+def iter_feature_chunks(path: str, feature_names: List[str], chunk_size: int = 50000,
+                        fmt: Optional[str] = None, id_column: Optional[str] = None) -> Iterator[FeatureChunk]:
+    """
+    Read an input file chunk_size rows at a time
+
+    Args:
+        path: CSV (NASA '#' comment headers are skipped), JSON Lines or Parquet file
+        feature_names: List of feature names in correct order
+        chunk_size: Maximum rows per chunk
+        fmt: Force a format instead of using the file extension
+        id_column: Optional column passed through to the output (e.g. kepoi_name)
+
+    Yields:
+        FeatureChunk objects in input order
+    """
+    readers = {"csv": _iter_csv, "jsonl": _iter_jsonl, "parquet": _iter_parquet}
+    return readers[detect_format(path, fmt)](path, list(feature_names), chunk_size, id_column)
+
+def score_chunk(engine, chunk: FeatureChunk) -> List[Dict[str, Any]]:
+    """
+    Score the valid rows of a chunk in one vectorized engine call
+
+    Returns:
+        One result dictionary per input row, in input order
+    """
+    valid_rows = chunk.features[chunk.valid]
+    probabilities = engine.predict_proba(valid_rows) if len(valid_rows) else np.empty((0, 2))
+    return chunk_results(chunk, probabilities)
+
+def chunk_results(chunk: FeatureChunk, probabilities: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Build per-row result dictionaries for a chunk
+
+    Args:
+        chunk: The scored chunk
+        probabilities: Class probabilities for the chunk's valid rows, in order
+
+    Returns:
+        One result dictionary per input row, in input order
+    """
+    valid_indices = np.flatnonzero(chunk.valid)
+    results: List[Dict[str, Any]] = [None] * len(chunk)
+
+    for i, result in zip(valid_indices.tolist(), build_prediction_results(probabilities)):
+        result["errors"] = []
+        results[i] = result
+    for i, errors in chunk.row_errors.items():
+        results[i] = {"errors": errors}
+
+    for i, result in enumerate(results):
+        result["row"] = chunk.start + i
+        if chunk.ids is not None:
+            result["id"] = chunk.ids[i]
+    return results
+
+class JsonlResultWriter:
+    def __init__(self, path: str):
+        self._file = open(path, 'w')
+
+    def write(self, results: List[Dict[str, Any]]):
+        self._file.write("".join(json.dumps(result) + "\n" for result in results))
+
+    def close(self):
+        self._file.close()
+
+class CsvResultWriter:
+    def __init__(self, path: str):
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, results: List[Dict[str, Any]]):
+        self._writer.writerows(
+            {**result, "errors": "; ".join(result["errors"])} for result in results
+        )
+
+    def close(self):
+        self._file.close()
+
+class ParquetResultWriter:
+    def __init__(self, path: str):
+        self._pa = _require_pyarrow()
+        self._path = path
+        self._writer = None
+
+    def write(self, results: List[Dict[str, Any]]):
+        pa = self._pa
+        table = pa.table({
+            "row": pa.array([r["row"] for r in results], pa.int64()),
+            "id": pa.array([None if r.get("id") is None else str(r["id"]) for r in results], pa.string()),
+            "prediction": pa.array([r.get("prediction") for r in results], pa.int8()),
+            "prediction_label": pa.array([r.get("prediction_label") for r in results], pa.string()),
+            "confidence": pa.array([r.get("confidence") for r in results], pa.float64()),
+            "exoplanet_probability": pa.array([r.get("exoplanet_probability") for r in results], pa.float64()),
+            "not_exoplanet_probability": pa.array([r.get("not_exoplanet_probability") for r in results], pa.float64()),
+            "errors": pa.array(["; ".join(r["errors"]) for r in results], pa.string()),
+        })
+        if self._writer is None:
+            self._writer = pa.parquet.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+def open_result_writer(path: str, fmt: Optional[str] = None):
+    """Open an incremental writer for JSON Lines, CSV or Parquet output"""
+    writers = {"jsonl": JsonlResultWriter, "csv": CsvResultWriter, "parquet": ParquetResultWriter}
+    return writers[detect_format(path, fmt)](path)
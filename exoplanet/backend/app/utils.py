@@ -1,20 +1,14 @@
-import joblib
 import numpy as np
-from typing import Dict, List, Any
-import os
+from typing import Dict, List, Any, Tuple
 
-def load_model_artifacts():
-    """Load the trained model, scaler, and feature names"""
+from .validation import REQUIRED_FEATURES, get_validator
+
+def load_model_artifacts(mmap_mode=None, variant="full"):
+    """Load the trained model ("full" or "distilled"), scaler, and feature names (once per process)"""
+    from .artifacts import load_artifacts
     try:
-        model_path = os.path.join(os.path.dirname(__file__), '../models/exoplanet_model.pkl')
-        scaler_path = os.path.join(os.path.dirname(__file__), '../models/exoplanet_scaler.pkl')
-        features_path = os.path.join(os.path.dirname(__file__), '../models/model_features.pkl')
-        
-        model = joblib.load(model_path)
-        scaler = joblib.load(scaler_path)
-        feature_names = joblib.load(features_path)
-        
-        return model, scaler, feature_names
+        artifacts = load_artifacts("sklearn", mmap_mode=mmap_mode, variant=variant)
+        return artifacts.model, artifacts.scaler, artifacts.feature_names
     except Exception as e:
         raise Exception(f"Error loading model artifacts: {e}")
 
@@ -28,46 +22,18 @@ def validate_features(features: Dict[str, float]) -> Dict[str, Any]:
     Returns:
         Dictionary with validation results
     """
-    required_features = [
-        'koi_period', 'koi_duration', 'koi_depth', 'koi_prad', 
-        'koi_teq', 'koi_insol', 'koi_steff'
-    ]
+    validator = get_validator(REQUIRED_FEATURES)
+    errors = validator.dict_errors(features)
+    warnings = []
+    if not errors:
+        features_array = np.array([[features[name] for name in REQUIRED_FEATURES]], dtype=np.float64)
+        errors, warnings = validator.check(features_array)
     
-    validation_result = {
-        "is_valid": True,
-        "errors": [],
-        "warnings": []
+    return {
+        "is_valid": not errors,
+        "errors": errors,
+        "warnings": warnings
     }
-    
-    # Check for missing features
-    missing_features = [f for f in required_features if f not in features]
-    if missing_features:
-        validation_result["is_valid"] = False
-        validation_result["errors"].append(f"Missing required features: {missing_features}")
-    
-    # Check for valid numeric values
-    for feature_name in required_features:
-        if feature_name in features:
-            value = features[feature_name]
-            if not isinstance(value, (int, float)):
-                validation_result["is_valid"] = False
-                validation_result["errors"].append(f"{feature_name} must be a number")
-            elif value < 0:
-                validation_result["warnings"].append(f"{feature_name} is negative, which may be unusual")
-    
-    # Feature-specific validations
-    if 'koi_period' in features and features['koi_period'] > 10000:
-        validation_result["warnings"].append("Orbital period > 10,000 days is very long")
-    
-    if 'koi_duration' in features and features['koi_duration'] > 100:
-        validation_result["warnings"].append("Transit duration > 100 hours is very long")
-    
-    if 'koi_steff' in features:
-        temp = features['koi_steff']
-        if temp < 2000 or temp > 10000:
-            validation_result["warnings"].append("Stellar temperature outside typical range (2000-10000K)")
-    
-    return validation_result
 
 def prepare_features_for_prediction(features: Dict[str, float], feature_names: List[str]) -> np.ndarray:
     """
@@ -84,4 +50,81 @@ def prepare_features_for_prediction(features: Dict[str, float], feature_names: L
     feature_values = [features[name] for name in feature_names]
     
     # Convert to numpy array and reshape for single prediction
-    return np.array(feature_values).reshape(1, -1)
\ No newline at end of file
+    return np.array(feature_values).reshape(1, -1)
+
+def prepare_batch_features(rows: List[Dict[str, Any]], feature_names: List[str]) -> Tuple[np.ndarray, np.ndarray, Dict[int, List[str]]]:
+    """
+    Validate a list of feature dictionaries and stack the valid ones into a matrix
+    
+    Args:
+        rows: List of feature dictionaries, one per sample
+        feature_names: List of feature names in correct order
+        
+    Returns:
+        Tuple of (feature matrix of the valid rows, indices of the valid rows,
+        mapping of invalid row index to its validation errors)
+    """
+    matrix, valid, row_errors = get_validator(feature_names).from_dicts(rows)
+    return matrix[valid], np.flatnonzero(valid), row_errors
+
+def prepare_columnar_features(columns: Dict[str, List[Any]], feature_names: List[str]) -> Tuple[np.ndarray, np.ndarray, Dict[int, List[str]]]:
+    """
+    Validate columnar feature data and stack it into a matrix
+    
+    Args:
+        columns: Dictionary mapping each feature name to a list of values
+        feature_names: List of feature names in correct order
+        
+    Returns:
+        Same tuple as prepare_batch_features
+        
+    Raises:
+        ValueError: If a feature column is missing or the columns differ in length
+    """
+    matrix, valid, row_errors = get_validator(feature_names).from_columns(columns)
+    return matrix[valid], np.flatnonzero(valid), row_errors
+
+def predict_probabilities(model, scaler, features_array: np.ndarray) -> np.ndarray:
+    """
+    Run the scaler and model over a feature matrix in one vectorized pass
+    
+    Args:
+        model: Trained classifier exposing predict_proba
+        scaler: Fitted scaler used during training
+        features_array: Matrix of shape (n_samples, n_features)
+        
+    Returns:
+        Matrix of class probabilities of shape (n_samples, 2)
+    """
+    features_scaled = scaler.transform(features_array)
+    return model.predict_proba(features_scaled)
+
+def build_prediction_results(probabilities: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Turn a probability matrix into prediction dictionaries
+    
+    The predicted class is taken from the probabilities, which matches
+    model.predict without paying for a second forward pass.
+    
+    Args:
+        probabilities: Matrix of class probabilities of shape (n_samples, 2)
+        
+    Returns:
+        List of prediction dictionaries, one per sample
+    """
+    predictions = probabilities.argmax(axis=1)
+    confidences = probabilities.max(axis=1)
+    
+    return [
+        {
+            "prediction": prediction,
+            "prediction_label": "Exoplanet" if prediction == 1 else "Not Exoplanet",
+            "confidence": confidence,
+            "exoplanet_probability": exoplanet_probability,
+            "not_exoplanet_probability": not_exoplanet_probability,
+        }
+        for prediction, confidence, not_exoplanet_probability, exoplanet_probability in zip(
+            predictions.tolist(), confidences.tolist(),
+            probabilities[:, 0].tolist(), probabilities[:, 1].tolist()
+        )
+    ]
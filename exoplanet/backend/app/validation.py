@@ -0,0 +1,234 @@
+# backend/app/validation.py
+
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Features the model is trained on, in the order the model expects them
+REQUIRED_FEATURES = [
+    'koi_period', 'koi_duration', 'koi_depth', 'koi_prad',
+    'koi_teq', 'koi_insol', 'koi_steff'
+]
+
+# (feature, comparison, threshold, warning). Every feature additionally
+# gets a "< 0" rule; warnings are reported in rule order.
+RANGE_RULES = [
+    ('koi_period', '>', 10000.0, "Orbital period > 10,000 days is very long"),
+    ('koi_duration', '>', 100.0, "Transit duration > 100 hours is very long"),
+    ('koi_steff', '<', 2000.0, "Stellar temperature outside typical range (2000-10000K)"),
+    ('koi_steff', '>', 10000.0, "Stellar temperature outside typical range (2000-10000K)"),
+]
+
+def _is_number(value: Any) -> bool:
+    """JSON numbers only: bool is an int subclass but not a feature value"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class FeatureValidator:
+    """
+    Validation compiled once per feature list.
+
+    Feature extraction uses precomputed attrgetter/itemgetter callables,
+    and the range rules are stored as column/threshold/sign arrays so
+    every warning check is a single vectorized comparison over the
+    feature matrix, whether it holds one row or ten thousand.
+    """
+
+    def __init__(self, feature_names: Sequence[str]):
+        self.feature_names = list(feature_names)
+        self._index = {name: i for i, name in enumerate(self.feature_names)}
+
+        getters = (attrgetter(*self.feature_names), itemgetter(*self.feature_names))
+        if len(self.feature_names) == 1:
+            # A single-name getter returns a scalar rather than a tuple
+            getters = tuple((lambda g: lambda obj: (g(obj),))(g) for g in getters)
+        self._get_attributes, self._get_items = getters
+
+        rules = [(name, '<', 0.0, f"{name} is negative, which may be unusual") for name in self.feature_names]
+        rules += [rule for rule in RANGE_RULES if rule[0] in self._index]
+        self._rule_columns = np.array([self._index[rule[0]] for rule in rules], dtype=np.intp)
+        # "x < t" is stored as "-x > -t" so every rule is one greater-than
+        self._rule_signs = np.array([1.0 if rule[1] == '>' else -1.0 for rule in rules])
+        self._rule_thresholds = np.array([rule[2] for rule in rules], dtype=np.float64) * self._rule_signs
+        self._rule_messages = [rule[3] for rule in rules]
+
+    # --- Feature extraction ---
+
+    def from_object(self, obj: Any) -> np.ndarray:
+        """(1, n_features) matrix from an object with one attribute per feature"""
+        return np.array(self._get_attributes(obj), dtype=np.float64).reshape(1, -1)
+
+    def dict_errors(self, row: Any) -> List[str]:
+        """Structural errors of one feature dictionary (missing keys, non-numbers)"""
+        if not isinstance(row, dict):
+            return ["Row must be an object of feature values"]
+        errors = []
+        missing_features = [name for name in self.feature_names if name not in row]
+        if missing_features:
+            errors.append(f"Missing required features: {missing_features}")
+        for name in self.feature_names:
+            if name in row and not _is_number(row[name]):
+                errors.append(f"{name} must be a number")
+        return errors
+
+    def from_dicts(self, rows: List[Any]) -> Tuple[np.ndarray, np.ndarray, Dict[int, List[str]]]:
+        """
+        Stack feature dictionaries into a matrix
+
+        Returns:
+            Tuple of (matrix with NaN in invalid rows, valid-row mask,
+            mapping of invalid row index to its errors)
+        """
+        n_rows, n_features = len(rows), len(self.feature_names)
+        row_errors: Dict[int, List[str]] = {}
+        try:
+            # Fast path: every row is a complete dict of plain numbers
+            items = [self._get_items(row) for row in rows]
+            matrix = np.array(items)
+            if matrix.dtype.kind not in "iuf" or matrix.shape != (n_rows, n_features):
+                raise TypeError
+            # Booleans are not numbers here, as in from_columns; mixed with
+            # floats they would otherwise be coerced to 0.0/1.0 silently
+            if bool in set(map(type, chain.from_iterable(items))):
+                raise TypeError
+            matrix = matrix.astype(np.float64, copy=False)
+        except (KeyError, TypeError, ValueError, OverflowError):
+            matrix = np.full((n_rows, n_features), np.nan)
+            for i, row in enumerate(rows):
+                errors = self.dict_errors(row)
+                if not errors:
+                    for j, value in enumerate(self._get_items(row)):
+                        try:
+                            matrix[i, j] = float(value)
+                        except (OverflowError, TypeError, ValueError):
+                            # e.g. an integer too large for a float64
+                            errors.append(f"{self.feature_names[j]} must be a finite number")
+                if errors:
+                    row_errors[i] = errors
+                    matrix[i] = np.nan
+
+        valid = np.ones(n_rows, dtype=bool)
+        valid[list(row_errors)] = False
+        self._reject_non_finite(matrix, valid, row_errors)
+        return matrix, valid, row_errors
+
+    def from_columns(self, columns: Dict[str, List[Any]]) -> Tuple[np.ndarray, np.ndarray, Dict[int, List[str]]]:
+        """
+        Stack columnar feature data into a matrix
+
+        Returns:
+            Same tuple as from_dicts
+
+        Raises:
+            ValueError: If a feature column is missing or the columns differ in length
+        """
+        missing_features = [name for name in self.feature_names if name not in columns]
+        if missing_features:
+            raise ValueError(f"Missing required features: {missing_features}")
+
+        lengths = {len(columns[name]) for name in self.feature_names}
+        if len(lengths) != 1:
+            raise ValueError("All feature columns must have the same length")
+
+        n_rows = lengths.pop()
+        matrix = np.empty((n_rows, len(self.feature_names)), dtype=np.float64)
+        valid = np.ones(n_rows, dtype=bool)
+        row_errors: Dict[int, List[str]] = {}
+
+        for j, name in enumerate(self.feature_names):
+            values = columns[name]
+            if isinstance(values, np.ndarray) and values.dtype.kind in "iuf":
+                # Already numeric (decoded from a binary body)
+                matrix[:, j] = values
+                continue
+            try:
+                # Fast path: the whole column converts in one call
+                if any(isinstance(v, (str, bool)) for v in values):
+                    raise TypeError
+                matrix[:, j] = np.asarray(values, dtype=np.float64)
+            except (TypeError, ValueError, OverflowError):
+                for i, value in enumerate(values):
+                    if not _is_number(value):
+                        error = f"{name} must be a number"
+                    else:
+                        try:
+                            matrix[i, j] = float(value)
+                            continue
+                        except OverflowError:
+                            error = f"{name} must be a finite number"
+                    matrix[i, j] = np.nan
+                    valid[i] = False
+                    row_errors.setdefault(i, []).append(error)
+
+        self._reject_non_finite(matrix, valid, row_errors)
+        return matrix, valid, row_errors
+
+    def from_matrix(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Dict[int, List[str]]]:
+        """
+        Check a numeric matrix whose columns are already in model order
+
+        The matrix is used as-is (float32 input is not copied to float64).
+
+        Returns:
+            Same tuple as from_dicts
+
+        Raises:
+            ValueError: If the matrix is not 2-D with one column per feature
+        """
+        if matrix.ndim != 2 or matrix.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected a matrix with {len(self.feature_names)} columns "
+                             f"({', '.join(self.feature_names)}), got shape {matrix.shape}")
+        if matrix.dtype.kind != "f":
+            matrix = matrix.astype(np.float64)
+        valid = np.ones(len(matrix), dtype=bool)
+        row_errors: Dict[int, List[str]] = {}
+        self._reject_non_finite(matrix, valid, row_errors)
+        return matrix, valid, row_errors
+
+    def _reject_non_finite(self, matrix: np.ndarray, valid: np.ndarray, row_errors: Dict[int, List[str]]):
+        """Mark rows that still hold NaN/inf values as invalid"""
+        bad_rows, bad_cols = np.nonzero(~np.isfinite(matrix) & valid[:, None])
+        for i, j in zip(bad_rows.tolist(), bad_cols.tolist()):
+            valid[i] = False
+            row_errors.setdefault(i, []).append(f"{self.feature_names[j]} must be a finite number")
+
+    # --- Range checks ---
+
+    def warnings(self, matrix: np.ndarray) -> Dict[int, List[str]]:
+        """
+        Evaluate every range rule over the matrix at once
+
+        Returns:
+            Mapping of row index to its warnings (rows without warnings are omitted)
+        """
+        if not len(matrix):
+            return {}
+        violations = matrix[:, self._rule_columns] * self._rule_signs > self._rule_thresholds
+        flagged = np.flatnonzero(violations.any(axis=1))
+        return {
+            i: [self._rule_messages[j] for j in np.flatnonzero(violations[i]).tolist()]
+            for i in flagged.tolist()
+        }
+
+    def check(self, matrix: np.ndarray) -> Tuple[List[str], List[str]]:
+        """Errors and warnings for a single-row matrix"""
+        values = matrix[0]
+        finite = np.isfinite(values)
+        if not finite.all():
+            errors = [f"{name} must be a finite number"
+                      for name, ok in zip(self.feature_names, finite.tolist()) if not ok]
+            return errors, []
+        violations = values[self._rule_columns] * self._rule_signs > self._rule_thresholds
+        if not violations.any():
+            return [], []
+        return [], [self._rule_messages[j] for j in np.flatnonzero(violations).tolist()]
+
+@lru_cache(maxsize=8)
+def _cached_validator(feature_names: Tuple[str, ...]) -> FeatureValidator:
+    return FeatureValidator(feature_names)
+
+def get_validator(feature_names: Sequence[str]) -> FeatureValidator:
+    """Shared validator for a feature list (built once, then reused)"""
+    return _cached_validator(tuple(feature_names))
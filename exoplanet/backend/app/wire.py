@@ -0,0 +1,267 @@
+# backend/app/wire.py
+
+import struct
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# --- WIRE FORMATS ---
+# Besides JSON, /predict and /predict/batch speak three compact formats:
+#
+#   application/x-exoplanet-matrix       16-byte header + little-endian,
+#                                        row-major float32/float64 values
+#   application/vnd.apache.arrow.stream  Arrow IPC stream, one column per feature
+#   application/msgpack                  the JSON document, MessagePack-encoded
+#
+# The request format comes from Content-Type and the response format from
+# Accept (defaulting to the request's format). Matrix bodies are viewed
+# in place with np.frombuffer and never parsed float by float. pyarrow and
+# msgpack are imported only when those formats are used; a format whose
+# library is missing is refused during negotiation (415/406), before any
+# scoring happens.
+
+JSON = "json"
+MATRIX = "matrix"
+ARROW = "arrow"
+MSGPACK = "msgpack"
+
+MEDIA_TYPES = {
+    JSON: "application/json",
+    MATRIX: "application/x-exoplanet-matrix",
+    ARROW: "application/vnd.apache.arrow.stream",
+    MSGPACK: "application/msgpack",
+}
+_MEDIA_TYPE_FORMATS = {media_type: fmt for fmt, media_type in MEDIA_TYPES.items()}
+_MEDIA_TYPE_FORMATS.update({"application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK})
+
+# magic, format version, bytes per value (4 or 8), columns, rows, reserved
+MATRIX_MAGIC = b"EXOM"
+MATRIX_VERSION = 1
+MATRIX_HEADER = struct.Struct("<4sBBHII")
+_MATRIX_DTYPES = {4: np.dtype("<f4"), 8: np.dtype("<f8")}
+
+class WireFormatError(ValueError):
+    """The body does not match its declared format"""
+
+class UnsupportedFormat(Exception):
+    """A media type the server cannot read (415) or produce (406)"""
+
+    def __init__(self, message: str, status_code: int = 415):
+        super().__init__(message)
+        self.status_code = status_code
+
+# Formats that need an optional library, and the module to import
+_FORMAT_MODULES = {ARROW: "pyarrow", MSGPACK: "msgpack"}
+
+@lru_cache(maxsize=None)
+def format_available(fmt: str) -> bool:
+    """Whether this process can read and write a format (its library imports)"""
+    module = _FORMAT_MODULES.get(fmt)
+    if module is None:
+        return True
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+def _media_type(value: str) -> str:
+    return value.split(";", 1)[0].strip().lower()
+
+def request_format(content_type: Optional[str]) -> str:
+    """
+    Format of a request body from its Content-Type (JSON when absent)
+
+    Raises:
+        UnsupportedFormat: For any other media type (415)
+    """
+    if not content_type:
+        return JSON
+    media_type = _media_type(content_type)
+    if media_type in _MEDIA_TYPE_FORMATS:
+        fmt = _MEDIA_TYPE_FORMATS[media_type]
+        if not format_available(fmt):
+            raise UnsupportedFormat(f"'{media_type}' bodies need {_FORMAT_MODULES[fmt]}: "
+                                    f"pip install {_FORMAT_MODULES[fmt]}")
+        return fmt
+    if media_type.endswith("+json"):
+        return JSON
+    raise UnsupportedFormat(f"Unsupported Content-Type '{media_type}', expected one of {sorted(MEDIA_TYPES.values())}")
+
+def response_format(accept: Optional[str], default: str) -> str:
+    """
+    Preferred response format from an Accept header
+
+    Raises:
+        UnsupportedFormat: If Accept names only media types we cannot produce,
+            including formats whose library is not installed (406)
+    """
+    if not accept:
+        return default
+    candidates = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    pass
+        if quality > 0:
+            candidates.append((-quality, position, media_type.strip().lower()))
+
+    for _, _, media_type in sorted(candidates):
+        if media_type in ("*/*", "application/*"):
+            return default
+        if media_type in _MEDIA_TYPE_FORMATS and format_available(_MEDIA_TYPE_FORMATS[media_type]):
+            return _MEDIA_TYPE_FORMATS[media_type]
+    raise UnsupportedFormat(f"Cannot produce '{accept}', expected one of {sorted(MEDIA_TYPES.values())}", 406)
+
+# --- Raw matrix ---
+
+def decode_matrix(body: bytes) -> np.ndarray:
+    """
+    (n_rows, n_columns) read-only view of a matrix body
+
+    Raises:
+        WireFormatError: If the header or the body length is wrong
+    """
+    if len(body) < MATRIX_HEADER.size:
+        raise WireFormatError(f"Body is shorter than the {MATRIX_HEADER.size}-byte matrix header")
+    magic, version, itemsize, n_columns, n_rows, _ = MATRIX_HEADER.unpack_from(body)
+    if magic != MATRIX_MAGIC or version != MATRIX_VERSION:
+        raise WireFormatError(f"Not a version {MATRIX_VERSION} matrix body (bad magic or version)")
+    if itemsize not in _MATRIX_DTYPES:
+        raise WireFormatError(f"Values must be 4 or 8 bytes wide, got {itemsize}")
+    expected = MATRIX_HEADER.size + n_rows * n_columns * itemsize
+    if len(body) != expected:
+        raise WireFormatError(f"Expected {expected} bytes for a {n_rows}x{n_columns} "
+                              f"float{itemsize * 8} matrix, got {len(body)}")
+    values = np.frombuffer(body, dtype=_MATRIX_DTYPES[itemsize], count=n_rows * n_columns,
+                           offset=MATRIX_HEADER.size)
+    return values.reshape(n_rows, n_columns)
+
+def encode_matrix(matrix: np.ndarray) -> bytes:
+    """Header + little-endian row-major values (float32 stays float32, everything else is float64)"""
+    dtype = _MATRIX_DTYPES[4] if matrix.dtype == np.float32 else _MATRIX_DTYPES[8]
+    matrix = np.ascontiguousarray(matrix, dtype=dtype)
+    n_rows, n_columns = matrix.shape
+    return MATRIX_HEADER.pack(MATRIX_MAGIC, MATRIX_VERSION, dtype.itemsize, n_columns, n_rows, 0) + matrix.tobytes()
+
+def probability_matrix(n_rows: int, valid_indices: np.ndarray, probabilities: np.ndarray) -> np.ndarray:
+    """(n_rows, 2) class probabilities with NaN in the rows that could not be scored"""
+    matrix = np.full((n_rows, 2), np.nan)
+    matrix[valid_indices] = probabilities
+    return matrix
+
+# --- Arrow IPC ---
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        raise UnsupportedFormat("Arrow bodies need pyarrow: pip install pyarrow")
+    return pyarrow
+
+def decode_arrow(body: bytes, feature_names: Sequence[str]) -> np.ndarray:
+    """
+    Feature matrix (model column order) from an Arrow IPC stream
+
+    Null values become NaN and are then rejected by the validator like any
+    other non-finite value.
+
+    Raises:
+        WireFormatError: If the stream is invalid or a feature column is missing or not numeric
+    """
+    pa = _require_pyarrow()
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    except (pa.ArrowInvalid, OSError) as e:
+        raise WireFormatError(f"Invalid Arrow stream: {e}")
+
+    missing_features = [name for name in feature_names if name not in table.column_names]
+    if missing_features:
+        raise WireFormatError(f"Missing required features: {missing_features}")
+
+    columns = []
+    for name in feature_names:
+        column = table.column(name)
+        if not (pa.types.is_floating(column.type) or pa.types.is_integer(column.type)):
+            raise WireFormatError(f"{name} must be a numeric column, got {column.type}")
+        columns.append(column.to_numpy())
+    return np.column_stack(columns)
+
+def encode_arrow(n_rows: int, valid_indices: np.ndarray, probabilities: np.ndarray,
+                 row_errors: Dict[int, List[str]], row_warnings: Dict[int, List[str]],
+                 model_version: str) -> bytes:
+    """
+    Arrow IPC stream with one result row per input row
+
+    Columns: index, prediction, confidence, exoplanet_probability,
+    not_exoplanet_probability, errors, warnings. Result columns are null
+    in rows that could not be scored; the model version is stored in the
+    schema metadata.
+    """
+    pa = _require_pyarrow()
+    unscored = np.ones(n_rows, dtype=bool)
+    unscored[valid_indices] = False
+    matrix = probability_matrix(n_rows, valid_indices, probabilities)
+    prediction = np.zeros(n_rows, dtype=np.int8)
+    prediction[valid_indices] = probabilities.argmax(axis=1)
+    confidence = np.zeros(n_rows)
+    confidence[valid_indices] = probabilities.max(axis=1)
+
+    table = pa.table({
+        "index": pa.array(np.arange(n_rows, dtype=np.int32)),
+        "prediction": pa.array(prediction, mask=unscored),
+        "confidence": pa.array(confidence, mask=unscored),
+        "exoplanet_probability": pa.array(matrix[:, 1], mask=unscored),
+        "not_exoplanet_probability": pa.array(matrix[:, 0], mask=unscored),
+        "errors": pa.array([row_errors.get(i, []) for i in range(n_rows)], type=pa.list_(pa.string())),
+        "warnings": pa.array([row_warnings.get(i, []) for i in range(n_rows)], type=pa.list_(pa.string())),
+    }).replace_schema_metadata({"model_version": model_version})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+# --- MessagePack ---
+
+def _require_msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise UnsupportedFormat("MessagePack bodies need msgpack: pip install msgpack")
+    return msgpack
+
+def decode_msgpack(body: bytes) -> Any:
+    """
+    The JSON-shaped document in a MessagePack body
+
+    Binary values inside "columns" are read as little-endian float64 arrays.
+
+    Raises:
+        WireFormatError: If the body is not valid MessagePack
+    """
+    msgpack = _require_msgpack()
+    try:
+        document = msgpack.unpackb(body, raw=False)
+    except Exception as e:
+        raise WireFormatError(f"Invalid MessagePack body: {e}")
+
+    columns = document.get("columns") if isinstance(document, dict) else None
+    if isinstance(columns, dict):
+        for name, values in columns.items():
+            if isinstance(values, bytes):
+                if len(values) % 8:
+                    raise WireFormatError(f"Binary column {name} is not a whole number of float64 values")
+                columns[name] = np.frombuffer(values, dtype="<f8")
+    return document
+
+def encode_msgpack(document: Any) -> bytes:
+    return _require_msgpack().packb(document, use_bin_type=True)
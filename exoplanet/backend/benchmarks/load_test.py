@@ -0,0 +1,133 @@
+# benchmarks/load_test.py - Concurrent gateway-style traffic against the prediction API
+#
+# Run from the backend directory:
+#   python -m benchmarks.load_test --url http://127.0.0.1:8000 --requests 5000 --concurrency 64
+#   python -m benchmarks.load_test --in-process        # no server needed
+#
+# Every request carries a distinct feature row and X-Request-ID, the way
+# the Node gateway forwards /api/analyze calls. Each response is checked
+# against a local forward pass of the same model and against its request
+# ID, so crossed or interleaved responses show up as mismatches. Exits 1
+# on any mismatch or failed request.
+
+import argparse
+import json
+import sys
+import time
+import uuid
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.artifacts import load_artifacts
+from app.client import ExoplanetClient, PredictionError
+from benchmarks.parallel_scaling import synthetic_catalog
+
+TOLERANCE = 1e-6
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load-test /predict and /predict/batch and verify every response")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API to test")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Drive the app through FastAPI's test client instead of --url")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-every", type=int, default=10,
+                        help="Every Nth request is a /predict/batch call (0 = single rows only)")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--output", help="Write the summary as JSON to this file")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    warnings.filterwarnings("ignore")
+
+    if args.in_process:
+        from fastapi.testclient import TestClient
+        from app.main import app
+        http_client = TestClient(app)
+        http_client.__enter__()  # runs the startup events
+    else:
+        http_client = None
+
+    client = ExoplanetClient(args.url, max_connections=args.concurrency,
+                             max_keepalive=args.concurrency, http_client=http_client)
+
+    # Expected probabilities come from the same model, engine and
+    # precision as the API serves, loaded locally
+    served = client.request("GET", "/model/info").json()["artifacts"]
+    served_version = served["version"]
+    reference = load_artifacts(served["engine"], variant=served["variant"], precision=served["precision"],
+                               version=None if served_version.startswith("unversioned-") else served_version)
+    if served_version != reference.version_label:
+        print(f"❌ API serves model {served_version}, local artifacts are {reference.version_label}", file=sys.stderr)
+        sys.exit(2)
+
+    feature_names = reference.feature_names
+    rows = synthetic_catalog(feature_names, args.requests * max(args.batch_size, 1), seed=11)
+    expected = reference.engine.predict_proba(rows)[:, 1]
+
+    def call(i):
+        request_id = uuid.uuid4().hex
+        is_batch = args.batch_every and i % args.batch_every == 0
+        first = i * args.batch_size
+        start = time.perf_counter()
+        try:
+            if is_batch:
+                batch = [dict(zip(feature_names, row)) for row in rows[first:first + args.batch_size].tolist()]
+                response = client.request("POST", "/predict/batch", request_id, json={"rows": batch})
+                got = np.array([item["exoplanet_probability"] for item in response.json()["results"]])
+                want = expected[first:first + args.batch_size]
+            else:
+                response = client.request("POST", "/predict", request_id,
+                                          json=dict(zip(feature_names, rows[first].tolist())))
+                got = np.array([response.json()["exoplanet_probability"]])
+                want = expected[first:first + 1]
+        except PredictionError as e:
+            return (time.perf_counter() - start) * 1000, "failed", str(e)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if response.headers.get("x-request-id") != request_id:
+            return elapsed_ms, "mismatch", f"request {request_id} answered as {response.headers.get('x-request-id')}"
+        if got.shape != want.shape or np.max(np.abs(got - want)) > TOLERANCE:
+            return elapsed_ms, "mismatch", f"request {i}: expected {want.tolist()}, got {got.tolist()}"
+        return elapsed_ms, "ok", None
+
+    print(f"🚀 {args.requests} requests, concurrency {args.concurrency}, model {served_version}", file=sys.stderr)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = list(pool.map(call, range(args.requests)))
+    elapsed = time.perf_counter() - start
+    client.close()
+
+    timings = np.array([outcome[0] for outcome in outcomes])
+    problems = [outcome for outcome in outcomes if outcome[1] != "ok"]
+    summary = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "model_version": served_version,
+        "requests_per_s": args.requests / elapsed,
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p95_ms": float(np.percentile(timings, 95)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "failed": sum(1 for outcome in problems if outcome[1] == "failed"),
+        "mismatched": sum(1 for outcome in problems if outcome[1] == "mismatch"),
+        "examples": [outcome[2] for outcome in problems[:5]],
+    }
+
+    print(f"   {summary['requests_per_s']:,.0f} req/s, p50 {summary['p50_ms']:.1f} ms, "
+          f"p95 {summary['p95_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms", file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+    else:
+        print(json.dumps(summary, indent=2))
+
+    if problems:
+        print(f"❌ {summary['failed']} failed, {summary['mismatched']} mismatched responses", file=sys.stderr)
+        sys.exit(1)
+    print("✅ Every response matched its request", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/parallel_scaling.py - Throughput of multi-process scoring vs worker count
+#
+# Run from the backend directory:
+#   python -m benchmarks.parallel_scaling --rows 1000000 --workers 1 2 4 8
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from app.artifacts import load_artifacts
+from app.engine import ENGINE_CHOICES
+from app.parallel import iter_scored_chunks
+from app.streaming import FeatureChunk, count_comment_lines
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '../../data/kepler.csv')
+
+def synthetic_catalog(feature_names, n_rows, seed=42):
+    """
+    Draw n_rows from data/kepler.csv's feature distribution
+
+    Real rows are resampled with replacement (keeping the correlations
+    between features) and each value is jittered by a few percent, so the
+    catalog is not just the same 9k rows repeated.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(DATA_PATH, skiprows=count_comment_lines(DATA_PATH), usecols=feature_names)
+    base = df[feature_names].dropna().to_numpy(dtype=np.float64)
+
+    rng = np.random.default_rng(seed)
+    rows = base[rng.integers(0, len(base), n_rows)]
+    rows *= rng.lognormal(mean=0.0, sigma=0.05, size=rows.shape)
+    return rows
+
+def usable_cpus():
+    """CPUs this process may run on (the affinity mask, e.g. under taskset or a container limit)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def make_chunks(rows, chunk_size):
+    valid = np.ones(chunk_size, dtype=bool)
+    for start in range(0, len(rows), chunk_size):
+        features = rows[start:start + chunk_size]
+        yield FeatureChunk(start, features, valid[:len(features)], {})
+
+def run(rows, engine_name, workers, chunk_size):
+    start = time.perf_counter()
+    scored = 0
+    for chunk, results in iter_scored_chunks(make_chunks(rows, chunk_size), engine_name, workers=workers):
+        scored += len(results)
+    elapsed = time.perf_counter() - start
+    return {"workers": workers, "rows": scored, "seconds": round(elapsed, 4), "rows_per_second": round(scored / elapsed, 1)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel catalog scoring at several worker counts")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic catalog size (default: 1,000,000)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to try")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Rows per chunk (default: 50000)")
+    parser.add_argument("--engine", choices=ENGINE_CHOICES, default="numpy", help="Inference engine (default: numpy)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    feature_names = load_artifacts(args.engine).feature_names
+    print(f"Generating {args.rows:,} synthetic rows from {os.path.normpath(DATA_PATH)}...")
+    rows = synthetic_catalog(feature_names, args.rows)
+
+    cpus = usable_cpus()
+    note = None
+    if cpus == 1:
+        note = "Only 1 CPU is available: extra workers share it, so these results do not show scaling"
+    elif max(args.workers) > cpus:
+        note = f"Only {cpus} CPUs are available: worker counts above {cpus} cannot scale further"
+    if note:
+        print(f"⚠️  {note}")
+
+    results = []
+    for workers in args.workers:
+        result = run(rows, args.engine, workers, args.chunk_size)
+        result["speedup"] = round(result["rows_per_second"] / results[0]["rows_per_second"], 2) if results else 1.0
+        results.append(result)
+        print(f"   {workers} worker(s): {result['rows_per_second']:>12,.0f} rows/s  "
+              f"({result['seconds']:.2f}s, x{result['speedup']:.2f})")
+
+    report = {
+        "benchmark": "parallel_scaling",
+        "engine": args.engine,
+        "rows": args.rows,
+        "chunk_size": args.chunk_size,
+        "cpu_count": os.cpu_count(),
+        "usable_cpus": cpus,
+        "note": note,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/precision_report.py - Parity, calibration and speed of float32 / int8 inference
+#
+# Run from the backend directory:
+#   python -m benchmarks.precision_report
+#   python -m benchmarks.precision_report --variant distilled --output precision.json
+#
+# Every precision of the NumPy engine is compared against float64
+# predict_proba on the held-out split used by train_model.py.
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from app.artifacts import VARIANT_CHOICES, load_artifacts
+from app.dataset import load_kepler
+from app.evaluation import expected_calibration_error
+from app.engine import PRECISION_CHOICES
+
+def rows_per_second(engine, rows, min_seconds):
+    engine.predict_proba(rows)  # warm-up
+    calls, start = 0, time.perf_counter()
+    while True:
+        engine.predict_proba(rows)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return calls * len(rows) / elapsed
+
+def evaluate(engine, reference, X_test, y_test, throughput_rows, min_seconds):
+    probabilities = engine.predict_proba(X_test)
+    diff = np.abs(probabilities[:, 1] - reference[:, 1])
+    return {
+        "max_abs_diff": float(diff.max()),
+        "mean_abs_diff": float(diff.mean()),
+        "label_agreement": float(np.mean(probabilities.argmax(axis=1) == reference.argmax(axis=1))),
+        "accuracy": float(np.mean(probabilities.argmax(axis=1) == y_test)),
+        "brier_score": float(np.mean((probabilities[:, 1] - y_test) ** 2)),
+        "expected_calibration_error": expected_calibration_error(probabilities[:, 1], y_test),
+        "weight_bytes": engine.weight_bytes(),
+        "rows_per_s": rows_per_second(engine, throughput_rows, min_seconds),
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare float32 / int8 NumPy inference against float64")
+    parser.add_argument("--variant", choices=VARIANT_CHOICES, default="full")
+    parser.add_argument("--throughput-rows", type=int, default=10000, help="Batch size for the rows/s measurement")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Minimum time per throughput measurement")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    base = load_artifacts("numpy", variant=args.variant).engine
+    dataset = load_kepler(feature_names=base.feature_names)
+
+    # Same split as train_model.py
+    _, X_test, _, y_test = train_test_split(
+        dataset.features, dataset.target, test_size=0.25, random_state=42, stratify=dataset.target
+    )
+    reference = base.predict_proba(X_test)
+    throughput_rows = np.resize(X_test, (args.throughput_rows, X_test.shape[1]))
+
+    results = {}
+    for precision in PRECISION_CHOICES:
+        engine = base if precision == "float64" else base.with_precision(precision)
+        results[precision] = evaluate(engine, reference, X_test, y_test, throughput_rows, args.seconds)
+
+    report = {
+        "variant": args.variant,
+        "held_out_rows": int(len(X_test)),
+        "precisions": results,
+    }
+
+    print(f"{'precision':<10}{'max |Δp|':>11}{'mean |Δp|':>11}{'agree':>8}{'acc':>8}{'brier':>8}{'ECE':>8}"
+          f"{'KiB':>8}{'rows/s':>12}", file=sys.stderr)
+    for precision, r in results.items():
+        print(f"{precision:<10}{r['max_abs_diff']:>11.2e}{r['mean_abs_diff']:>11.2e}{r['label_agreement']:>8.4f}"
+              f"{r['accuracy']:>8.4f}{r['brier_score']:>8.4f}{r['expected_calibration_error']:>8.4f}"
+              f"{r['weight_bytes'] / 1024:>8.1f}{r['rows_per_s']:>12,.0f}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# benchmarks/run_benchmarks.py - Reproducible performance benchmarks for inference and the API
+#
+# Run from the backend directory:
+#   python -m benchmarks.run_benchmarks --output bench.json
+#   python -m benchmarks.run_benchmarks --baseline bench.json   # exits 1 on regression
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from app.artifacts import load_artifacts
+from app.engine import ENGINE_CHOICES
+from app.utils import prepare_features_for_prediction
+from benchmarks.parallel_scaling import synthetic_catalog
+
+DEFAULT_BATCH_SIZES = [1, 16, 64, 256, 1024, 10000]
+
+def _metric(value, unit, better):
+    return {"value": round(float(value), 6), "unit": unit, "better": better}
+
+def _percentiles(prefix, samples_ms):
+    samples = np.asarray(samples_ms)
+    return {
+        f"{prefix}_p50_ms": _metric(np.percentile(samples, 50), "ms", "lower"),
+        f"{prefix}_p95_ms": _metric(np.percentile(samples, 95), "ms", "lower"),
+        f"{prefix}_p99_ms": _metric(np.percentile(samples, 99), "ms", "lower"),
+        f"{prefix}_mean_ms": _metric(samples.mean(), "ms", "lower"),
+    }
+
+def bench_load(engine_name, repeats):
+    """Artifact load time, bypassing the per-process cache"""
+    timings = [load_artifacts(engine_name, reload=True).load_seconds * 1000 for _ in range(repeats)]
+    return {f"{engine_name}_artifact_load_ms": _metric(np.median(timings), "ms", "lower")}
+
+def bench_single_row(engine_name, rows, iterations):
+    """One row through prepare_features_for_prediction -> scaler -> model"""
+    artifacts = load_artifacts(engine_name)
+    feature_names = artifacts.feature_names
+    samples = [dict(zip(feature_names, row)) for row in rows[:iterations].tolist()]
+
+    timings = []
+    for features in samples:
+        start = time.perf_counter()
+        features_array = prepare_features_for_prediction(features, feature_names)
+        artifacts.engine.predict_proba(features_array)
+        timings.append((time.perf_counter() - start) * 1000)
+    return _percentiles(f"{engine_name}_single_row", timings)
+
+def bench_batches(engine_name, rows, batch_sizes, min_seconds):
+    """Rows/second for one engine call per batch, at several batch sizes"""
+    engine = load_artifacts(engine_name).engine
+    metrics = {}
+    for batch_size in batch_sizes:
+        batch = rows[:batch_size]
+        engine.predict_proba(batch)  # warm-up
+        calls, start = 0, time.perf_counter()
+        while True:
+            engine.predict_proba(batch)
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                break
+        metrics[f"{engine_name}_batch_{batch_size}_rows_per_s"] = _metric(calls * len(batch) / elapsed, "rows/s", "higher")
+    return metrics
+
+def bench_api(engine_name, rows, requests_total, concurrency):
+    """End-to-end POST /predict through FastAPI's in-process test client"""
+    from fastapi.testclient import TestClient
+    from app import config
+    from app import predict
+    from app.main import app
+
+    config.INFERENCE_ENGINE = engine_name
+    feature_names = load_artifacts(engine_name).feature_names
+    # Distinct rows, so the result cache does not hide the pipeline cost
+    payloads = [dict(zip(feature_names, row)) for row in rows[:requests_total].tolist()]
+
+    with TestClient(app) as client:
+        predict.load_model()
+        client.post("/predict", json=payloads[0])  # warm-up
+
+        def call(payload):
+            start = time.perf_counter()
+            response = client.post("/predict", json=payload)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if response.status_code != 200:
+                raise RuntimeError(f"/predict returned {response.status_code}: {response.text}")
+            return elapsed_ms
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            timings = list(pool.map(call, payloads))
+        elapsed = time.perf_counter() - start
+
+    metrics = _percentiles(f"{engine_name}_api_predict_c{concurrency}", timings)
+    metrics[f"{engine_name}_api_predict_c{concurrency}_requests_per_s"] = _metric(len(timings) / elapsed, "req/s", "higher")
+    return metrics
+
+def _arrow_stream(feature_names, matrix):
+    import pyarrow as pa
+
+    table = pa.table({name: matrix[:, j] for j, name in enumerate(feature_names)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def bench_wire_formats(engine_name, rows, batch_rows, repeats):
+    """POST /predict/batch latency for the same rows in each request/response format"""
+    from fastapi.testclient import TestClient
+    from app import config
+    from app import predict
+    from app import wire
+    from app.main import app
+
+    config.INFERENCE_ENGINE = engine_name
+    feature_names = load_artifacts(engine_name).feature_names
+    matrix = np.ascontiguousarray(rows[:batch_rows])
+    bodies = {
+        "json_rows": (json.dumps({"rows": [dict(zip(feature_names, row)) for row in matrix.tolist()]}), wire.JSON),
+        "json_columns": (json.dumps({"columns": {name: matrix[:, j].tolist() for j, name in enumerate(feature_names)}}),
+                         wire.JSON),
+        "matrix_f64": (wire.encode_matrix(matrix), wire.MATRIX),
+        "matrix_f32": (wire.encode_matrix(matrix.astype(np.float32)), wire.MATRIX),
+    }
+    try:
+        bodies["arrow"] = (_arrow_stream(feature_names, matrix), wire.ARROW)
+    except ImportError:
+        pass
+
+    metrics = {}
+    with TestClient(app) as client:
+        predict.load_model()
+        for name, (body, fmt) in bodies.items():
+            headers = {"content-type": wire.MEDIA_TYPES[fmt], "accept": wire.MEDIA_TYPES[fmt]}
+            timings = []
+            for _ in range(repeats + 1):
+                start = time.perf_counter()
+                response = client.post("/predict/batch", content=body, headers=headers)
+                timings.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    raise RuntimeError(f"/predict/batch ({name}) returned {response.status_code}: {response.text}")
+            # The first call is a warm-up
+            metrics[f"{engine_name}_api_batch{batch_rows}_{name}_ms"] = _metric(np.median(timings[1:]), "ms", "lower")
+    return metrics
+
+def bench_explain(engine_name, rows, explanations):
+    """Explanations per second: one perturbation matrix and one engine call per explained row"""
+    from app import explain
+
+    artifacts = load_artifacts(engine_name)
+    background = explain.load_background(artifacts)
+    explain.explain(artifacts.engine, rows[0], background, artifacts.feature_names)  # warm-up
+
+    timings = []
+    start = time.perf_counter()
+    for row in rows[:explanations]:
+        row_start = time.perf_counter()
+        explain.explain(artifacts.engine, row, background, artifacts.feature_names)
+        timings.append((time.perf_counter() - row_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    metrics = _percentiles(f"{engine_name}_explain", timings)
+    metrics[f"{engine_name}_explain_per_s"] = _metric(len(timings) / elapsed, "explanations/s", "higher")
+    return metrics
+
+def compare(results, baseline, tolerance):
+    """Return human-readable regressions of results against a baseline run"""
+    regressions = []
+    for name, current in results["metrics"].items():
+        previous = baseline.get("metrics", {}).get(name)
+        if previous is None or previous["value"] == 0:
+            continue
+        ratio = current["value"] / previous["value"]
+        if current["better"] == "lower" and ratio > 1 + tolerance:
+            regressions.append(f"{name}: {previous['value']:.4g} -> {current['value']:.4g} {current['unit']} ({ratio - 1:+.0%})")
+        elif current["better"] == "higher" and ratio < 1 - tolerance:
+            regressions.append(f"{name}: {previous['value']:.4g} -> {current['value']:.4g} {current['unit']} ({ratio - 1:+.0%})")
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark model loading, inference and the /predict API")
+    parser.add_argument("--engines", nargs="+", choices=ENGINE_CHOICES, default=list(ENGINE_CHOICES))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=DEFAULT_BATCH_SIZES)
+    parser.add_argument("--single-row-iterations", type=int, default=2000)
+    parser.add_argument("--batch-seconds", type=float, default=0.5, help="Minimum time per batch-size measurement")
+    parser.add_argument("--load-repeats", type=int, default=3)
+    parser.add_argument("--api-requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--wire-rows", type=int, default=10000, help="Rows per /predict/batch call in the wire format benchmark")
+    parser.add_argument("--wire-repeats", type=int, default=5)
+    parser.add_argument("--explanations", type=int, default=500, help="Rows explained in the attribution benchmark")
+    parser.add_argument("--skip-api", action="store_true", help="Skip the end-to-end API benchmarks")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previous JSON result and exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown (default: 0.2 = 20%%)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    # sklearn warns on every call that the scaler was fitted with feature names
+    warnings.filterwarnings("ignore")
+
+    feature_names = load_artifacts(args.engines[0]).feature_names
+    n_rows = max(args.batch_sizes + [args.single_row_iterations, args.api_requests, args.wire_rows, args.explanations])
+    rows = synthetic_catalog(feature_names, n_rows, seed=7)
+
+    metrics = {}
+    for engine_name in args.engines:
+        print(f"Benchmarking {engine_name} engine...", file=sys.stderr)
+        metrics.update(bench_load(engine_name, args.load_repeats))
+        metrics.update(bench_single_row(engine_name, rows, args.single_row_iterations))
+        metrics.update(bench_batches(engine_name, rows, args.batch_sizes, args.batch_seconds))
+        metrics.update(bench_explain(engine_name, rows, args.explanations))
+        if not args.skip_api:
+            metrics.update(bench_api(engine_name, rows, args.api_requests, args.concurrency))
+            metrics.update(bench_wire_formats(engine_name, rows, args.wire_rows, args.wire_repeats))
+
+    results = {
+        "benchmark": "exoplanet_inference",
+        "timestamp": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "metrics": metrics,
+    }
+
+    for name, metric in metrics.items():
+        print(f"   {name:<48} {metric['value']:>14,.4f} {metric['unit']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:", file=sys.stderr)
+            for line in regressions:
+                print(f"   {line}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ No regressions beyond {args.tolerance:.0%} against {args.baseline}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# distill_model.py - Train a small student model on the trained model's outputs
+#
+# Run from the backend directory after train_model.py:
+#   python distill_model.py                 # single hidden layer of 32 units
+#   python distill_model.py --hidden 16     # even smaller
+#
+# The student reuses the teacher's scaler and feature list, so it is served
+# by either engine with EXOPLANET_MODEL_VARIANT=distilled (API) or
+# --variant distilled (run_predictions.py, run_clean_predictions.py,
+# score_catalog.py).
+
+import argparse
+import json
+import os
+import time
+import warnings
+
+import joblib
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.neural_network import MLPClassifier
+
+from app.artifacts import STUDENT_MODEL_PATH, STUDENT_WEIGHTS_PATH, hash_files, load_artifacts
+from app.dataset import load_kepler
+from app.engine import NumpyMLPEngine, check_parity, export_numpy_weights
+from app import registry
+
+DATA_PATH = "../data/kepler.csv"
+REPORT_PATH = os.path.join(os.path.dirname(STUDENT_MODEL_PATH), "distillation_report.json")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Distill the trained MLP into a smaller serving model")
+    parser.add_argument("--hidden", type=int, nargs="+", default=[32],
+                        help="Student hidden layer sizes (default: 32)")
+    parser.add_argument("--synthetic", type=int, default=50000,
+                        help="Synthetic samples drawn around the training rows (default: 50000)")
+    parser.add_argument("--jitter", type=float, default=0.1,
+                        help="Log-normal sigma applied to synthetic samples (default: 0.1)")
+    parser.add_argument("--max-iter", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+def synthesize(X_train, n_samples, jitter, rng):
+    """Resample training rows and jitter every value multiplicatively"""
+    rows = X_train[rng.integers(0, len(X_train), n_samples)]
+    return rows * rng.lognormal(mean=0.0, sigma=jitter, size=rows.shape)
+
+def fit_student(X_scaled, teacher_probabilities, hidden, max_iter, seed):
+    """
+    Fit an MLPClassifier to the teacher's soft labels
+
+    Each row is presented once per class, weighted by the teacher's
+    probability for that class, which makes the log-loss the cross-entropy
+    against the teacher's distribution rather than against hard labels.
+    """
+    p = teacher_probabilities[:, 1]
+    X_doubled = np.vstack([X_scaled, X_scaled])
+    y_doubled = np.concatenate([np.zeros(len(p), dtype=int), np.ones(len(p), dtype=int)])
+    weights = np.concatenate([1.0 - p, p])
+
+    student = MLPClassifier(
+        hidden_layer_sizes=tuple(hidden),
+        activation='relu',
+        solver='adam',
+        max_iter=max_iter,
+        early_stopping=True,
+        n_iter_no_change=10,
+        random_state=seed,
+    )
+    student.fit(X_doubled, y_doubled, sample_weight=weights)
+    return student
+
+def latency_ms_per_1k(engine, rows, repeats=50):
+    engine.predict_proba(rows)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        engine.predict_proba(rows)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000 * 1000 / len(rows))
+
+def main():
+    args = parse_args()
+    # The teacher's scaler was fitted on a DataFrame; we pass plain arrays
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+    print("📦 Loading teacher model and data...")
+    teacher = load_artifacts("sklearn")
+    feature_names = teacher.feature_names
+    dataset = load_kepler(DATA_PATH, feature_names)
+
+    # Same split as train_model.py, so the held-out rows are unseen by both models
+    X_train, X_test, y_train, y_test = train_test_split(
+        dataset.features, dataset.target, test_size=0.25, random_state=42, stratify=dataset.target
+    )
+
+    rng = np.random.default_rng(args.seed)
+    X_distill = np.vstack([X_train, synthesize(X_train, args.synthetic, args.jitter, rng)])
+    teacher_probabilities = teacher.engine.predict_proba(X_distill)
+    print(f"   {len(X_train)} training rows + {args.synthetic} synthetic samples")
+
+    print(f"🧪 Training student MLP {tuple(args.hidden)}...")
+    start = time.perf_counter()
+    student = fit_student(teacher.scaler.transform(X_distill), teacher_probabilities,
+                          args.hidden, args.max_iter, args.seed)
+    fit_seconds = time.perf_counter() - start
+    print(f"   Done in {fit_seconds:.1f}s ({student.n_iter_} epochs)")
+
+    print("💾 Saving student artifacts...")
+    joblib.dump(student, STUDENT_MODEL_PATH)
+    export_numpy_weights(student, teacher.scaler, feature_names, STUDENT_WEIGHTS_PATH)
+    student_engine = NumpyMLPEngine.load(STUDENT_WEIGHTS_PATH)
+    check_parity(student_engine, student, teacher.scaler, X_test)
+
+    # --- Agreement and speedup on the held-out split ---
+    teacher_test = teacher.engine.predict_proba(X_test)
+    student_test = student_engine.predict_proba(X_test)
+    teacher_labels = teacher_test.argmax(axis=1)
+    student_labels = student_test.argmax(axis=1)
+
+    teacher_numpy = NumpyMLPEngine.load()
+    rows = np.resize(X_test, (1000, X_test.shape[1]))
+    teacher_latency = latency_ms_per_1k(teacher_numpy, rows)
+    student_latency = latency_ms_per_1k(student_engine, rows)
+
+    teacher_dir = registry.version_dir(teacher.version) if teacher.version else os.path.dirname(STUDENT_MODEL_PATH)
+    report = {
+        # registry.publish only ships the student alongside this exact teacher
+        "teacher_hash": registry.teacher_hash(teacher_dir),
+        "student_hidden_layer_sizes": list(args.hidden),
+        "teacher_hidden_layer_sizes": list(teacher_numpy.describe()["hidden_layer_sizes"]),
+        "student_parameters": int(sum(w.size + b.size for w, b in zip(student.coefs_, student.intercepts_))),
+        "teacher_parameters": int(sum(w.size + b.size for w, b in zip(teacher_numpy.coefs, teacher_numpy.intercepts))),
+        "distillation_rows": int(len(X_distill)),
+        "fit_seconds": round(fit_seconds, 3),
+        "held_out_rows": int(len(X_test)),
+        "label_agreement": float(np.mean(teacher_labels == student_labels)),
+        "probability_mae": float(np.mean(np.abs(teacher_test[:, 1] - student_test[:, 1]))),
+        "probability_max_abs_diff": float(np.max(np.abs(teacher_test[:, 1] - student_test[:, 1]))),
+        "teacher_accuracy": float(np.mean(teacher_labels == y_test)),
+        "student_accuracy": float(np.mean(student_labels == y_test)),
+        "teacher_ms_per_1k_rows": teacher_latency,
+        "student_ms_per_1k_rows": student_latency,
+        "speedup": teacher_latency / student_latency if student_latency else None,
+    }
+    with open(REPORT_PATH, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print("\n--- Distillation Report (held-out split, NumPy engine) ---")
+    print(f"Parameters:       {report['teacher_parameters']:,} -> {report['student_parameters']:,}")
+    print(f"Label agreement:  {report['label_agreement']:.4f}")
+    print(f"Probability MAE:  {report['probability_mae']:.4f}")
+    print(f"Accuracy:         teacher {report['teacher_accuracy']:.4f}, student {report['student_accuracy']:.4f}")
+    print(f"Latency / 1k:     teacher {teacher_latency:.3f} ms, student {student_latency:.3f} ms "
+          f"({report['speedup']:.1f}x faster)")
+    print(f"\n✅ Student saved to {STUDENT_MODEL_PATH} and {STUDENT_WEIGHTS_PATH}")
+    print(f"   Report saved to {REPORT_PATH}")
+
+    # Republish the active version with the student included, so
+    # EXOPLANET_MODEL_VARIANT=distilled keeps working against the registry
+    model_dir = os.path.dirname(STUDENT_MODEL_PATH)
+    if teacher.version is not None and hash_files([os.path.join(model_dir, "exoplanet_model.pkl")]) \
+            != teacher.manifest["files"]["exoplanet_model.pkl"]:
+        print(f"⚠️  {model_dir} no longer holds version {teacher.version}; student not published")
+    elif teacher.version is not None:
+        manifest = registry.publish(
+            model_dir,
+            metrics={**teacher.manifest["metrics"], "student_label_agreement": report["label_agreement"]},
+            feature_means=teacher.manifest.get("feature_means"),
+        )
+        print(f"   Model version {manifest['version']} published and activated")
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,115 @@
 const express = require('express');
 const cors = require('cors');
-const fs = require('fs').promises;
-const { exec } = require('child_process');
-const path = require('path');
+const http = require('http');
+const crypto = require('crypto');
 
 const app = express();
 const PORT = 3001;
 
+// Prediction API (see API_CONTRACT.md). Requests go straight to it over a
+// pool of keep-alive connections; nothing is written to disk, so
+// concurrent /api/analyze calls cannot see each other's results.
+const MODEL_URL = new URL(process.env.MODEL_URL || 'http://127.0.0.1:8000');
+const MODEL_TIMEOUT_MS = 10000;
+const MODEL_RETRIES = 2;
+const modelAgent = new http.Agent({ keepAlive: true, maxSockets: 64, maxFreeSockets: 16 });
+
 app.use(cors());
-app.use(express.json());
+app.use(express.json({ limit: '10mb' }));
 
-app.post('/api/analyze', async (req, res) => {
+function callModel(path, body, requestId) {
+  const payload = JSON.stringify(body);
+  return new Promise((resolve, reject) => {
+    const req = http.request({
+      agent: modelAgent,
+      hostname: MODEL_URL.hostname,
+      port: MODEL_URL.port,
+      path,
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Content-Length': Buffer.byteLength(payload),
+        'X-Request-ID': requestId
+      },
+      timeout: MODEL_TIMEOUT_MS
+    }, (res) => {
+      const chunks = [];
+      res.on('data', chunk => chunks.push(chunk));
+      res.on('end', () => resolve({
+        statusCode: res.statusCode,
+        retryAfter: res.headers['retry-after'],
+        body: Buffer.concat(chunks).toString('utf8')
+      }));
+    });
+    req.on('timeout', () => req.destroy(new Error('Model request timed out')));
+    req.on('error', reject);
+    req.end(payload);
+  });
+}
+
+// Predictions have no side effects, so connection errors and 503s are retried
+async function callModelWithRetries(path, body, requestId) {
+  for (let attempt = 0; ; attempt++) {
+    try {
+      const response = await callModel(path, body, requestId);
+      if (response.statusCode !== 503 || attempt === MODEL_RETRIES) {
+        return response;
+      }
+      const delayMs = 1000 * (parseInt(response.retryAfter, 10) || 1);
+      await new Promise(resolve => setTimeout(resolve, delayMs));
+    } catch (error) {
+      if (attempt === MODEL_RETRIES) {
+        throw error;
+      }
+      await new Promise(resolve => setTimeout(resolve, 100 * 2 ** attempt));
+    }
+  }
+}
+
+// Error detail from a non-200 model response. FastAPI sends {"detail": ...},
+// but a proxy in between may answer with plain text or an HTML page
+function errorDetail(body) {
   try {
-    const inputData = req.body;
-    console.log('Received data for analysis:', inputData);
+    const parsed = JSON.parse(body);
+    return parsed && parsed.detail !== undefined ? parsed.detail : parsed;
+  } catch (parseError) {
+    return (body || '').substring(0, 200);
+  }
+}
 
-    // 1. Write input data to input.json
-    const inputPath = path.join(__dirname, 'input.json');
-    await fs.writeFile(inputPath, JSON.stringify(inputData, null, 2));
-    console.log('Data written to input.json');
+function isPlainObject(value) {
+  return value !== null && typeof value === 'object' && !Array.isArray(value);
+}
 
-    // 2. Execute the curl command
-    const curlCommand = `curl -X 'POST' 'http://127.0.0.1:8000/predict' -H 'Content-Type: application/json' -d '@input.json' > formatted_result.json`;
-    
-    await new Promise((resolve, reject) => {
-      exec(curlCommand, { cwd: __dirname }, (error, stdout, stderr) => {
-        if (error) {
-          console.error('Error executing curl command:', error);
-          reject(error);
-          return;
-        }
-        console.log('Curl command executed successfully');
-        resolve();
-      });
-    });
+app.post('/api/analyze', async (req, res) => {
+  const requestId = req.get('X-Request-ID') || crypto.randomUUID();
+  // A body with "rows" or "columns" is a batch; anything else is one object
+  const isBatch = isPlainObject(req.body) && (Array.isArray(req.body.rows) || isPlainObject(req.body.columns));
+  try {
+    const response = await callModelWithRetries(isBatch ? '/predict/batch' : '/predict', req.body, requestId);
 
-    // 3. Read the result from formatted_result.json
-    const resultPath = path.join(__dirname, 'formatted_result.json');
-    
-    // Wait a moment for the file to be written
-    await new Promise(resolve => setTimeout(resolve, 1000));
-    
-    const resultData = await fs.readFile(resultPath, 'utf8');
-    const parsedResult = JSON.parse(resultData);
+    // Keep the model's status (400, 413, 503, ...) whatever its body looks like
+    if (response.statusCode !== 200) {
+      if (response.retryAfter) {
+        res.set('Retry-After', response.retryAfter);
+      }
+      return res.status(response.statusCode).set('X-Request-ID', requestId).json({
+        success: false,
+        error: errorDetail(response.body),
+        message: 'Model rejected the request'
+      });
+    }
 
-    console.log('Analysis completed, sending results');
-    res.json({
+    const parsedResult = JSON.parse(response.body);
+    res.set('X-Request-ID', requestId).json({
       success: true,
       result: parsedResult,
       message: 'Analysis completed successfully'
     });
 
   } catch (error) {
-    console.error('Error in analysis workflow:', error);
-    res.status(500).json({
+    console.error(`Error in analysis workflow (${requestId}):`, error);
+    res.status(502).json({
       success: false,
       error: error.message,
       message: 'Error during analysis'
@@ -68,4 +124,4 @@ app.get('/health', (req, res) => {
 
 app.listen(PORT, () => {
   console.log(`Backend server running on http://localhost:${PORT}`);
-});
\ No newline at end of file
+});
@@ -65,11 +65,8 @@ def test_api_endpoint(base_url="http://127.0.0.1:8000"):
         print(f"   Actual Label: {test_case['actual_label']}")
         print(f"   Expected: {test_case['expected']}")
         
-        # Prepare API request
-        payload = {
-            "features": test_case['features'],
-            "feature_names": feature_names
-        }
+        # Prepare API request (one field per feature, as PredictionRequest expects)
+        payload = dict(zip(feature_names, test_case['features']))
         
         try:
             response = requests.post(f"{base_url}/predict", 
@@ -90,7 +87,7 @@ def test_api_endpoint(base_url="http://127.0.0.1:8000"):
                 
                 print(f"   API Response: {predicted_label}")
                 print(f"   Confidence: {result['confidence']:.4f}")
-                print(f"   Exoplanet Probability: {result['probability']:.4f}")
+                print(f"   Exoplanet Probability: {result['exoplanet_probability']:.4f}")
                 print(f"   Result: {'✅ CORRECT' if is_correct else '❌ INCORRECT'}")
                 
             else:
@@ -0,0 +1,64 @@
+# test_engine.py - Check the exported NumPy engine against the sklearn model
+
+import sys
+
+import numpy as np
+
+from app.artifacts import WEIGHTS_PATH, load_artifacts
+from app.dataset import load_kepler
+from app.engine import NumpyMLPEngine, ParityError, check_parity, predict_probabilities
+
+# Largest allowed |probability difference| against sklearn's predict_proba,
+# per precision. int8 quantizes the weights, so it is also held to a
+# minimum label agreement rather than only a probability tolerance.
+TOLERANCES = {
+    "float64": 1e-9,
+    "float32": 1e-5,
+    "int8": 0.1,
+}
+MIN_INT8_AGREEMENT = 0.98
+
+# Load the pickled model and scaler the weights were exported from
+print("Loading trained model artifacts...")
+artifacts = load_artifacts("sklearn")
+model, scaler, features_to_use = artifacts.model, artifacts.scaler, artifacts.feature_names
+
+# Every KOI in the catalog, not just the held-out split
+print("Loading Kepler dataset...")
+dataset = load_kepler('../data/kepler.csv', features_to_use)
+X = dataset.features
+expected = predict_probabilities(model, scaler, X)
+print(f"Comparing on {len(X)} rows from {WEIGHTS_PATH}")
+
+print("\n" + "="*60)
+print("NUMPY ENGINE PARITY")
+print("="*60)
+
+failures = []
+for precision, atol in TOLERANCES.items():
+    engine = NumpyMLPEngine.load(WEIGHTS_PATH, precision=precision)
+    if engine.feature_names != list(features_to_use):
+        failures.append(f"{precision}: weights expect features {engine.feature_names}, "
+                        f"the model {features_to_use}")
+        continue
+    try:
+        max_diff = check_parity(engine, model, scaler, X, atol=atol)
+        status = "✅ PASS"
+    except ParityError as e:
+        max_diff = float(np.max(np.abs(engine.predict_proba(X) - expected)))
+        failures.append(str(e))
+        status = "❌ FAIL"
+
+    agreement = float(np.mean(engine.predict_proba(X).argmax(axis=1) == expected.argmax(axis=1)))
+    if precision == "int8" and agreement < MIN_INT8_AGREEMENT:
+        failures.append(f"int8: label agreement {agreement:.4f} below {MIN_INT8_AGREEMENT}")
+        status = "❌ FAIL"
+    print(f"{precision:>8}: max abs diff {max_diff:.2e} (tolerance {atol:.0e}), "
+          f"label agreement {agreement:.4%}  {status}")
+
+print("\n" + "="*60)
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("🎉 NumPy engine matches sklearn at every precision.")
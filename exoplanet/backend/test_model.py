@@ -1,34 +1,22 @@
 # test_model.py - Test the trained exoplanet model with specific examples
 
 import pandas as pd
-import joblib
 import numpy as np
-from sklearn.preprocessing import StandardScaler
+
+from app.artifacts import load_artifacts
+from app.dataset import load_kepler
 
 # Load the trained model, scaler, and features
 print("Loading trained model artifacts...")
-model = joblib.load('./models/exoplanet_model.pkl')
-scaler = joblib.load('./models/exoplanet_scaler.pkl')
-features_to_use = joblib.load('./models/model_features.pkl')
+artifacts = load_artifacts("sklearn")
+model, scaler, features_to_use = artifacts.model, artifacts.scaler, artifacts.feature_names
 
 print(f"Features used by model: {features_to_use}")
 
-# Load the dataset to extract test samples
+# Load the dataset to extract test samples (cleaned and cached by app.dataset)
 print("\nLoading Kepler dataset...")
-with open('../data/kepler.csv', 'r') as f:
-    first_line = 0
-    for line in f:
-        if not line.startswith('#'):
-            break
-        first_line += 1
-
-df = pd.read_csv('../data/kepler.csv', skiprows=first_line)
-
-# Create target variable
-df['is_exoplanet'] = df['koi_disposition'].apply(lambda x: 1 if x in ['CONFIRMED', 'CANDIDATE'] else 0)
-
-# Clean data - remove rows with missing values in our features
-clean_df = df[features_to_use + ['koi_disposition', 'is_exoplanet', 'kepoi_name']].dropna()
+dataset = load_kepler('../data/kepler.csv', features_to_use)
+clean_df = dataset.to_frame()
 
 print(f"\nDataset info after cleaning:")
 print(f"Total samples: {len(clean_df)}")
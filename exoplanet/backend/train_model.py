@@ -5,9 +5,20 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.neural_network import MLPClassifier
 from sklearn.metrics import classification_report, accuracy_score
+import argparse
+import json
 import joblib
 import os
 
+from app.dataset import load_kepler
+from app.engine import export_numpy_weights, NumpyMLPEngine, check_parity
+from app.model_search import SEARCH_SPACE, run_search
+from app.artifacts import load_sklearn_artifacts
+from app.incremental import SNAPSHOT_NAME, continue_training, diff_snapshot, save_snapshot
+from app.explain import BACKGROUND_NAME, save_background
+from app.drift import REFERENCE_NAME, save_reference
+from app import registry
+
 # --- Configuration ---
 # Define file paths based on your project structure
 DATA_PATH = "../data/kepler.csv"  # Assuming data folder is at project root
@@ -15,75 +26,167 @@ MODEL_OUTPUT_DIR = "./models"  # Models folder in current backend directory
 MODEL_NAME = "exoplanet_model.pkl"
 SCALER_NAME = "exoplanet_scaler.pkl"
 FEATURES_NAME = "model_features.pkl"
+WEIGHTS_NAME = "exoplanet_weights.npz"  # Scaler-folded weights for the NumPy engine
+
+# These are the features we will use to train the model.
+# They are chosen because they are numerical and highly relevant.
+features_to_use = [
+    'koi_period', 'koi_duration', 'koi_depth', 'koi_prad',
+    'koi_teq', 'koi_insol', 'koi_steff'
+]
+
+parser = argparse.ArgumentParser(description="Train the exoplanet classifier")
+parser.add_argument("--search", action="store_true",
+                    help="Cross-validate MLP and gradient-boosting candidates instead of training the default model")
+parser.add_argument("--search-mode", choices=["grid", "random"], default="random")
+parser.add_argument("--n-iter", type=int, default=20, help="Candidates per model family in random mode")
+parser.add_argument("--folds", type=int, default=5, help="Stratified k-fold splits")
+parser.add_argument("--time-budget", type=float, default=600, help="Seconds after which no new candidate is started")
+parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel workers (-1 = all cores)")
+parser.add_argument("--families", nargs="+", choices=list(SEARCH_SPACE), default=list(SEARCH_SPACE))
+parser.add_argument("--report", default=os.path.join(MODEL_OUTPUT_DIR, "search_report.json"),
+                    help="Where to write the search results as JSON")
+parser.add_argument("--no-activate", action="store_true",
+                    help="Publish the new model version without making running APIs switch to it")
+parser.add_argument("--incremental", action="store_true",
+                    help="Continue training the served version on new and changed catalog rows instead of "
+                         "starting over; promoted only if held-out accuracy and log loss do not get worse")
+parser.add_argument("--epochs", type=int, default=20, help="Passes over the changed rows in --incremental mode")
+parser.add_argument("--replay-ratio", type=float, default=4.0,
+                    help="Unchanged training rows replayed per changed row in --incremental mode")
+parser.add_argument("--tolerance", type=float, default=0.0,
+                    help="Accuracy drop allowed before an --incremental update is rejected")
+parser.add_argument("--log-loss-tolerance", type=float, default=0.0,
+                    help="Log loss increase allowed before an --incremental update is rejected")
+args = parser.parse_args()
 
 # --- 1. Load the Data ---
 print(f"Loading data from {DATA_PATH}...")
 try:
-    # Kepler data often has commented lines at the top; we skip them
-    with open(DATA_PATH, 'r') as f:
-        first_line = 0
-        for line in f:
-            if not line.startswith('#'):
-                break
-            first_line += 1
-    
-    df = pd.read_csv(DATA_PATH, skiprows=first_line)
-    print("Data loaded successfully!")
+    # Parsed once, then served from a binary cache keyed by the CSV's hash
+    dataset = load_kepler(DATA_PATH, features_to_use)
+    source = "cache" if dataset.from_cache else "CSV"
+    print(f"Data loaded successfully from {source} in {dataset.load_seconds:.2f}s!")
 except FileNotFoundError:
     print(f"❌ Error: '{DATA_PATH}' not found. Make sure your data is in the correct folder.")
     exit()
 
 # --- 2. Clean and Prepare Data ---
-print("Cleaning and preparing data...")
 # For this model, we'll classify objects as either an exoplanet or not.
 # 'CONFIRMED' and 'CANDIDATE' are positive (1), 'FALSE POSITIVE' is negative (0).
-df['is_exoplanet'] = df['koi_disposition'].apply(lambda x: 1 if x in ['CONFIRMED', 'CANDIDATE'] else 0)
+# The loader has already mapped the dispositions and dropped rows with
+# missing values in our selected columns.
+print(f"Data cleaned. Using {len(dataset)} rows for the model.")
 
-# These are the features we will use to train the model.
-# They are chosen because they are numerical and highly relevant.
-features_to_use = [
-    'koi_period', 'koi_duration', 'koi_depth', 'koi_prad',
-    'koi_teq', 'koi_insol', 'koi_steff'
-]
-target = 'is_exoplanet'
+# --- 3. Define Features (X) and Target (y) ---
+X = pd.DataFrame(dataset.features, columns=features_to_use)
+y = pd.Series(dataset.target, name='is_exoplanet')
 
-# Drop rows with missing values in our selected columns for simplicity
-model_df = df[features_to_use + [target]].dropna()
-print(f"Data cleaned. Using {len(model_df)} rows for the model.")
+if args.incremental:
+    # --- 4-6. Continue Training the Served Version ---
+    # Only rows that are new or changed since that version's snapshot are
+    # fitted (plus a replay sample); held-out rows keep their split
+    base_dir, base_manifest = registry.resolve(None)
+    base_version = base_manifest["version"] if base_manifest else "unversioned"
+    print(f"Comparing the catalog with the training snapshot of {base_version}...")
+    try:
+        diff = diff_snapshot(os.path.join(base_dir, SNAPSHOT_NAME), dataset)
+    except FileNotFoundError:
+        print(f"❌ Error: no {SNAPSHOT_NAME} in {base_dir}. Run a full training once first.")
+        exit(1)
+    changes = diff.summary()
+    print(f"{changes['new_rows']} new, {changes['changed_rows']} changed, {changes['removed_rows']} removed rows")
+    if not diff.updated.any() and not changes['removed_rows']:
+        print("✅ The catalog has not changed since the last training; nothing to do.")
+        exit()
 
-# --- 3. Define Features (X) and Target (y) ---
-X = model_df[features_to_use]
-y = model_df[target]
-
-# --- 4. Split and Scale Data ---
-print("Splitting and scaling data...")
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42, stratify=y)
-
-# Scaling is critical for MLP models
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test) # Use the same scaler fitted on the training data
-
-# --- 5. Train the MLP Model ---
-print("Training the MLP model... (This might take a moment)")
-model = MLPClassifier(
-    hidden_layer_sizes=(100, 50), # 2 hidden layers
-    max_iter=500,
-    activation='relu',
-    solver='adam',
-    random_state=42,
-    verbose=False # Set to True to see training progress
-)
-model.fit(X_train_scaled, y_train)
-print("Model training complete!")
+    model, scaler, base_features = load_sklearn_artifacts(model_dir=base_dir)
+    if list(base_features) != features_to_use:
+        print(f"❌ Error: {base_version} was trained on {base_features}, not {features_to_use}. Run a full training.")
+        exit(1)
+
+    print(f"Continuing training for {args.epochs} epochs...")
+    result = continue_training(model, scaler, dataset, diff, epochs=args.epochs, replay_ratio=args.replay_ratio)
+    model, scaler = result.model, result.scaler
+    print(f"Fitted {result.fit_rows} rows per epoch instead of {result.train_rows}")
+
+    print("\n--- Model Evaluation (held-out split) ---")
+    print(f"{'':10}{'accuracy':>10}{'log loss':>10}")
+    print(f"{'previous':<10}{result.baseline_accuracy:>10.4f}{result.baseline_log_loss:>10.4f}")
+    print(f"{'updated':<10}{result.accuracy:>10.4f}{result.log_loss:>10.4f}")
+    regressions = result.regressions(args.tolerance, args.log_loss_tolerance)
+    if regressions:
+        print(f"❌ {'; '.join(regressions).capitalize()}; keeping {base_version}. Nothing was saved.")
+        exit(1)
+
+    accuracy = result.accuracy
+    is_test = diff.is_test
+    X_train, X_test = X[~is_test], X[is_test]
+    update_metrics = {"incremental": {"base_version": base_version, "baseline_accuracy": result.baseline_accuracy,
+                                      "log_loss": result.log_loss, "baseline_log_loss": result.baseline_log_loss,
+                                      "fit_rows": result.fit_rows, **changes}}
+else:
+    # --- 4. Split and Scale Data ---
+    print("Splitting and scaling data...")
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42, stratify=y)
+
+    # --- Optional: Hyperparameter Search ---
+    # Cross-validates on the training split only, so the test split stays untouched
+    if args.search:
+        print(f"Searching {', '.join(args.families)} candidates ({args.search_mode}, {args.folds}-fold CV, "
+              f"budget {args.time_budget:.0f}s)...")
+        report = run_search(
+            X_train.values, y_train.values,
+            mode=args.search_mode,
+            n_iter=args.n_iter,
+            folds=args.folds,
+            time_budget=args.time_budget,
+            n_jobs=args.n_jobs,
+            families=args.families,
+        )
 
-# --- 6. Evaluate the Model ---
-print("\n--- Model Evaluation ---")
-predictions = model.predict(X_test_scaled)
-accuracy = accuracy_score(y_test, predictions)
-print(f"Model Accuracy on Test Data: {accuracy:.4f}")
-print("\nClassification Report:")
-print(classification_report(y_test, predictions, target_names=['Not an Exoplanet', 'Exoplanet Candidate']))
+        print(f"\n--- Search Results ({report['evaluated']} evaluated, {report['skipped']} skipped, "
+              f"{report['elapsed_seconds']:.0f}s) ---")
+        print(f"{'':2}{'family':<7}{'accuracy':>10}{'± std':>8}{'fit s':>8}{'ms/1k':>8}  params")
+        for result in report["results"]:
+            marker = "* " if result["pareto"] else "  "
+            print(f"{marker}{result['family']:<7}{result['accuracy_mean']:>10.4f}{result['accuracy_std']:>8.4f}"
+                  f"{result['fit_seconds']:>8.2f}{result['latency_ms_per_1k']:>8.2f}  {result['params']}")
+        print("(* = on the accuracy/latency Pareto front)")
+
+        os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Search report saved to {args.report}")
+        exit()
+
+    # Scaling is critical for MLP models
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test) # Use the same scaler fitted on the training data
+
+    # --- 5. Train the MLP Model ---
+    print("Training the MLP model... (This might take a moment)")
+    model = MLPClassifier(
+        hidden_layer_sizes=(100, 50), # 2 hidden layers
+        max_iter=500,
+        activation='relu',
+        solver='adam',
+        random_state=42,
+        verbose=False # Set to True to see training progress
+    )
+    model.fit(X_train_scaled, y_train)
+    print("Model training complete!")
+
+    # --- 6. Evaluate the Model ---
+    print("\n--- Model Evaluation ---")
+    predictions = model.predict(X_test_scaled)
+    accuracy = accuracy_score(y_test, predictions)
+    print(f"Model Accuracy on Test Data: {accuracy:.4f}")
+    print("\nClassification Report:")
+    print(classification_report(y_test, predictions, target_names=['Not an Exoplanet', 'Exoplanet Candidate']))
+    is_test = X.index.isin(X_test.index)
+    update_metrics = {}
 
 # --- 7. Save the Model, Scaler, and Features ---
 print(f"Saving artifacts to {MODEL_OUTPUT_DIR}...")
@@ -93,5 +196,28 @@ os.makedirs(MODEL_OUTPUT_DIR, exist_ok=True)
 joblib.dump(model, os.path.join(MODEL_OUTPUT_DIR, MODEL_NAME))
 joblib.dump(scaler, os.path.join(MODEL_OUTPUT_DIR, SCALER_NAME))
 joblib.dump(features_to_use, os.path.join(MODEL_OUTPUT_DIR, FEATURES_NAME))
+# Rows and split used, so the next --incremental run can tell what changed
+save_snapshot(os.path.join(MODEL_OUTPUT_DIR, SNAPSHOT_NAME), dataset, is_test)
+# Reference rows that /predict/explain perturbs the input against
+save_background(os.path.join(MODEL_OUTPUT_DIR, BACKGROUND_NAME), X_train.values)
+# Training distribution that the API's drift monitor compares live inputs with
+save_reference(os.path.join(MODEL_OUTPUT_DIR, REFERENCE_NAME), X_train.values, features_to_use)
+
+# --- 8. Export Weights for the NumPy Inference Engine ---
+print("Exporting scaler-folded weights for the NumPy engine...")
+weights_path = export_numpy_weights(model, scaler, features_to_use, os.path.join(MODEL_OUTPUT_DIR, WEIGHTS_NAME))
+max_diff = check_parity(NumpyMLPEngine.load(weights_path), model, scaler, X_test.values)
+print(f"Weights saved to {weights_path} (max abs diff vs sklearn on test data: {max_diff:.2e})")
+
+# --- 9. Publish a Registry Version ---
+# Running APIs poll the registry and hot-swap to the active version
+manifest = registry.publish(
+    MODEL_OUTPUT_DIR,
+    metrics={"accuracy": accuracy, "train_rows": len(X_train), "test_rows": len(X_test), **update_metrics},
+    feature_means=X_train.mean().tolist(),
+    activate_version=not args.no_activate,
+)
+state = "published" if args.no_activate else "published and activated"
+print(f"Model version {manifest['version']} {state}")
 
 print("\n✅ All done! Your model, scaler, and feature list are saved and ready for the backend.")
@@ -1,35 +1,29 @@
 # run_clean_predictions.py - Clean production-ready prediction script
 
+import argparse
 import json
-import joblib
 import numpy as np
 from datetime import datetime
-import os
 
-def load_model_artifacts():
-    """Load the trained model, scaler, and feature names"""
-    try:
-        model = joblib.load('./backend/models/exoplanet_model.pkl')
-        scaler = joblib.load('./backend/models/exoplanet_scaler.pkl')
-        feature_names = joblib.load('./backend/models/model_features.pkl')
-        return model, scaler, feature_names
-    except Exception as e:
-        raise Exception(f"Error loading model artifacts: {e}")
+from backend.app.artifacts import VARIANT_CHOICES, load_artifacts
+from backend.app.audit import AuditLog
 
-def make_prediction(model, scaler, features_dict, feature_names):
-    """Make a prediction for a single sample"""
+def make_prediction(engine, features_dict, feature_names, audit_log=None, model_version=None,
+                    sample_id=None, extra=None):
+    """Make a prediction for a single sample, queueing it for the audit log if one is given"""
     # Extract features in the correct order
     features = [features_dict[name] for name in feature_names]
     
     # Convert to numpy array and reshape
     features_array = np.array(features).reshape(1, -1)
     
-    # Scale the features
-    features_scaled = scaler.transform(features_array)
-    
-    # Make prediction
-    prediction = model.predict(features_scaled)[0]
-    probabilities = model.predict_proba(features_scaled)[0]
+    # Scale the features and make prediction (one forward pass)
+    all_probabilities = engine.predict_proba(features_array)
+    probabilities = all_probabilities[0]
+    prediction = int(np.argmax(probabilities))
+    if audit_log is not None:
+        audit_log.record("cli", model_version, feature_names, features_array, all_probabilities,
+                         ids=[sample_id], extra=[extra])
     
     return {
         "prediction": int(prediction),
@@ -38,13 +32,21 @@ def make_prediction(model, scaler, features_dict, feature_names):
         "exoplanet_probability": round(float(probabilities[1]), 4)
     }
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Score input.json predictions and write a results file")
+    parser.add_argument("--variant", choices=VARIANT_CHOICES, default="full",
+                        help="Model variant: the trained model or the smaller distilled student")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     print("🚀 Running Exoplanet Predictions...")
     
     # Load model artifacts
     try:
-        model, scaler, feature_names = load_model_artifacts()
-        print(f"✅ Model loaded successfully!")
+        artifacts = load_artifacts("sklearn", variant=args.variant)
+        engine, feature_names = artifacts.engine, artifacts.feature_names
+        print(f"✅ Model loaded successfully! ({artifacts.load_seconds:.3f}s)")
     except Exception as e:
         print(f"❌ Failed to load model: {e}")
         return
@@ -58,8 +60,10 @@ def main():
         print(f"❌ Failed to read input.json: {e}")
         return
     
-    # Process each sample
+    # Process each sample; every prediction is also appended to the audit log
+    # (block rather than drop when its queue is full: a batch run loses nothing)
     results = []
+    audit_log = AuditLog.from_config(source="run_clean_predictions", policy="block")
     
     for sample in input_data['predictions']:
         try:
@@ -70,7 +74,8 @@ def main():
             features_dict = {k: v for k, v in sample.items() if k != 'run_id'}
             
             # Make prediction
-            prediction_result = make_prediction(model, scaler, features_dict, feature_names)
+            prediction_result = make_prediction(engine, features_dict, feature_names, audit_log,
+                                                artifacts.version_label, run_id)
             
             # Prepare clean result
             result = {
@@ -87,12 +92,16 @@ def main():
             print(f"   ❌ Error processing {sample.get('run_id', 'unknown')}: {e}")
             continue
     
+    audit_log.close()
+    if audit_log.enabled:
+        print(f"✅ {audit_log.written} predictions appended to the audit log in {audit_log.directory}")
+    
     # Prepare clean output data
     output_data = {
         "prediction_batch": {
             "timestamp": datetime.now().isoformat(),
             "total_predictions": len(results),
-            "model_version": "exoplanet_v1.0"
+            "model_version": artifacts.version_label
         },
         "results": results
     }
@@ -1,35 +1,32 @@
 # run_predictions.py - Read input.json, make predictions, write to output JSON
 
+import argparse
 import json
-import joblib
+import time
 import numpy as np
 from datetime import datetime
-import os
 
-def load_model_artifacts():
-    """Load the trained model, scaler, and feature names"""
-    try:
-        model = joblib.load('./backend/models/exoplanet_model.pkl')
-        scaler = joblib.load('./backend/models/exoplanet_scaler.pkl')
-        feature_names = joblib.load('./backend/models/model_features.pkl')
-        return model, scaler, feature_names
-    except Exception as e:
-        raise Exception(f"Error loading model artifacts: {e}")
+from backend.app.artifacts import VARIANT_CHOICES, load_artifacts
+from backend.app.audit import AuditLog
+from backend.app.engine import ENGINE_CHOICES, PRECISION_CHOICES
+from backend.app import evaluation
 
-def make_prediction(model, scaler, features_dict, feature_names):
-    """Make a prediction for a single sample"""
+def make_prediction(engine, features_dict, feature_names, audit_log=None, model_version=None,
+                    sample_id=None, extra=None):
+    """Make a prediction for a single sample, queueing it for the audit log if one is given"""
     # Extract features in the correct order
     features = [features_dict[name] for name in feature_names]
     
     # Convert to numpy array and reshape
     features_array = np.array(features).reshape(1, -1)
     
-    # Scale the features
-    features_scaled = scaler.transform(features_array)
-    
-    # Make prediction
-    prediction = model.predict(features_scaled)[0]
-    probabilities = model.predict_proba(features_scaled)[0]
+    # Scale the features and make prediction (one forward pass)
+    all_probabilities = engine.predict_proba(features_array)
+    probabilities = all_probabilities[0]
+    prediction = int(np.argmax(probabilities))
+    if audit_log is not None:
+        audit_log.record("cli", model_version, feature_names, features_array, all_probabilities,
+                         ids=[sample_id], extra=[extra])
     
     return {
         "prediction": int(prediction),
@@ -39,32 +36,147 @@ def make_prediction(model, scaler, features_dict, feature_names):
         "not_exoplanet_probability": float(probabilities[0])
     }
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Score input.json test samples and log the results")
+    parser.add_argument("--engine", choices=ENGINE_CHOICES, default="sklearn",
+                        help="Inference engine: pickled sklearn model or exported NumPy weights")
+    parser.add_argument("--variant", choices=VARIANT_CHOICES, default="full",
+                        help="Model variant: the trained model or the smaller distilled student")
+    parser.add_argument("--precision", choices=PRECISION_CHOICES, default="float64",
+                        help="Forward-pass precision of the numpy engine (int8 = quantized weights)")
+    parser.add_argument("--evaluate", action="store_true",
+                        help="Score the whole input in one pass and report metrics instead of per-sample results")
+    parser.add_argument("--input", default="input.json",
+                        help="Input file: JSON (test_samples, predictions or a single object) or, with "
+                             "--evaluate, a labeled catalog CSV such as data/kepler.csv")
+    parser.add_argument("--output", help="Output JSON (default: predictions_log.json, or "
+                                         "evaluation_summary.json with --evaluate)")
+    parser.add_argument("--rows-output", help="With --evaluate, also write one JSON line per input row here")
+    parser.add_argument("--bins", type=int, default=evaluation.CALIBRATION_BINS,
+                        help="Calibration bins for --evaluate")
+    return parser.parse_args()
+
+def run_evaluation(args, artifacts):
+    """Score a labeled set in one vectorized pass and write a compact metrics summary"""
+    engine, feature_names = artifacts.engine, artifacts.feature_names
+    output_path = args.output or 'evaluation_summary.json'
+
+    print(f"\n📁 Reading {args.input}...")
+    try:
+        if args.input.endswith('.csv'):
+            samples = evaluation.from_catalog(args.input, feature_names)
+        else:
+            with open(args.input, 'r') as f:
+                samples = evaluation.from_document(json.load(f), feature_names)
+    except Exception as e:
+        print(f"❌ Failed to read {args.input}: {e}")
+        return
+
+    valid = samples.valid
+    labeled = valid & (samples.labels != evaluation.UNLABELED)
+    print(f"✅ {len(samples)} rows ({samples.input_shape}): {int(valid.sum())} valid, {int(labeled.sum())} labeled")
+
+    # One forward pass over every valid row
+    probabilities = np.full((len(samples), 2), np.nan)
+    start = time.perf_counter()
+    probabilities[valid] = engine.predict_proba(samples.features[valid])
+    elapsed = time.perf_counter() - start
+    predictions = np.where(valid, np.nan_to_num(probabilities).argmax(axis=1), -1)
+
+    metrics = None
+    if labeled.any():
+        metrics = evaluation.classification_metrics(probabilities[labeled], samples.labels[labeled], args.bins)
+    # Latency per true class where labels exist, otherwise per predicted class
+    groups = np.where(labeled, samples.labels, predictions)[valid]
+    latency = evaluation.latency_by_class(engine, samples.features[valid], groups)
+
+    summary = {
+        "timestamp": datetime.now().isoformat(),
+        "model_info": {
+            "model_version": artifacts.version_label,
+            "engine": artifacts.engine_name,
+            "variant": artifacts.variant,
+            "precision": artifacts.precision,
+            "features_used": feature_names,
+        },
+        "input": {"path": args.input, "shape": samples.input_shape, "rows": len(samples),
+                  "valid": int(valid.sum()), "labeled": int(labeled.sum()), "invalid": len(samples.row_errors)},
+        "predicted_exoplanets": int((predictions == 1).sum()),
+        "scoring_seconds": elapsed,
+        "metrics": metrics,
+        "latency": latency,
+    }
+    with open(output_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    with AuditLog.from_config(source="run_predictions", policy="block") as audit_log:
+        valid_ids = [sample_id for sample_id, is_valid in zip(samples.ids, valid) if is_valid]
+        labels = [{"label": int(label) if label != evaluation.UNLABELED else None}
+                  for label in samples.labels[valid]]
+        audit_log.record("evaluate", artifacts.version_label, feature_names, samples.features[valid],
+                         probabilities[valid], ids=valid_ids, extra=labels)
+
+    if args.rows_output:
+        with open(args.rows_output, 'w') as f:
+            for i, sample_id in enumerate(samples.ids):
+                row = {"id": sample_id, "label": int(samples.labels[i]) if samples.labels[i] != evaluation.UNLABELED else None}
+                if valid[i]:
+                    row.update(prediction=int(predictions[i]), exoplanet_probability=float(probabilities[i, 1]))
+                else:
+                    row["errors"] = samples.row_errors.get(i, [])
+                f.write(json.dumps(row) + "\n")
+
+    print(f"\n🎯 {int(valid.sum())} rows scored in {elapsed * 1000:.1f} ms "
+          f"({latency['all']['us_per_row']:.2f} µs/row)")
+    if metrics:
+        (tn, fp), (fn, tp) = metrics["confusion_matrix"]
+        roc_auc = f"{metrics['roc_auc']:.4f}" if metrics['roc_auc'] is not None else "n/a"
+        print(f"   accuracy {metrics['accuracy']:.4f} | ROC-AUC {roc_auc} | F1 {metrics['f1']:.4f} | "
+              f"Brier {metrics['brier_score']:.4f} | ECE {metrics['expected_calibration_error']:.4f}")
+        print(f"   confusion: TN {tn}  FP {fp}  FN {fn}  TP {tp}")
+    else:
+        print("   ⚠️  No labels in the input; only predictions and latency were recorded")
+    if samples.row_errors:
+        print(f"   ⚠️  {len(samples.row_errors)} invalid rows skipped")
+    print(f"📄 Summary saved in: {output_path}" + (f", rows in: {args.rows_output}" if args.rows_output else ""))
+
 def main():
+    args = parse_args()
     print("🚀 Starting Exoplanet Prediction Pipeline...")
     print("=" * 60)
     
     # Load model artifacts
     print("📦 Loading trained model...")
     try:
-        model, scaler, feature_names = load_model_artifacts()
-        print(f"✅ Model loaded successfully!")
+        artifacts = load_artifacts(args.engine, variant=args.variant, precision=args.precision)
+        engine, feature_names = artifacts.engine, artifacts.feature_names
+        print(f"✅ Model loaded successfully! (engine: {args.engine}, variant: {args.variant}, "
+              f"precision: {args.precision}, version: {artifacts.version_label}, {artifacts.load_seconds:.3f}s)")
         print(f"   Features used: {feature_names}")
     except Exception as e:
         print(f"❌ Failed to load model: {e}")
         return
+
+    if args.evaluate:
+        run_evaluation(args, artifacts)
+        return
     
     # Read input JSON
-    print("\n📁 Reading input.json...")
+    output_path = args.output or 'predictions_log.json'
+    print(f"\n📁 Reading {args.input}...")
     try:
-        with open('input.json', 'r') as f:
+        with open(args.input, 'r') as f:
             input_data = json.load(f)
         print(f"✅ Input data loaded with {len(input_data['test_samples'])} samples")
     except Exception as e:
-        print(f"❌ Failed to read input.json: {e}")
+        print(f"❌ Failed to read {args.input}: {e}")
         return
     
     # Process each sample
     print("\n🔮 Making predictions...")
+    # Every prediction is also appended to the audit log (block rather than
+    # drop when its queue is full: a batch run loses nothing)
+    audit_log = AuditLog.from_config(source="run_predictions", policy="block")
     results = []
     correct_predictions = 0
     total_predictions = 0
@@ -75,7 +187,8 @@ def main():
         try:
             # Make prediction
             prediction_result = make_prediction(
-                model, scaler, sample['features'], feature_names
+                engine, sample['features'], feature_names, audit_log, artifacts.version_label,
+                sample['name'], {"expected_prediction": sample.get('expected_prediction')}
             )
             
             # Check if prediction is correct
@@ -109,6 +222,10 @@ def main():
             print(f"      ❌ Error making prediction: {e}")
             continue
     
+    audit_log.close()
+    if audit_log.enabled:
+        print(f"\n🗂️  {audit_log.written} predictions appended to the audit log in {audit_log.directory}")
+    
     # Calculate accuracy
     accuracy = correct_predictions / total_predictions if total_predictions > 0 else 0
     
@@ -116,6 +233,7 @@ def main():
     output_data = {
         "timestamp": datetime.now().isoformat(),
         "model_info": {
+            "model_version": artifacts.version_label,
             "features_used": feature_names,
             "total_samples": total_predictions,
             "correct_predictions": correct_predictions,
@@ -131,9 +249,9 @@ def main():
     }
     
     # Write output JSON
-    print(f"\n💾 Writing results to predictions_log.json...")
+    print(f"\n💾 Writing results to {output_path}...")
     try:
-        with open('predictions_log.json', 'w') as f:
+        with open(output_path, 'w') as f:
             json.dump(output_data, f, indent=2)
         print("✅ Results saved successfully!")
     except Exception as e:
@@ -158,7 +276,7 @@ def main():
     else:
         print("🔴 POOR PERFORMANCE. Model needs significant improvements.")
     
-    print(f"\n📄 Detailed results saved in: predictions_log.json")
+    print(f"\n📄 Detailed results saved in: {output_path}")
     print("🚀 Prediction pipeline completed!")
 
 if __name__ == "__main__":
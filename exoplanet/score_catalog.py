@@ -0,0 +1,78 @@
+# score_catalog.py - Stream a large catalog through the model chunk by chunk
+
+import argparse
+import sys
+import time
+
+from backend.app.artifacts import VARIANT_CHOICES, load_artifacts
+from backend.app.engine import ENGINE_CHOICES, PRECISION_CHOICES
+from backend.app.parallel import iter_scored_chunks
+from backend.app.streaming import iter_feature_chunks, open_result_writer
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Score a CSV / JSON Lines / Parquet catalog with bounded memory and write results incrementally"
+    )
+    parser.add_argument("input", help="Input file (.csv incl. NASA '#' headers, .jsonl/.ndjson, .parquet)")
+    parser.add_argument("output", help="Output file (.jsonl, .csv or .parquet)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl", "parquet"], help="Override the input format")
+    parser.add_argument("--output-format", choices=["csv", "jsonl", "parquet"], help="Override the output format")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Rows per scoring chunk (default: 50000)")
+    parser.add_argument("--id-column", help="Input column copied to the output, e.g. kepoi_name")
+    parser.add_argument("--engine", choices=ENGINE_CHOICES, default="sklearn",
+                        help="Inference engine: pickled sklearn model or exported NumPy weights")
+    parser.add_argument("--variant", choices=VARIANT_CHOICES, default="full",
+                        help="Model variant: the trained model or the smaller distilled student")
+    parser.add_argument("--precision", choices=PRECISION_CHOICES, default="float64",
+                        help="Forward-pass precision of the numpy engine (int8 = quantized weights)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for scoring; results keep input order (default: 1)")
+    parser.add_argument("--progress-every", type=float, default=2.0,
+                        help="Seconds between progress reports (default: 2)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    print("🚀 Streaming catalog scoring...", file=sys.stderr)
+
+    try:
+        artifacts = load_artifacts(args.engine, variant=args.variant, precision=args.precision)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(2)
+    print(f"✅ Model loaded (engine: {args.engine}, variant: {args.variant}, precision: {args.precision}, "
+          f"version: {artifacts.version_label}, {artifacts.load_seconds:.3f}s, workers: {args.workers})",
+          file=sys.stderr)
+
+    chunks = iter_feature_chunks(
+        args.input, artifacts.feature_names, chunk_size=args.chunk_size,
+        fmt=args.input_format, id_column=args.id_column
+    )
+    writer = open_result_writer(args.output, args.output_format)
+
+    total_rows = 0
+    failed_rows = 0
+    start = last_report = time.perf_counter()
+    try:
+        for chunk, results in iter_scored_chunks(chunks, args.engine, workers=args.workers,
+                                                    variant=args.variant, precision=args.precision,
+                                                    version=artifacts.version):
+            writer.write(results)
+            total_rows += len(chunk)
+            failed_rows += len(chunk.row_errors)
+
+            now = time.perf_counter()
+            if now - last_report >= args.progress_every:
+                print(f"   {total_rows:,} rows scored ({total_rows / (now - start):,.0f} rows/s)", file=sys.stderr)
+                last_report = now
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    rate = total_rows / elapsed if elapsed > 0 else 0.0
+    print(f"🎯 Scored {total_rows:,} rows ({failed_rows:,} invalid) in {elapsed:.2f}s - {rate:,.0f} rows/s",
+          file=sys.stderr)
+    print(f"📄 Results written to {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()